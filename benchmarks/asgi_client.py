@@ -0,0 +1,165 @@
+# benchmarks/asgi_client.py
+"""
+joiny_server.asgi.application 을 프로세스 안에서 직접 호출하는 최소 ASGI 클라이언트.
+
+  - AsgiClient.request()   : HTTP 요청 한 번 (scope / receive / send 를 직접 구성)
+  - AsgiClient.lifespan()  : lifespan startup / shutdown (on_startup 훅 실행)
+  - SocketIOClient         : Engine.IO v4 long-polling 위의 Socket.IO 클라이언트
+                             (연결, 네임스페이스 connect, emit, 수신 패킷 수집)
+네트워크 / uvicorn 없이 미들웨어, DRF, Socket.IO 서버 코드를 그대로 지나갑니다.
+"""
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from urllib.parse import urlencode
+
+RECORD_SEPARATOR = '\x1e'  # Engine.IO v4 polling payload 패킷 구분자
+
+
+class AsgiClient:
+    def __init__(self, app, host='localhost'):
+        self.app = app
+        self.host = host
+
+    async def request(self, method, path, body=b'', headers=None, query=None):
+        """(status, headers dict, body bytes)"""
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body).encode()
+            headers = {'content-type': 'application/json', **(headers or {})}
+        elif isinstance(body, str):
+            body = body.encode()
+        raw_headers = [(b'host', self.host.encode())]
+        raw_headers += [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+        if body:
+            raw_headers.append((b'content-length', str(len(body)).encode()))
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+            'method': method, 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+            'query_string': (urlencode(query) if isinstance(query, dict) else (query or '')).encode(),
+            'root_path': '', 'headers': raw_headers,
+            'client': ('127.0.0.1', 50000), 'server': (self.host, 80),
+        }
+        sent = False
+        disconnected = asyncio.Event()
+
+        async def receive():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {'type': 'http.request', 'body': body, 'more_body': False}
+            await disconnected.wait()
+            return {'type': 'http.disconnect'}
+
+        status, response_headers, chunks = None, {}, []
+
+        async def send(message):
+            nonlocal status, response_headers
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                response_headers = {k.decode().lower(): v.decode() for k, v in message.get('headers', [])}
+            elif message['type'] == 'http.response.body':
+                chunks.append(message.get('body', b''))
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            disconnected.set()
+        return status, response_headers, b''.join(chunks)
+
+    @asynccontextmanager
+    async def lifespan(self):
+        queue = asyncio.Queue()
+        replies = asyncio.Queue()
+        await queue.put({'type': 'lifespan.startup'})
+        task = asyncio.create_task(self.app({'type': 'lifespan', 'asgi': {'version': '3.0'}}, queue.get, replies.put))
+        await replies.get()
+        try:
+            yield self
+        finally:
+            await queue.put({'type': 'lifespan.shutdown'})
+            await replies.get()
+            await task
+
+
+class SocketIOClient:
+    """
+    Engine.IO long-polling 위의 Socket.IO 클라이언트 하나.
+    수신은 백그라운드 long-poll 태스크가 받아서 events 에 (이벤트, 데이터, 받은 시각) 으로 쌓습니다.
+    """
+
+    def __init__(self, client, path='/socket.io/'):
+        self.client = client
+        self.path = path
+        self.sid = None
+        self.events = []
+        self.connected = {}
+        self.received = asyncio.Event()
+        self._poller = None
+        self._closed = False
+
+    def query(self):
+        params = {'EIO': '4', 'transport': 'polling'}
+        if self.sid:
+            params['sid'] = self.sid
+        return params
+
+    async def open(self):
+        status, _, body = await self.client.request('GET', self.path, query=self.query())
+        assert status == 200, (status, body)
+        self.sid = json.loads(body.decode()[1:])['sid']
+        self._poller = asyncio.create_task(self._poll())
+
+    async def post(self, *packets):
+        status, _, body = await self.client.request(
+            'POST', self.path, RECORD_SEPARATOR.join(packets), query=self.query(),
+            headers={'content-type': 'text/plain;charset=UTF-8'},
+        )
+        assert status == 200, (status, body)
+
+    async def connect(self, namespace, auth=None):
+        """네임스페이스 connect 후 서버 응답(40 / 44)을 기다립니다."""
+        await self.post(f'40{namespace},{json.dumps(auth or {})}')
+        while namespace not in self.connected:
+            self.received.clear()
+            await self.received.wait()
+        if self.connected[namespace] is not True:
+            raise ConnectionRefusedError(self.connected[namespace])
+
+    async def emit(self, namespace, event, data):
+        await self.post(f'42{namespace},{json.dumps([event, data])}')
+
+    async def _poll(self):
+        loop = asyncio.get_running_loop()
+        while not self._closed:
+            status, _, body = await self.client.request('GET', self.path, query=self.query())
+            if status != 200:
+                return
+            for packet in body.decode().split(RECORD_SEPARATOR):
+                self._handle(packet, loop.time())
+            self.received.set()
+
+    def _handle(self, packet, at):
+        if packet == '2':  # engine ping
+            asyncio.ensure_future(self.post('3'))
+        elif packet.startswith('4'):
+            kind, rest = packet[1], packet[2:]
+            namespace, _, payload = rest.partition(',') if rest.startswith('/') else ('/', '', rest)
+            if kind == '0':
+                self.connected[namespace] = True
+            elif kind == '4':
+                self.connected[namespace] = json.loads(payload).get('message', 'refused')
+            elif kind == '2':
+                event, *args = json.loads(payload)
+                self.events.append((event, args[0] if args else None, at))
+        elif packet == '1':
+            self._closed = True
+
+    async def close(self):
+        if self.sid and not self._closed:
+            self._closed = True
+            await self.post('1')
+        if self._poller is not None:
+            try:
+                await asyncio.wait_for(self._poller, 5)
+            except (asyncio.TimeoutError, AssertionError):
+                self._poller.cancel()
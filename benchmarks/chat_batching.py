@@ -0,0 +1,76 @@
+# benchmarks/chat_batching.py
+"""
+채팅 저장 부하 테스트: 메시지마다 create() vs ChatWriteBuffer 배치 저장.
+
+    python -m benchmarks.chat_batching --messages 5000 --parties 20 --senders 50
+"""
+import argparse
+import asyncio
+
+from .common import Timer, bench_database, print_table, setup_django
+
+
+async def send_direct(messages):
+    from asgiref.sync import sync_to_async
+    from core.models import ChatMessage
+
+    @sync_to_async
+    def save(event_id, sender_id, text):
+        ChatMessage.objects.create(event_id=event_id, sender_id=sender_id, message=text)
+
+    await asyncio.gather(*(save(*m) for m in messages))
+
+
+async def send_buffered(messages, batch_size, flush_interval):
+    from joiny_server.chat_buffer import ChatWriteBuffer
+
+    buffer = ChatWriteBuffer(batch_size=batch_size, flush_interval=flush_interval, max_pending=len(messages))
+    await asyncio.gather(*(buffer.add(e, s, 'bench', t) for e, s, t in messages))
+    await buffer.close()
+
+
+def seed(parties, senders):
+    from datetime import date
+    from django.contrib.auth.models import User
+    from core.models import Event
+
+    users = User.objects.bulk_create([User(username=f'bench{i}') for i in range(senders)])
+    events = Event.objects.bulk_create([Event(name=f'bench {i}', date=date(2026, 1, 1)) for i in range(parties)])
+    return [e.id for e in events], [u.id for u in users]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--messages', type=int, default=5000)
+    parser.add_argument('--parties', type=int, default=20)
+    parser.add_argument('--senders', type=int, default=50)
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--flush-interval', type=float, default=0.05)
+    args = parser.parse_args()
+
+    setup_django()
+    from core.models import ChatMessage
+
+    with bench_database():
+        event_ids, user_ids = seed(args.parties, args.senders)
+        messages = [
+            (event_ids[i % len(event_ids)], user_ids[i % len(user_ids)], f'message {i}')
+            for i in range(args.messages)
+        ]
+
+        rows = []
+        for label, coro_factory in (
+            ('create() per message', lambda: send_direct(messages)),
+            (f'bulk_create x{args.batch_size}', lambda: send_buffered(messages, args.batch_size, args.flush_interval)),
+        ):
+            ChatMessage.objects.all().delete()
+            with Timer() as t:
+                asyncio.run(coro_factory())
+            assert ChatMessage.objects.count() == args.messages
+            rows.append((label, {'seconds': t.elapsed, 'msgs/sec': args.messages / t.elapsed}))
+
+        print_table(f'{args.messages} chat messages', rows)
+
+
+if __name__ == '__main__':
+    main()
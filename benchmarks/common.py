@@ -0,0 +1,73 @@
+# benchmarks/common.py
+"""
+벤치마크 공용 헬퍼.
+각 벤치마크는 `python -m benchmarks.<name>` 으로 실행하며,
+실제 DB를 건드리지 않도록 Django 테스트 DB를 만들어 그 안에서 데이터를 시드합니다.
+"""
+import os
+import statistics
+import time
+from contextlib import contextmanager
+
+import django
+
+
+def setup_django():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'joiny_server.settings')
+    django.setup()
+
+
+@contextmanager
+def bench_database():
+    """테스트 DB를 생성하고 끝나면 삭제합니다."""
+    from django.db import connection
+
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+class Timer:
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(samples):
+    """지연 시간 샘플(초)을 ms 단위 통계로 요약합니다."""
+    return {
+        'count': len(samples),
+        'mean_ms': statistics.fmean(samples) * 1000 if samples else 0.0,
+        'p50_ms': percentile(samples, 50) * 1000,
+        'p95_ms': percentile(samples, 95) * 1000,
+        'p99_ms': percentile(samples, 99) * 1000,
+    }
+
+
+def print_table(title, rows):
+    """rows: [(label, {metric: value})] 형태를 표로 출력합니다."""
+    print(f"\n== {title} ==")
+    if not rows:
+        return
+    columns = list(rows[0][1].keys())
+    width = max(len(label) for label, _ in rows)
+    print(f"{'':<{width}}  " + "  ".join(f"{c:>12}" for c in columns))
+    for label, values in rows:
+        cells = []
+        for c in columns:
+            v = values[c]
+            cells.append(f"{v:>12.2f}" if isinstance(v, float) else f"{v:>12}")
+        print(f"{label:<{width}}  " + "  ".join(cells))
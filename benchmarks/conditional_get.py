@@ -0,0 +1,74 @@
+# benchmarks/conditional_get.py
+"""
+조건부 GET: 폴링하는 클라이언트가 같은 응답을 다시 받는 비용.
+
+  - event 200          : GET /api/events/{id}/ (참가자 --members 명, 매번 직렬화)
+  - event 304          : 같은 요청 + If-None-Match (버전 컬럼만 조회, 직렬화 없음)
+  - themes uncached    : GET /api/themes/ (테마 --themes 개, 캐시를 매번 비움)
+  - themes cached      : 프로세스 캐시에서 응답
+  - themes 304         : 프로세스 캐시 + If-None-Match (DB 조회 없음)
+
+    python -m benchmarks.conditional_get --requests 500 --members 30 --themes 20
+"""
+import argparse
+
+from .common import Timer, bench_database, print_table, setup_django, summarize
+
+
+def seed(members, themes):
+    from datetime import date
+
+    from django.contrib.auth.models import User
+
+    from core.models import Event, Participant, Theme
+
+    event = Event.objects.create(name='bench party', date=date(2026, 1, 1), max_members=members + 1)
+    users = User.objects.bulk_create([User(username=f'user{i}', email=f'user{i}@bench.local') for i in range(members)])
+    Participant.objects.bulk_create([Participant(event=event, user=u, name=u.username) for u in users])
+    Theme.objects.bulk_create([Theme(name=f'theme {i}', description='설명' * 10) for i in range(themes)])
+    return event
+
+
+def measure(client, url, count, before=None, **headers):
+    samples = []
+    status = None
+    for _ in range(count):
+        if before:
+            before()
+        with Timer() as t:
+            response = client.get(url, **headers)
+        samples.append(t.elapsed)
+        status = response.status_code
+    return {**summarize(samples), 'status': status}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--members', type=int, default=30)
+    parser.add_argument('--themes', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.test import APIClient
+
+    from core.cache import theme_cache
+
+    with bench_database():
+        event = seed(args.members, args.themes)
+        client = APIClient(HTTP_HOST='localhost')  # ALLOWED_HOSTS 에 testserver 가 없으므로
+        event_url = f'/api/events/{event.id}/'
+        event_etag = client.get(event_url)['ETag']
+        theme_etag = client.get('/api/themes/')['ETag']
+
+        print_table(f'{args.requests} polling requests', [
+            ('event 200', measure(client, event_url, args.requests)),
+            ('event 304', measure(client, event_url, args.requests, HTTP_IF_NONE_MATCH=event_etag)),
+            ('themes uncached', measure(client, '/api/themes/', args.requests, before=theme_cache.clear)),
+            ('themes cached', measure(client, '/api/themes/', args.requests)),
+            ('themes 304', measure(client, '/api/themes/', args.requests, HTTP_IF_NONE_MATCH=theme_etag)),
+        ])
+
+
+if __name__ == '__main__':
+    main()
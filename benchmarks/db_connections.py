@@ -0,0 +1,134 @@
+# benchmarks/db_connections.py
+"""
+DB 연결 재사용: 요청마다 새 연결 vs 영구 연결(CONN_MAX_AGE) vs 커넥션 풀.
+
+  - http   : ASGI 앱(joiny_server.asgi)으로 GET /api/events/ 를 concurrency 개씩 동시에
+             (Django ASGI 는 요청마다 다른 스레드에서 뷰를 실행)
+  - socket : Socket.IO 핸들러와 같은 database_sync_to_async 호출을 concurrency 개씩 동시에
+모드별로 ops/sec, 지연, 호출당 연결 수(joiny_db_connections_opened_total 기준)와
+pool 모드의 호출당 풀 대기 시간(psycopg_pool 통계)을 출력합니다. (pool 모드는 PostgreSQL + psycopg 3 + psycopg_pool 에서만)
+
+인메모리 sqlite 테스트 DB 는 연결을 닫지 않으므로 차이가 보이지 않습니다. PostgreSQL 로 실행하세요.
+
+    python -m benchmarks.db_connections --requests 500 --concurrency 16 --pool-size 10
+"""
+import argparse
+import asyncio
+import importlib.util
+import time
+from datetime import date
+
+from .common import bench_database, percentile, print_table, setup_django
+
+
+def configure(mode, pool_size):
+    """connections.settings 를 모드에 맞게 바꾸고 기존 연결 / 풀을 닫습니다."""
+    from django.db import connections
+
+    connections.close_all()
+    wrapper = connections['default']
+    if getattr(wrapper, 'pool', None) is not None:
+        wrapper.close_pool()
+    settings_dict = connections.settings['default']
+    options = {k: v for k, v in settings_dict['OPTIONS'].items() if k != 'pool'}
+    if mode == 'pool':
+        from psycopg_pool import ConnectionPool
+
+        options['pool'] = {'min_size': 1, 'max_size': pool_size, 'timeout': 30,
+                           'check': ConnectionPool.check_connection}
+    settings_dict['OPTIONS'] = options
+    settings_dict['CONN_MAX_AGE'] = 60 if mode == 'persistent' else 0
+
+
+def connect_count():
+    from joiny_server.metrics import registry
+
+    with registry.lock:
+        return registry.counters.get(('joiny_db_connections_opened_total', (('alias', 'default'),)), 0)
+
+
+def pool_wait_ms():
+    """마지막 호출 이후 풀에서 연결을 기다린 시간 합 (ms). 풀이 없으면 0"""
+    from django.db import connections
+
+    pool = getattr(connections['default'], 'pool', None)
+    return pool.pop_stats().get('requests_wait_ms', 0) if pool is not None else 0
+
+
+async def measure(calls, concurrency):
+    from joiny_server.metrics import registry
+
+    registry.reset()
+    pool_wait_ms()
+    samples, queue = [], list(calls)
+
+    async def worker():
+        while queue:
+            call = queue.pop()
+            start = time.perf_counter()
+            await call()
+            samples.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+    connects, wait_ms = connect_count(), pool_wait_ms()
+    return {
+        'ops/sec': len(samples) / wall,
+        'p50_ms': percentile(samples, 50) * 1000,
+        'p95_ms': percentile(samples, 95) * 1000,
+        'connects/op': connects / len(samples),
+        'pool_wait_ms/op': wait_ms / len(samples),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=300)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--pool-size', type=int, default=10)
+    parser.add_argument('--events', type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection
+
+    from core.models import Event
+    from joiny_server.db import database_sync_to_async
+
+    from .asgi_client import AsgiClient
+
+    modes = ['per request', 'persistent']
+    if connection.vendor == 'postgresql' and all(importlib.util.find_spec(m) for m in ('psycopg', 'psycopg_pool')):
+        modes.append('pool')
+    else:
+        print('pool mode skipped: needs PostgreSQL with psycopg 3 and psycopg_pool')
+
+    with bench_database():
+        Event.objects.bulk_create([Event(name=f'party {i}', date=date(2026, 1, 1)) for i in range(args.events)])
+
+        from joiny_server.asgi import application
+
+        client = AsgiClient(application)
+
+        async def http_call():
+            status, _, _ = await client.request('GET', '/api/events/')
+            assert status == 200, status
+
+        socket_call = database_sync_to_async(lambda: Event.objects.filter(pk__gt=0).count())
+
+        rows = []
+        try:
+            for mode in modes:
+                configure(mode, args.pool_size)
+                rows.append((f'{mode} http', asyncio.run(
+                    measure([http_call] * args.requests, args.concurrency))))
+                rows.append((f'{mode} socket', asyncio.run(
+                    measure([socket_call] * args.requests, args.concurrency))))
+        finally:
+            configure('per request', args.pool_size)
+        print_table(f'{args.requests} calls, concurrency {args.concurrency}', rows)
+
+
+if __name__ == '__main__':
+    main()
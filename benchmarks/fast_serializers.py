@@ -0,0 +1,80 @@
+# benchmarks/fast_serializers.py
+"""
+목록 Serializer 비교: EventSerializer / FriendshipSerializer vs EventListSerializer / FriendListSerializer.
+DB 조회 + 직렬화 시간을 함께 측정하고, 두 결과의 JSON 바이트가 같은지 확인합니다.
+
+    python -m benchmarks.fast_serializers --rows 10000 --members 3
+"""
+import argparse
+
+from .common import Timer, bench_database, print_table, setup_django
+
+
+def seed(rows, members):
+    import decimal
+    from datetime import date, timedelta
+
+    from django.contrib.auth.models import User
+    from core.models import Event, Friendship, Participant
+
+    users = User.objects.bulk_create([
+        User(username=f'user{i}', email=f'user{i}@bench.local') for i in range(rows + 1)
+    ])
+    events = Event.objects.bulk_create([
+        Event(
+            name=f'bench party {i}', date=date(2026, 1, 1) + timedelta(days=i % 365), host=users[0],
+            latitude=decimal.Decimal('37.566535'), longitude=decimal.Decimal('126.977969'),
+        )
+        for i in range(rows)
+    ])
+    Participant.objects.bulk_create([
+        Participant(event=event, user=users[j], name=f'guest {j}') for event in events for j in range(members)
+    ])
+    # user0 과 나머지 모두의 친구 관계 -> user0 의 친구 목록이 rows 개
+    Friendship.objects.bulk_create([
+        Friendship(from_user=users[0], to_user=u, status='accepted') for u in users[1:]
+    ])
+    return users[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--members', type=int, default=3)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db.models import Prefetch, Q
+
+    from core.models import Event, Friendship, Participant
+    from core.renderers import ORJSONRenderer
+    from core.serializers import EventListSerializer, EventSerializer, FriendListSerializer, FriendshipSerializer
+
+    render = ORJSONRenderer().render
+    with bench_database():
+        user = seed(args.rows, args.members)
+        events = Event.objects.prefetch_related(
+            Prefetch('participant_set', queryset=Participant.objects.order_by('id'))
+        ).order_by('-date', '-id')
+        friendships = Friendship.objects.filter(Q(from_user=user) | Q(to_user=user)).order_by('id')
+
+        cases = [
+            ('EventSerializer', lambda: EventSerializer(events, many=True).data),
+            ('EventListSerializer', lambda: EventListSerializer(EventListSerializer.values(events)).data),
+            ('FriendshipSerializer', lambda: FriendshipSerializer(friendships.select_related('from_user', 'to_user'), many=True).data),
+            ('FriendListSerializer', lambda: FriendListSerializer(FriendListSerializer.values(friendships)).data),
+        ]
+        rows, outputs = [], {}
+        for label, build in cases:
+            with Timer() as t:
+                outputs[label] = render(build())
+            rows.append((label, {'rows': args.rows, 'ms': t.elapsed * 1000, 'rows/sec': args.rows / t.elapsed}))
+
+        print_table(f'{args.rows} rows (query + serialize)', rows)
+        assert outputs['EventSerializer'] == outputs['EventListSerializer']
+        assert outputs['FriendshipSerializer'] == outputs['FriendListSerializer']
+        print('output: byte-identical')
+
+
+if __name__ == '__main__':
+    main()
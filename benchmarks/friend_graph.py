@@ -0,0 +1,123 @@
+# benchmarks/friend_graph.py
+"""
+친구 그래프 조회: Friendship (from_user OR to_user) vs FriendEdge 양방향 인접 리스트.
+
+합성 그래프(기본 100k 유저, 평균 친구 수 --degree)를 시드하고 임의 유저에 대해
+"내 친구", "함께 아는 친구", "친구 추천(친구의 친구, 함께 아는 친구 수 순)" 을 측정합니다.
+Friendship 기준 추천은 기존 방식처럼 친구마다 친구 목록을 조회해서 Python 에서 셉니다.
+
+    python -m benchmarks.friend_graph --users 100000 --degree 10 --samples 50
+"""
+import argparse
+import random
+from collections import Counter
+
+from .common import Timer, bench_database, print_table, setup_django, summarize
+
+
+def seed(users, degree, rng, batch_size=5000):
+    from django.contrib.auth.models import User
+
+    from core.friends import edges_for
+    from core.models import FriendEdge, Friendship
+
+    created = User.objects.bulk_create(
+        [User(username=f'user{i}', email=f'user{i}@bench.local') for i in range(users)], batch_size=batch_size
+    )
+    ids = [u.id for u in created]
+
+    pairs = set()
+    target = users * degree // 2
+    while len(pairs) < target:
+        a, b = rng.sample(ids, 2)
+        pairs.add((min(a, b), max(a, b)))
+    pairs = list(pairs)
+
+    # bulk_create 는 시그널을 거치지 않으므로 FriendEdge 도 직접 만듭니다.
+    Friendship.objects.bulk_create(
+        [Friendship(from_user_id=a, to_user_id=b, status='accepted') for a, b in pairs], batch_size=batch_size
+    )
+    FriendEdge.objects.bulk_create(
+        [edge for a, b in pairs for edge in edges_for(a, b)], batch_size=batch_size
+    )
+    return ids
+
+
+# ----------------------------------------------------
+# Friendship 테이블만 쓰는 기존 방식
+# ----------------------------------------------------
+def or_friend_ids(user_id):
+    from django.db.models import Q
+
+    from core.models import Friendship
+
+    rows = Friendship.objects.filter(Q(from_user_id=user_id) | Q(to_user_id=user_id), status='accepted')
+    return {b if a == user_id else a for a, b in rows.values_list('from_user_id', 'to_user_id')}
+
+
+def or_mutual(user_id, other_id):
+    return sorted(or_friend_ids(user_id) & or_friend_ids(other_id))
+
+
+def or_suggestions(user_id, limit):
+    from django.db.models import Q
+
+    from core.models import Friendship
+
+    mine = or_friend_ids(user_id)
+    requested = set()
+    for a, b in Friendship.objects.filter(Q(from_user_id=user_id) | Q(to_user_id=user_id)).values_list('from_user_id', 'to_user_id'):
+        requested.add(b if a == user_id else a)
+    counts = Counter()
+    for friend in mine:
+        for candidate in or_friend_ids(friend):
+            if candidate != user_id and candidate not in requested:
+                counts[candidate] += 1
+    return sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=100_000)
+    parser.add_argument('--degree', type=int, default=10, help='average friends per user')
+    parser.add_argument('--samples', type=int, default=50)
+    parser.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from core import friends as friend_graph
+
+    rng = random.Random(42)
+    with bench_database():
+        with Timer() as seed_t:
+            ids = seed(args.users, args.degree, rng)
+        print(f'seeded {args.users} users / {args.users * args.degree // 2} friendships in {seed_t.elapsed:.1f}s')
+
+        samples = [(rng.choice(ids), rng.choice(ids)) for _ in range(args.samples)]
+        timings = {}
+
+        def measure(label, fn):
+            results = []
+            for user_id, other_id in samples:
+                with Timer() as t:
+                    results.append(fn(user_id, other_id))
+                timings.setdefault(label, []).append(t.elapsed)
+            return results
+
+        friends_or = measure('friends: Friendship OR', lambda u, o: sorted(or_friend_ids(u)))
+        friends_edge = measure('friends: FriendEdge', lambda u, o: list(friend_graph.friends(u).values_list('id', flat=True)))
+        mutual_or = measure('mutual: Friendship OR', or_mutual)
+        mutual_edge = measure('mutual: FriendEdge', lambda u, o: list(friend_graph.mutual_friends(u, o).values_list('id', flat=True)))
+        suggest_or = measure('suggestions: Friendship OR + N queries', lambda u, o: or_suggestions(u, args.limit))
+        suggest_edge = measure('suggestions: FriendEdge', lambda u, o: friend_graph.suggestions(u, limit=args.limit))
+
+        assert friends_or == friends_edge
+        assert mutual_or == mutual_edge
+        assert suggest_or == suggest_edge
+
+        print_table(f'{args.samples} random users', [(label, summarize(t)) for label, t in timings.items()])
+        print('results identical')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+# benchmarks/json_renderer.py
+"""
+EventSerializer 목록 페이로드 렌더링: DRF 기본 JSONRenderer(stdlib json) vs ORJSONRenderer.
+
+    python -m benchmarks.json_renderer --events 500 --members 8 --iterations 50
+"""
+import argparse
+
+from .common import Timer, bench_database, print_table, setup_django
+
+
+def seed(events, members):
+    import decimal
+    from datetime import date, timedelta
+
+    from django.contrib.auth.models import User
+    from core.models import Event, Participant
+
+    host = User.objects.create_user(username='bench-host', email='host@bench.local')
+    created = Event.objects.bulk_create([
+        Event(
+            name=f'bench party {i}', date=date(2026, 1, 1) + timedelta(days=i % 365), host=host,
+            latitude=decimal.Decimal('37.566535'), longitude=decimal.Decimal('126.977969'),
+            location_name='Seoul City Hall', description='benchmark event',
+        )
+        for i in range(events)
+    ])
+    Participant.objects.bulk_create([
+        Participant(event=event, name=f'guest {j}') for event in created for j in range(members)
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--events', type=int, default=500)
+    parser.add_argument('--members', type=int, default=8)
+    parser.add_argument('--iterations', type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+    import orjson
+    from rest_framework.renderers import JSONRenderer
+
+    from core.models import Event
+    from core.parsers import ORJSONParser
+    from core.renderers import ORJSONRenderer
+    from core.serializers import EventSerializer
+
+    with bench_database():
+        seed(args.events, args.members)
+        events = Event.objects.prefetch_related('participant_set').order_by('-date', '-id')
+        data = EventSerializer(events, many=True).data
+
+        rows = []
+        for label, renderer in (('stdlib json (JSONRenderer)', JSONRenderer()), ('orjson (ORJSONRenderer)', ORJSONRenderer())):
+            body = renderer.render(data)
+            with Timer() as t:
+                for _ in range(args.iterations):
+                    renderer.render(data)
+            rows.append((label, {'bytes': len(body), 'ms': t.elapsed / args.iterations * 1000}))
+
+        import io
+        import json
+
+        body = JSONRenderer().render(data)
+        with Timer() as t:
+            for _ in range(args.iterations):
+                json.loads(body)
+        rows.append(('stdlib json parse', {'bytes': len(body), 'ms': t.elapsed / args.iterations * 1000}))
+        with Timer() as t:
+            for _ in range(args.iterations):
+                ORJSONParser().parse(io.BytesIO(body))
+        rows.append(('orjson parse (ORJSONParser)', {'bytes': len(body), 'ms': t.elapsed / args.iterations * 1000}))
+
+        print_table(f'{args.events} events x {args.members} members', rows)
+        assert orjson.loads(ORJSONRenderer().render(data)) == json.loads(body)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,427 @@
+# benchmarks/load.py
+"""
+REST + Socket.IO 부하 테스트 (joiny_server.asgi.application 을 프로세스 안에서 직접 구동).
+
+실제 모델로 합성 데이터(유저, 이벤트, 참가자, 친구 관계, 채팅 메시지)를 시드한 뒤
+ASGI 앱에 요청을 보냅니다. (benchmarks/asgi_client.py, 네트워크 / uvicorn 없음)
+  - rest list      : GET  /api/events/
+  - rest detail    : GET  /api/events/{id}/
+  - rest join      : POST /api/participants/ (JWT)
+  - rest login     : POST /api/auth/login/
+  - sio connect    : Engine.IO 연결 + /location 네임스페이스 connect (JWT)
+  - sio join       : /location join_party -> response 수신까지
+  - sio chat       : 클라이언트 전원이 동시에 chat_message -> 자기 메시지가 되돌아올 때까지
+  - sio location   : 클라이언트 전원이 동시에 location_update -> 자기 위치가 담긴 location_batch 수신까지
+시나리오마다 p50/p95/p99 지연, 초당 처리량, 호출당 쿼리 수(joiny_server.metrics 기준)를 출력합니다.
+
+기준선 비교:
+    python -m benchmarks.load --save-baseline benchmarks/baseline.json   # 기준선 저장
+    python -m benchmarks.load --baseline benchmarks/baseline.json        # 비교, 회귀가 있으면 exit 1
+호출당 쿼리 수는 기계와 상관없이 같아야 하고, 지연 / 처리량은 --tolerance 비율까지 허용합니다.
+(지연 기준선은 기계마다 다르므로 비교할 기계에서 다시 저장하세요.)
+
+    python -m benchmarks.load --requests 200 --clients 20 --messages 20 --concurrency 8
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+from .common import bench_database, percentile, print_table, setup_django
+
+PASSWORD = 'bench-password-1234'
+
+
+# ----------------------------------------------------
+# 시드 (실제 모델로)
+# ----------------------------------------------------
+def seed(args, rng):
+    from datetime import date, timedelta
+
+    from django.contrib.auth.hashers import make_password
+    from django.contrib.auth.models import User
+
+    from core.friends import edges_for
+    from core.models import ChatMessage, Event, FriendEdge, Friendship, Participant
+
+    password = make_password(PASSWORD)
+    users = User.objects.bulk_create([
+        User(username=f'user{i}@bench.local', email=f'user{i}@bench.local', password=password)
+        for i in range(args.users)
+    ])
+    events = Event.objects.bulk_create([
+        Event(name=f'party {i}', date=date(2026, 1, 1) + timedelta(days=i % 365), host=users[i % len(users)],
+              max_members=args.members * 4)
+        for i in range(args.events)
+    ])
+    # 소켓 시나리오용 파티: 클라이언트 전원이 참가자
+    hub = Event.objects.create(name='hub', date=date(2026, 6, 1), max_members=args.clients + 1)
+
+    participants, members = [], {}
+    for event in events:
+        chosen = rng.sample(users, args.members)
+        members[event.id] = {u.id for u in chosen}
+        participants += [Participant(event=event, user=u, name=u.username) for u in chosen]
+    hub_users = users[:args.clients]
+    participants += [Participant(event=hub, user=u, name=u.username) for u in hub_users]
+    Participant.objects.bulk_create(participants, batch_size=2000)
+    for event in events:
+        event.participant_count = args.members
+    Event.objects.bulk_update(events, ['participant_count'], batch_size=2000)
+    Event.objects.filter(pk=hub.pk).update(participant_count=len(hub_users))
+
+    pairs = set()
+    while len(pairs) < min(args.friendships, args.users * (args.users - 1) // 2):
+        a, b = rng.sample(users, 2)
+        pairs.add((min(a.id, b.id), max(a.id, b.id)))
+    Friendship.objects.bulk_create(
+        [Friendship(from_user_id=a, to_user_id=b, status='accepted') for a, b in pairs], batch_size=2000
+    )
+    FriendEdge.objects.bulk_create([e for a, b in pairs for e in edges_for(a, b)], batch_size=2000)
+
+    ChatMessage.objects.bulk_create([
+        ChatMessage(event=event, sender_id=rng.choice(sorted(members[event.id])), message=f'hello {i}')
+        for i, event in enumerate(rng.choices(events, k=args.chat_messages))
+    ], batch_size=2000)
+    # 소켓 입장 시 받을 히스토리 (참가 이후 메시지)
+    ChatMessage.objects.bulk_create([
+        ChatMessage(event=hub, sender=u, message=f'welcome {u.id}') for u in hub_users
+    ])
+
+    # 아직 참가하지 않은 (유저, 이벤트) 조합 -> rest join
+    joins = []
+    while len(joins) < args.requests:
+        user, event = rng.choice(users), rng.choice(events)
+        if user.id not in members[event.id]:
+            members[event.id].add(user.id)
+            joins.append((user, event))
+    return users, events, hub, hub_users, joins
+
+
+def tokens_for(users):
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    return {u.id: str(AccessToken.for_user(u)) for u in users}
+
+
+# ----------------------------------------------------
+# 측정 헬퍼
+# ----------------------------------------------------
+class Result:
+    def __init__(self):
+        self.samples = []
+        self.errors = 0
+        self.wall = 0.0
+        self.queries_per_op = 0.0
+
+    def row(self):
+        return {
+            'ops': len(self.samples),
+            'errors': self.errors,
+            'p50_ms': percentile(self.samples, 50) * 1000,
+            'p95_ms': percentile(self.samples, 95) * 1000,
+            'p99_ms': percentile(self.samples, 99) * 1000,
+            'ops_per_sec': len(self.samples) / self.wall if self.wall else 0.0,
+            'queries_per_op': self.queries_per_op,
+        }
+
+
+def queries_per_op(prefix):
+    """joiny_server.metrics 히스토그램 기준 호출당 평균 쿼리 수"""
+    from joiny_server.metrics import registry
+
+    with registry.lock:
+        histograms = [h for (name, _), h in registry.histograms.items() if name == f'{prefix}_queries']
+    count = sum(h.count for h in histograms)
+    return sum(h.sum for h in histograms) / count if count else 0.0
+
+
+async def run_requests(calls, concurrency, prefix='joiny_http_request'):
+    """calls: [async () -> ok?] 를 concurrency 개씩 동시에 실행하고 지연을 잽니다."""
+    from joiny_server.metrics import registry
+
+    registry.reset()
+    result = Result()
+    queue = list(reversed(calls))
+
+    async def worker():
+        while queue:
+            call = queue.pop()
+            start = time.perf_counter()
+            ok = await call()
+            result.samples.append(time.perf_counter() - start)
+            result.errors += 0 if ok else 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.wall = time.perf_counter() - start
+    result.queries_per_op = queries_per_op(prefix)
+    return result
+
+
+# ----------------------------------------------------
+# 시나리오
+# ----------------------------------------------------
+async def rest_scenarios(client, args, rng, events, users, joins, tokens):
+    def get(path, expected=200):
+        async def call():
+            status, _, _ = await client.request('GET', path)
+            return status == expected
+        return call
+
+    def join(user, event):
+        async def call():
+            status, _, _ = await client.request(
+                'POST', '/api/participants/', {'event': event.id},
+                headers={'authorization': f'Bearer {tokens[user.id]}'},
+            )
+            return status == 201
+        return call
+
+    def login(user):
+        async def call():
+            status, _, _ = await client.request(
+                'POST', '/api/auth/login/', {'username': user.email, 'password': PASSWORD}
+            )
+            return status == 200
+        return call
+
+    n = args.requests
+    return [
+        ('rest list', await run_requests([get('/api/events/') for _ in range(n)], args.concurrency)),
+        ('rest detail', await run_requests(
+            [get(f'/api/events/{rng.choice(events).id}/') for _ in range(n)], args.concurrency)),
+        ('rest join', await run_requests([join(u, e) for u, e in joins], args.concurrency)),
+        ('rest login', await run_requests(
+            [login(rng.choice(users)) for _ in range(args.logins)], args.concurrency)),
+    ]
+
+
+async def sio_scenarios(client, args, hub, hub_users, tokens):
+    from benchmarks.asgi_client import SocketIOClient
+    from joiny_server.metrics import registry
+
+    party_id = str(hub.id)
+    sockets = [SocketIOClient(client) for _ in hub_users]
+    results = []
+
+    # connect
+    registry.reset()
+    connect = Result()
+
+    async def open_one(sock, user):
+        start = time.perf_counter()
+        await sock.open()
+        await sock.connect('/location', {'token': tokens[user.id]})
+        await sock.connect('/chat', {'token': tokens[user.id]})
+        connect.samples.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(open_one(s, u) for s, u in zip(sockets, hub_users)))
+    connect.wall = time.perf_counter() - start
+    connect.queries_per_op = queries_per_op('joiny_socketio_event')
+    results.append(('sio connect', connect))
+
+    # join_party (/location 은 response, /chat 은 presence + chat_history 로 응답)
+    registry.reset()
+    joined = Result()
+
+    async def join_one(sock):
+        start = time.perf_counter()
+        await sock.emit('/location', 'join_party', {'party_id': party_id})
+        await sock.emit('/chat', 'join_party', {'party_id': party_id})
+        await wait_for_event(sock, lambda e: e[0] == 'response')
+        # /chat 입장은 presence 다음 chat_history 를 보내면 끝
+        await wait_for_event(sock, lambda e: e[0] == 'chat_history')
+        joined.samples.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(join_one(s) for s in sockets))
+    joined.wall = time.perf_counter() - start
+    joined.queries_per_op = queries_per_op('joiny_socketio_event')
+    results.append(('sio join', joined))
+
+    # chat storm: 전원이 messages 개씩 동시에 전송, 자기 메시지가 돌아올 때까지
+    results.append(('sio chat', await storm(
+        sockets, args.messages, '/chat', 'chat_message',
+        lambda i, k: {'party_id': party_id, 'message': f'bench {i}-{k}'},
+        lambda i, k, event: event[0] == 'chat_message' and event[1].get('message') == f'bench {i}-{k}',
+    )))
+
+    # location storm: 자기 user_id 가 담긴 location_batch 를 받을 때까지 (틱 주기만큼 지연)
+    def has_own_location(i, k, event):
+        return event[0] == 'location_batch' and any(
+            str(loc.get('user_id')) == str(hub_users[i].id) and loc.get('lat') == 37.0 + k * 1e-3
+            for loc in event[1].get('locations', [])
+        )
+
+    results.append(('sio location', await storm(
+        sockets, args.messages, '/location', 'location_update',
+        lambda i, k: {'party_id': party_id, 'lat': 37.0 + k * 1e-3, 'lng': 127.0},
+        has_own_location,
+    )))
+
+    await asyncio.gather(*(s.close() for s in sockets))
+    return results
+
+
+async def wait_for_event(sock, match, since=0, timeout=10):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while True:
+        for index in range(since, len(sock.events)):
+            if match(sock.events[index]):
+                return sock.events[index]
+        since = len(sock.events)
+        remaining = deadline - asyncio.get_running_loop().time()
+        if remaining <= 0:
+            raise asyncio.TimeoutError
+        sock.received.clear()
+        try:
+            await asyncio.wait_for(sock.received.wait(), remaining)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def storm(sockets, messages, namespace, event, payload, match):
+    """클라이언트마다 messages 번 emit 하고, 매번 해당 응답이 도착할 때까지의 지연을 잽니다."""
+    from joiny_server.metrics import registry
+
+    registry.reset()
+    result = Result()
+
+    async def client_loop(i, sock):
+        for k in range(messages):
+            since = len(sock.events)
+            start = time.perf_counter()
+            await sock.emit(namespace, event, payload(i, k))
+            try:
+                await wait_for_event(sock, lambda e: match(i, k, e), since)
+            except asyncio.TimeoutError:
+                result.errors += 1
+                continue
+            result.samples.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client_loop(i, s) for i, s in enumerate(sockets)))
+    result.wall = time.perf_counter() - start
+    result.queries_per_op = queries_per_op('joiny_socketio_event')
+    return result
+
+
+# ----------------------------------------------------
+# 기준선 비교
+# ----------------------------------------------------
+def compare(rows, baseline, tolerance):
+    """기준선 대비 회귀 목록"""
+    regressions = []
+    for name, row in rows:
+        base = baseline.get('scenarios', {}).get(name)
+        if base is None:
+            continue
+        if row['queries_per_op'] > base['queries_per_op'] + 0.01:
+            regressions.append(f"{name}: queries/op {base['queries_per_op']:.2f} -> {row['queries_per_op']:.2f}")
+        if row['p95_ms'] > base['p95_ms'] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {base['p95_ms']:.2f}ms -> {row['p95_ms']:.2f}ms")
+        if row['ops_per_sec'] < base['ops_per_sec'] * (1 - tolerance):
+            regressions.append(f"{name}: ops/sec {base['ops_per_sec']:.1f} -> {row['ops_per_sec']:.1f}")
+        if row['errors'] > base.get('errors', 0):
+            regressions.append(f"{name}: errors {base.get('errors', 0)} -> {row['errors']}")
+    return regressions
+
+
+def delta_rows(rows, baseline):
+    out = []
+    for name, row in rows:
+        base = baseline.get('scenarios', {}).get(name)
+        if base is None:
+            continue
+        out.append((name, {
+            'p95_ms': row['p95_ms'],
+            'base_p95_ms': base['p95_ms'],
+            'p95_change_%': (row['p95_ms'] / base['p95_ms'] - 1) * 100 if base['p95_ms'] else 0.0,
+            'queries_per_op': row['queries_per_op'],
+            'base_queries': base['queries_per_op'],
+        }))
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--events', type=int, default=200)
+    parser.add_argument('--members', type=int, default=5, help='participants per event')
+    parser.add_argument('--friendships', type=int, default=2000)
+    parser.add_argument('--chat-messages', type=int, default=5000)
+    parser.add_argument('--requests', type=int, default=200, help='requests per REST scenario')
+    parser.add_argument('--logins', type=int, default=50)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--clients', type=int, default=20, help='Socket.IO clients')
+    parser.add_argument('--messages', type=int, default=20, help='messages per client per storm')
+    parser.add_argument('--real-hasher', action='store_true',
+                        help='use the configured password hasher (default: MD5 so login measures the app path)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--baseline', help='compare against this baseline JSON, exit 1 on regressions')
+    parser.add_argument('--save-baseline', help='write this run as a baseline JSON')
+    parser.add_argument('--tolerance', type=float, default=0.5, help='allowed latency / throughput change')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.test.utils import override_settings
+
+    from .asgi_client import AsgiClient
+
+    rng = random.Random(args.seed)
+    hashers = None if args.real_hasher else ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+    with bench_database(), override_settings(**({'PASSWORD_HASHERS': hashers} if hashers else {})):
+        from django.db import connection
+
+        if connection.vendor == 'sqlite' and args.concurrency > 1:
+            # ASGI 는 요청마다 다른 스레드에서 뷰를 실행 -> 인메모리 sqlite 는 동시 쓰기에서 table is locked
+            print('note: sqlite test DB, concurrent writes (rest join) may fail; use --concurrency 1 or PostgreSQL')
+        users, events, hub, hub_users, joins = seed(args, rng)
+        tokens = tokens_for(users)
+        print(f'seeded {args.users} users, {args.events} events, {args.friendships} friendships, '
+              f'{args.chat_messages} chat messages')
+
+        from joiny_server.asgi import application
+
+        async def run():
+            client = AsgiClient(application)
+            async with client.lifespan():
+                rest = await rest_scenarios(client, args, rng, events, users, joins, tokens)
+                sio = await sio_scenarios(client, args, hub, hub_users, tokens)
+            return rest + sio
+
+        results = asyncio.run(run())
+
+    rows = [(name, result.row()) for name, result in results]
+    print_table(f'concurrency {args.concurrency}, {args.clients} socket clients', rows)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump({'params': vars(args) | {'baseline': None, 'save_baseline': None},
+                       'scenarios': dict(rows)}, f, indent=2, sort_keys=True)
+        print(f'\nbaseline written to {args.save_baseline}')
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        changed = sorted(k for k, v in baseline.get('params', {}).items()
+                         if k not in ('baseline', 'save_baseline', 'tolerance') and getattr(args, k, v) != v)
+        if changed:
+            print(f"\nnote: workload differs from the baseline run ({', '.join(changed)})")
+        print_table(f'vs baseline {args.baseline}', delta_rows(rows, baseline))
+        regressions = compare(rows, baseline, args.tolerance)
+        if regressions:
+            print('\nREGRESSIONS:')
+            for line in regressions:
+                print(f'  {line}')
+            sys.exit(1)
+        print('\nno regressions')
+
+
+if __name__ == '__main__':
+    main()
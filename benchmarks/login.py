@@ -0,0 +1,120 @@
+# benchmarks/login.py
+"""
+로그인 처리량: 기존 조회 경로 vs resolve_login_user, 비밀번호 해시 프로필별.
+
+  - legacy   : 기존 동작 재현 (email 조회 -> username 조회 -> EmailBackend email 조회
+               -> 실패 시 ModelBackend username 조회 + 해시 한 번 더)
+  - resolver : 현재 EmailTokenObtainPairSerializer + EmailBackend (조회 1번, 해시 1번)
+성공 로그인과 틀린 비밀번호 로그인 각각의 쿼리 수 / ms / logins/sec 를 프로필별로 출력합니다.
+
+    python -m benchmarks.login --logins 20 --profiles default pbkdf2 bcrypt --iterations 600000
+"""
+import argparse
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+
+from .common import Timer, bench_database, print_table, setup_django
+
+PASSWORD = 'bench-password-1234'
+
+PROFILES = {
+    'default': ['django.contrib.auth.hashers.PBKDF2PasswordHasher'],
+    'pbkdf2': ['core.hashers.ConfigurablePBKDF2PasswordHasher'],
+    'bcrypt': ['django.contrib.auth.hashers.BCryptSHA256PasswordHasher'],
+}
+
+
+def legacy_login(login_id, password):
+    """기존 serializer.validate + [EmailBackend, ModelBackend] 순서 그대로"""
+    from django.contrib.auth.models import User
+
+    user = User.objects.filter(email=login_id).first()
+    if not user:
+        user = User.objects.filter(username=login_id).first()
+    username = user.username if user else login_id
+    try:
+        candidate = User.objects.get(email=username)
+        if candidate.check_password(password):
+            return candidate
+    except User.DoesNotExist:
+        pass
+    try:
+        candidate = User.objects.get(username=username)
+    except User.DoesNotExist:
+        User().set_password(password)
+        return None
+    return candidate if candidate.check_password(password) else None
+
+
+def resolver_login(login_id, password):
+    from rest_framework.exceptions import AuthenticationFailed
+    from rest_framework.test import APIRequestFactory
+
+    from core.serializers import EmailTokenObtainPairSerializer
+
+    request = APIRequestFactory().post('/api/auth/login/')
+    serializer = EmailTokenObtainPairSerializer(
+        data={'username': login_id, 'password': password}, context={'request': request}
+    )
+    try:
+        return serializer.user if serializer.is_valid() else None
+    except AuthenticationFailed:
+        return None
+
+
+def measure(login, login_id, password, count, threads):
+    from django.db import connection, connections
+    from django.test.utils import CaptureQueriesContext
+
+    with CaptureQueriesContext(connection) as ctx:
+        login(login_id, password)
+    queries = len(ctx.captured_queries)
+
+    def one(_):
+        try:
+            login(login_id, password)
+        finally:
+            if threads > 1:
+                connections.close_all()
+
+    with Timer() as t:
+        if threads > 1:
+            with ThreadPoolExecutor(threads) as pool:
+                list(pool.map(one, range(count)))
+        else:
+            for i in range(count):
+                one(i)
+    return {'queries': queries, 'ms/login': t.elapsed / count * 1000, 'logins/sec': count / t.elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--logins', type=int, default=20)
+    parser.add_argument('--profiles', nargs='+', default=list(PROFILES), choices=list(PROFILES))
+    parser.add_argument('--iterations', type=int, default=600000, help='PASSWORD_PBKDF2_ITERATIONS for the pbkdf2 profile')
+    parser.add_argument('--threads', type=int, default=1, help='concurrent logins (needs a DB that allows it)')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth.models import User
+    from django.test.utils import override_settings
+
+    with bench_database():
+        for profile in args.profiles:
+            if profile == 'bcrypt' and importlib.util.find_spec('bcrypt') is None:
+                print('\nprofile bcrypt skipped: bcrypt package not installed')
+                continue
+            with override_settings(PASSWORD_HASHERS=PROFILES[profile], PASSWORD_PBKDF2_ITERATIONS=args.iterations):
+                User.objects.all().delete()
+                # RegisterSerializer 와 같이 username = email 로 가입한 유저가 이메일로 로그인
+                # (기존 경로는 틀린 비밀번호면 EmailBackend, ModelBackend 에서 해시를 두 번 계산)
+                User.objects.create_user(username='bench@bench.local', email='bench@bench.local', password=PASSWORD)
+                rows = []
+                for label, login in (('legacy', legacy_login), ('resolver', resolver_login)):
+                    rows.append((f'{label} ok', measure(login, 'bench@bench.local', PASSWORD, args.logins, args.threads)))
+                    rows.append((f'{label} wrong pw', measure(login, 'bench@bench.local', 'wrong', args.logins, args.threads)))
+                print_table(f'profile: {profile}', rows)
+
+
+if __name__ == '__main__':
+    main()
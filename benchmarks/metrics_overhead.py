@@ -0,0 +1,62 @@
+# benchmarks/metrics_overhead.py
+"""
+계측 미들웨어 비용: 같은 요청을 METRICS_ENABLED 켜고 / 끄고 비교합니다.
+(쿼리 execute_wrapper + 직렬화 타이머 + 히스토그램 기록)
+
+    python -m benchmarks.metrics_overhead --requests 500 --members 20
+"""
+import argparse
+
+from .common import Timer, bench_database, print_table, setup_django, summarize
+
+
+def seed(members):
+    from datetime import date
+
+    from django.contrib.auth.models import User
+
+    from core.models import Event, Participant
+
+    event = Event.objects.create(name='bench party', date=date(2026, 1, 1), max_members=members)
+    users = User.objects.bulk_create([User(username=f'user{i}', email=f'user{i}@bench.local') for i in range(members)])
+    Participant.objects.bulk_create([Participant(event=event, user=u, name=u.username) for u in users])
+    return event
+
+
+def measure(urls, count):
+    from rest_framework.test import APIClient
+
+    client = APIClient(HTTP_HOST='localhost')  # 미들웨어는 클라이언트 첫 요청 때 설정값으로 구성됩니다.
+    client.get(urls[0])
+    samples = []
+    for i in range(count):
+        with Timer() as t:
+            client.get(urls[i % len(urls)])
+        samples.append(t.elapsed)
+    return summarize(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--members', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.test.utils import override_settings
+
+    from joiny_server.metrics import registry
+
+    with bench_database():
+        event = seed(args.members)
+        urls = [f'/api/events/{event.id}/', '/api/events/', '/api/themes/']
+        rows = []
+        for label, enabled in (('metrics off', False), ('metrics on', True)):
+            with override_settings(METRICS_ENABLED=enabled):
+                rows.append((label, measure(urls, args.requests)))
+        print_table(f'{args.requests} requests over {len(urls)} routes', rows)
+        print(f'\n{len(registry.histograms)} series recorded')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+# benchmarks/nearby_search.py
+"""
+주변 파티 검색: geo_cell 격자 prefilter + NumPy 거리 계산 vs 전체 스캔.
+
+합성 이벤트(기본 1M 개, 몇 개 도시 주변에 분포)를 시드한 뒤 임의 중심점으로 반경 검색을 반복합니다.
+  - full scan + NumPy : 위경도 전체를 읽어서 거리 계산 (인덱스 없음)
+  - geo_cell + NumPy  : core.geo.nearby_ids (격자 셀 범위 인덱스 스캔 후 거리 계산)
+거리 계산 커널만 따로 (순수 Python 루프 vs NumPy 벡터 연산) 메모리 상에서도 비교합니다.
+
+    python -m benchmarks.nearby_search --events 1000000 --queries 50 --radius 3000
+"""
+import argparse
+import math
+
+from .common import Timer, bench_database, print_table, setup_django, summarize
+
+# (위도, 경도) 서울 / 부산 / 도쿄 / 뉴욕 / 런던
+CITIES = [(37.5665, 126.9780), (35.1796, 129.0756), (35.6762, 139.6503), (40.7128, -74.0060), (51.5074, -0.1278)]
+SPREAD_DEG = 0.5  # 도시 중심에서 약 +-50km
+
+
+def synthetic_points(n, rng):
+    import numpy as np
+
+    centers = np.array(CITIES)[rng.integers(0, len(CITIES), n)]
+    offsets = rng.normal(0, SPREAD_DEG / 2, size=(n, 2))
+    return np.round(centers + offsets, 6)
+
+
+def seed(points, batch_size):
+    import decimal
+    from datetime import date
+
+    from core.geo import cell_for
+    from core.models import Event
+
+    for start in range(0, len(points), batch_size):
+        batch = []
+        for i, (lat, lng) in enumerate(points[start:start + batch_size], start):
+            lat, lng = decimal.Decimal(f'{lat:.6f}'), decimal.Decimal(f'{lng:.6f}')
+            # bulk_create 는 save() 를 거치지 않으므로 geo_cell 을 직접 채웁니다.
+            batch.append(Event(name=f'bench {i}', date=date(2026, 1, 1), latitude=lat, longitude=lng,
+                               geo_cell=cell_for(lat, lng)))
+        Event.objects.bulk_create(batch)
+
+
+def full_scan(lat, lng, radius_m, limit):
+    import numpy as np
+
+    from core.geo import haversine_m
+    from core.models import Event
+
+    rows = list(Event.objects.order_by().values_list('id', 'latitude', 'longitude'))
+    ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+    lats = np.fromiter((r[1] for r in rows), dtype=np.float64, count=len(rows))
+    lngs = np.fromiter((r[2] for r in rows), dtype=np.float64, count=len(rows))
+    distances = haversine_m(lat, lng, lats, lngs)
+    inside = np.flatnonzero(distances <= radius_m)
+    inside = inside[np.lexsort((ids[inside], distances[inside]))][:limit]
+    return [(int(ids[i]), float(distances[i])) for i in inside]
+
+
+def python_haversine(lat, lng, lats, lngs):
+    lat1, lng1 = math.radians(lat), math.radians(lng)
+    out = []
+    for lat2, lng2 in zip(lats, lngs):
+        lat2, lng2 = math.radians(lat2), math.radians(lng2)
+        a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+        out.append(2 * 6371000 * math.asin(math.sqrt(min(a, 1.0))))
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--events', type=int, default=1_000_000)
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--radius', type=float, default=3000, help='meters')
+    parser.add_argument('--limit', type=int, default=50)
+    parser.add_argument('--full-scan-queries', type=int, default=3, help='full scan is slow, run fewer')
+    parser.add_argument('--batch-size', type=int, default=5000)
+    args = parser.parse_args()
+
+    import numpy as np
+
+    rng = np.random.default_rng(42)
+    points = synthetic_points(args.events, rng)
+    centers = synthetic_points(args.queries, rng)
+
+    # 거리 계산 커널 (DB 없이)
+    lats, lngs = points[:, 0], points[:, 1]
+    from core.geo import haversine_m
+
+    with Timer() as py_t:
+        python_haversine(centers[0][0], centers[0][1], lats.tolist(), lngs.tolist())
+    with Timer() as np_t:
+        haversine_m(centers[0][0], centers[0][1], lats, lngs)
+    print_table(f'haversine over {args.events} points (in memory)', [
+        ('python loop', {'ms': py_t.elapsed * 1000}),
+        ('numpy', {'ms': np_t.elapsed * 1000}),
+    ])
+
+    setup_django()
+    from core.geo import nearby_ids
+    from core.models import Event
+
+    with bench_database():
+        with Timer() as seed_t:
+            seed(points, args.batch_size)
+        print(f'seeded {args.events} events in {seed_t.elapsed:.1f}s')
+
+        indexed, scanned, hits = [], [], []
+        for i, (lat, lng) in enumerate(centers):
+            with Timer() as t:
+                result = nearby_ids(Event.objects.all(), lat, lng, args.radius, args.limit)
+            indexed.append(t.elapsed)
+            hits.append(len(result))
+            if i < args.full_scan_queries:
+                with Timer() as t:
+                    expected = full_scan(lat, lng, args.radius, args.limit)
+                scanned.append(t.elapsed)
+                assert [pk for pk, _ in result] == [pk for pk, _ in expected], 'results differ from full scan'
+
+        print_table(f'nearby search, radius {args.radius:.0f}m, limit {args.limit}', [
+            ('full scan + numpy', summarize(scanned)),
+            ('geo_cell + numpy', summarize(indexed)),
+        ])
+        print(f'mean hits per query: {sum(hits) / len(hits):.1f}; results match full scan')
+
+
+if __name__ == '__main__':
+    main()
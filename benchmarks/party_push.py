@@ -0,0 +1,134 @@
+# benchmarks/party_push.py
+"""
+폴링 vs /party 푸시: 파티 화면을 열어 둔 클라이언트들의 REST 요청량 시뮬레이션.
+
+--clients 명이 --minutes 분 동안 파티 화면을 보고 있고, 그동안 --changes 번의 변경
+(참가 / 할 일 추가 / 할 일 완료 / 파티 수정)이 임의 시각에 일어난다고 가정합니다.
+  - polling       : 클라이언트마다 --poll-interval 초마다 이벤트 상세 + 할 일 목록 GET
+  - polling+ETag  : 같은 폴링이지만 바뀌지 않은 구간의 이벤트 상세는 304 (user-019)
+  - push          : 처음에 한 번 GET 후 /party 델타만 수신
+변경은 실제 REST API 로 실행하고, 델타 개수와 크기는 party_publisher 가 보낸 값을 그대로 잽니다.
+
+    python -m benchmarks.party_push --clients 20 --minutes 30 --poll-interval 5 --changes 60
+"""
+import argparse
+import asyncio
+import json
+import random
+import threading
+
+from .common import Timer, bench_database, print_table, setup_django
+
+
+def seed(members):
+    from datetime import date
+
+    from django.contrib.auth.models import User
+
+    from core.models import Event, Participant
+
+    host = User.objects.create_user(username='host', email='host@bench.local')
+    event = Event.objects.create(name='bench party', date=date(2026, 1, 1), host=host,
+                                 max_members=1000, participant_count=1)
+    Participant.objects.create(event=event, user=host, name='host')
+    users = User.objects.bulk_create([User(username=f'user{i}', email=f'user{i}@bench.local') for i in range(members)])
+    return host, event, users
+
+
+def run_changes(client, host, event, users, count, rng):
+    """변경 count 번을 REST 로 실행합니다."""
+    todos = []
+    for i in range(count):
+        kind = rng.choice(['join', 'todo', 'complete', 'edit']) if todos else 'todo'
+        if kind == 'join' and users:
+            client.force_authenticate(users.pop())
+            client.post('/api/participants/', {'event': event.id})
+        elif kind == 'complete' and todos:
+            client.force_authenticate(host)
+            client.patch(f'/api/todos/{todos.pop()}/', {'is_completed': True})
+        elif kind == 'edit':
+            client.force_authenticate(host)
+            client.patch(f'/api/events/{event.id}/', {'description': f'update {i}'})
+        else:
+            client.force_authenticate(host)
+            todos.append(client.post('/api/todos/', {'event': event.id, 'task': f'task {i}'}).data['id'])
+
+
+def response_bytes(client, url, **headers):
+    return len(client.get(url, **headers).content)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--clients', type=int, default=20)
+    parser.add_argument('--minutes', type=float, default=30)
+    parser.add_argument('--poll-interval', type=float, default=5, help='seconds')
+    parser.add_argument('--changes', type=int, default=60)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.test import APIClient
+
+    from joiny_server.party_push import party_publisher
+
+    rng = random.Random(42)
+    session_s = args.minutes * 60
+    frames = []
+
+    async def collect(event, party_id, payload):
+        frames.append(len(json.dumps(payload)))
+
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    async def start():
+        party_publisher.start(collect)
+
+    asyncio.run_coroutine_threadsafe(start(), loop).result()
+
+    with bench_database():
+        host, event, users = seed(args.changes)
+        client = APIClient(HTTP_HOST='localhost')  # ALLOWED_HOSTS 에 testserver 가 없으므로
+        with Timer() as t:
+            run_changes(client, host, event, users, args.changes, rng)
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0), loop).result()
+
+        client.force_authenticate(None)
+        detail_url = f'/api/events/{event.id}/'
+        detail = client.get(detail_url)
+        detail_bytes = len(detail.content)
+        todos_bytes = response_bytes(client, '/api/todos/')
+        not_modified_bytes = response_bytes(client, detail_url, HTTP_IF_NONE_MATCH=detail['ETag'])
+
+    party_publisher.stop()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+
+    # 폴링 구간 중 변경이 있었던 구간 (그 구간의 이벤트 상세만 200)
+    polls = int(session_s // args.poll_interval)
+    change_times = [rng.uniform(0, session_s) for _ in range(args.changes)]
+    changed_polls = len({int(ts // args.poll_interval) for ts in change_times})
+
+    per_client_polls = polls * 2
+    polling_bytes = polls * (detail_bytes + todos_bytes)
+    etag_bytes = changed_polls * detail_bytes + (polls - changed_polls) * not_modified_bytes + polls * todos_bytes
+    push_bytes = detail_bytes + todos_bytes + sum(frames)
+
+    rows = [
+        ('polling', {'requests': per_client_polls * args.clients, 'kbytes': polling_bytes * args.clients / 1024,
+                     'staleness_s': args.poll_interval / 2}),
+        ('polling+ETag', {'requests': per_client_polls * args.clients, 'kbytes': etag_bytes * args.clients / 1024,
+                          'staleness_s': args.poll_interval / 2}),
+        ('push', {'requests': 2 * args.clients, 'kbytes': push_bytes * args.clients / 1024,
+                  'staleness_s': 0.0}),
+    ]
+    print(f'ran {args.changes} changes over REST in {t.elapsed:.2f}s; '
+          f'{len(frames)} deltas pushed, mean {sum(frames) / max(len(frames), 1):.0f} bytes')
+    print_table(f'{args.clients} clients, {args.minutes:g} min, poll every {args.poll_interval:g}s', rows)
+    reduction = 1 - rows[2][1]['requests'] / rows[0][1]['requests']
+    print(f'REST request reduction with push: {reduction:.1%}')
+
+
+if __name__ == '__main__':
+    main()
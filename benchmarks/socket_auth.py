@@ -0,0 +1,84 @@
+# benchmarks/socket_auth.py
+"""
+Socket.IO 메시지당 인증/권한 확인 비용.
+
+같은 chat_message 권한 확인(이 유저가 이 파티 멤버인가?)을 방식별로 --messages 번 반복합니다.
+  - trust client user_id : 확인 없음 (기존 동작, 기준선)
+  - DB check per message  : 메시지마다 Participant 조회 (sync_to_async)
+  - JWT decode per message: 메시지마다 토큰 서명/만료 검증 (멤버십 확인은 별도로 필요)
+  - session cache         : 연결 시 한 번 읽어둔 세션에서 조회 (socket_auth.joined_at)
+연결 시 1회 비용(authenticate: 토큰 검증 + 유저/멤버십 조회)도 따로 출력합니다.
+
+    python -m benchmarks.socket_auth --messages 5000 --parties 20
+"""
+import argparse
+import asyncio
+
+from .common import Timer, bench_database, print_table, setup_django
+
+
+def seed(parties):
+    from datetime import date
+
+    from django.contrib.auth.models import User
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from core.models import Event, Participant
+
+    user = User.objects.create_user(username='bench', email='bench@bench.local')
+    events = Event.objects.bulk_create([Event(name=f'party {i}', date=date(2026, 1, 1)) for i in range(parties)])
+    Participant.objects.bulk_create([Participant(event=e, user=user, name='bench') for e in events])
+    return user, [str(e.id) for e in events], str(AccessToken.for_user(user))
+
+
+async def run(messages, user, party_ids, token):
+    from asgiref.sync import sync_to_async
+
+    from joiny_server import chat_history, socket_auth
+
+    with Timer() as connect_t:
+        session = await socket_auth.authenticate({}, {'token': token})
+
+    async def trust(party_id):
+        return user.id
+
+    async def db_check(party_id):
+        return await sync_to_async(chat_history.get_joined_at)(party_id, user.id)
+
+    async def jwt_decode(party_id):
+        return socket_auth.decode_user_id(token)
+
+    async def session_cache(party_id):
+        return await socket_auth.joined_at(session, party_id)
+
+    rows = []
+    for label, check in [
+        ('trust client user_id', trust),
+        ('DB check per message', db_check),
+        ('JWT decode per message', jwt_decode),
+        ('session cache', session_cache),
+    ]:
+        with Timer() as t:
+            for i in range(messages):
+                assert await check(party_ids[i % len(party_ids)]) is not None
+        rows.append((label, {'us/msg': t.elapsed / messages * 1e6, 'msgs/sec': messages / t.elapsed}))
+    return connect_t.elapsed, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--messages', type=int, default=5000)
+    parser.add_argument('--parties', type=int, default=20, help='memberships of the connecting user')
+    args = parser.parse_args()
+
+    setup_django()
+    with bench_database():
+        user, party_ids, token = seed(args.parties)
+        connect_s, rows = asyncio.run(run(args.messages, user, party_ids, token))
+
+    print(f'connect (token check + session load, {args.parties} memberships): {connect_s * 1000:.2f} ms')
+    print_table(f'per-message authorization, {args.messages} messages', rows)
+
+
+if __name__ == '__main__':
+    main()
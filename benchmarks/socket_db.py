@@ -0,0 +1,110 @@
+# benchmarks/socket_db.py
+"""
+Socket.IO 핸들러의 DB 호출: 공용 스레드 하나(DB_EXECUTOR_WORKERS=0) vs 전용 스레드 풀.
+
+clients 개의 인증된 클라이언트가 동시에 /chat join_party 를 보내고 chat_history 를 받을 때까지의
+지연을 잽니다. (멤버십 확인 + 히스토리 페이지 쿼리, joiny_server/data.py 경유)
+--rtt-ms 는 쿼리마다 DB 왕복 시간을 흉내 냅니다. (인메모리 sqlite 는 왕복이 없어 차이가 작게 보임)
+
+    python -m benchmarks.socket_db --clients 50 --workers 0 2 4 8 --rtt-ms 1
+"""
+import argparse
+import asyncio
+import time
+from datetime import date
+
+from .common import bench_database, percentile, print_table, setup_django
+
+
+def simulate_rtt(rtt):
+    """모든 DB 연결에 쿼리마다 rtt 초 대기를 넣습니다. (GIL 을 놓는 네트워크 대기와 같음)"""
+    from django.db import connections
+    from django.db.backends.signals import connection_created
+
+    def wait(execute, sql, params, many, context):
+        time.sleep(rtt)
+        return execute(sql, params, many, context)
+
+    def install(connection, **kwargs):
+        if wait not in connection.execute_wrappers:
+            connection.execute_wrappers.append(wait)
+
+    connection_created.connect(install, weak=False)
+    for connection in connections.all():
+        install(connection)
+
+
+async def join_storm(client, tokens, party_id):
+    from .asgi_client import SocketIOClient
+
+    sockets = [SocketIOClient(client) for _ in tokens]
+    await asyncio.gather(*(s.open() for s in sockets))
+    await asyncio.gather(*(s.connect('/chat', {'token': t}) for s, t in zip(sockets, tokens)))
+
+    samples = []
+
+    async def join(sock):
+        start = time.perf_counter()
+        await sock.emit('/chat', 'join_party', {'party_id': party_id})
+        while not any(event == 'chat_history' for event, _, _ in sock.events):
+            sock.received.clear()
+            await sock.received.wait()
+        samples.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(join(s) for s in sockets))
+    wall = time.perf_counter() - start
+    await asyncio.gather(*(s.close() for s in sockets))
+    return {
+        'joins/sec': len(samples) / wall,
+        'p50_ms': percentile(samples, 50) * 1000,
+        'p95_ms': percentile(samples, 95) * 1000,
+        'p99_ms': percentile(samples, 99) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=50)
+    parser.add_argument('--workers', type=int, nargs='+', default=[0, 2, 4, 8], help='DB_EXECUTOR_WORKERS values')
+    parser.add_argument('--messages', type=int, default=200, help='chat messages in the party')
+    parser.add_argument('--rtt-ms', type=float, default=1.0, help='simulated DB round trip per query')
+    parser.add_argument('--rounds', type=int, default=3)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth.models import User
+    from django.test.utils import override_settings
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from core.models import ChatMessage, Event, Participant
+    from joiny_server import data
+
+    from .asgi_client import AsgiClient
+
+    with bench_database():
+        users = User.objects.bulk_create([User(username=f'user{i}@bench.local') for i in range(args.clients)])
+        event = Event.objects.create(name='party', date=date(2026, 1, 1), max_members=args.clients)
+        Participant.objects.bulk_create([Participant(event=event, user=u, name=u.username) for u in users])
+        ChatMessage.objects.bulk_create([
+            ChatMessage(event=event, sender=users[i % len(users)], message=f'hello {i}') for i in range(args.messages)
+        ])
+        tokens = [str(AccessToken.for_user(u)) for u in users]
+        if args.rtt_ms > 0:
+            simulate_rtt(args.rtt_ms / 1000)
+
+        from joiny_server.asgi import application
+
+        client = AsgiClient(application)
+        rows = []
+        for workers in args.workers:
+            with override_settings(DB_EXECUTOR_WORKERS=workers):
+                runs = [asyncio.run(join_storm(client, tokens, str(event.id))) for _ in range(args.rounds)]
+                data.shutdown()
+            best = max(runs, key=lambda r: r['joins/sec'])
+            rows.append(('shared thread' if workers == 0 else f'{workers} threads', best))
+        print_table(f'{args.clients} concurrent join_party, rtt {args.rtt_ms}ms (best of {args.rounds})', rows)
+
+
+if __name__ == '__main__':
+    main()
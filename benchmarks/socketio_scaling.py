@@ -0,0 +1,122 @@
+# benchmarks/socketio_scaling.py
+"""
+Socket.IO 멀티 워커 브로드캐스트 검증 + 처리량 측정.
+
+브로커와 N개의 워커 프로세스를 띄우고, 각 워커에 가짜 클라이언트를 party 방에 입장시킨 뒤
+모든 워커가 동시에 방으로 emit 합니다. 모든 워커의 모든 클라이언트가 모든 메시지를
+받았는지 확인하고, 워커 수별 처리량을 출력합니다.
+
+    python -m benchmarks.socketio_scaling --workers 1 2 4 --clients 50 --messages 200
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import tempfile
+import time
+
+from .common import print_table
+
+NAMESPACE = '/chat'
+ROOM = 'party_1'
+
+
+def run_broker_process(path):
+    from joiny_server.pubsub import run_broker
+
+    asyncio.run(run_broker(path))
+
+
+def run_worker_process(index, path, clients, messages, workers, barrier, results):
+    asyncio.run(worker(index, path, clients, messages, workers, barrier, results))
+
+
+async def worker(index, path, clients, messages, workers, barrier, results):
+    import socketio
+    from joiny_server.pubsub import UnixSocketPubSubManager
+
+    manager = UnixSocketPubSubManager(path, channel='bench')
+    server = socketio.AsyncServer(async_mode='asgi', client_manager=manager)
+    expected = messages * workers * clients
+    received = 0
+    done = asyncio.Event()
+
+    async def count_packet(eio_sid, pkt):
+        # 실제 소켓 대신 전송된 패킷 수만 셉니다.
+        nonlocal received
+        received += 1
+        if received >= expected:
+            done.set()
+
+    server._send_eio_packet = count_packet
+    server.manager_initialized = True
+    manager.initialize()
+
+    for i in range(clients):
+        sid = await manager.connect(f'w{index}-c{i}', NAMESPACE)
+        await manager.enter_room(sid, NAMESPACE, ROOM)
+    await asyncio.sleep(0.5)  # 브로커 구독 연결 대기
+
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, barrier.wait)
+    started = time.perf_counter()
+    for m in range(messages):
+        await server.emit('chat_message', {'message': f'{index}-{m}'}, namespace=NAMESPACE, room=ROOM)
+    try:
+        await asyncio.wait_for(done.wait(), timeout=60)
+    except asyncio.TimeoutError:
+        pass
+    results.put((index, received, expected, time.perf_counter() - started))
+
+
+def run(workers, clients, messages):
+    path = os.path.join(tempfile.mkdtemp(), 'bench-sio.sock')
+    ctx = multiprocessing.get_context('spawn')
+    broker = ctx.Process(target=run_broker_process, args=(path,), daemon=True)
+    broker.start()
+    while not os.path.exists(path):
+        time.sleep(0.05)
+
+    barrier = ctx.Barrier(workers)
+    results = ctx.Queue()
+    procs = [
+        ctx.Process(target=run_worker_process, args=(i, path, clients, messages, workers, barrier, results))
+        for i in range(workers)
+    ]
+    for p in procs:
+        p.start()
+    rows = [results.get(timeout=120) for _ in procs]
+    for p in procs:
+        p.join()
+    broker.terminate()
+
+    delivered = sum(r[1] for r in rows)
+    expected = sum(r[2] for r in rows)
+    elapsed = max(r[3] for r in rows)
+    return {
+        'published': messages * workers,
+        'delivered': delivered,
+        'expected': expected,
+        'seconds': elapsed,
+        'deliveries/sec': delivered / elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--clients', type=int, default=50, help='clients per worker')
+    parser.add_argument('--messages', type=int, default=200, help='messages emitted per worker')
+    args = parser.parse_args()
+
+    rows = []
+    for n in args.workers:
+        result = run(n, args.clients, args.messages)
+        rows.append((f'{n} worker(s)', result))
+        if result['delivered'] != result['expected']:
+            print(f"!! {n} worker(s): delivered {result['delivered']} of {result['expected']}")
+    print_table('Socket.IO broadcast across workers (unix broker)', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+# benchmarks/wire_format.py
+"""
+JSON vs 바이너리 wire format 비교: 프레임당 바이트 수와 encode/decode CPU 시간.
+바이트 수는 Socket.IO 패킷 인코딩(바이너리 첨부 헤더 포함) 기준입니다.
+
+    python -m benchmarks.wire_format --users 10 --iterations 20000
+"""
+import argparse
+import json
+import random
+
+from socketio import packet
+
+from joiny_server import wire
+
+from .common import Timer, print_table
+
+
+def frame_bytes(event, data):
+    """Socket.IO 패킷으로 인코딩했을 때 전송되는 총 바이트 수"""
+    encoded = packet.Packet(packet.EVENT, namespace='/location', data=[event, data]).encode()
+    if not isinstance(encoded, list):
+        encoded = [encoded]
+    return sum(len(p.encode('utf-8') if isinstance(p, str) else p) for p in encoded)
+
+
+def measure(label, event, payload, encode, decode, iterations):
+    encoded = encode(payload)
+    with Timer() as enc:
+        for _ in range(iterations):
+            encode(payload)
+    with Timer() as dec:
+        for _ in range(iterations):
+            decode(encoded)
+    return (label, {
+        'bytes/frame': frame_bytes(event, encoded if isinstance(encoded, bytes) else payload),
+        'encode_us': enc.elapsed / iterations * 1e6,
+        'decode_us': dec.elapsed / iterations * 1e6,
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--iterations', type=int, default=20000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    update = {'party_id': '123', 'user_id': 42, 'lat': 37.566535, 'lng': 126.977969}
+    batch = {
+        'party_id': '123',
+        'locations': [
+            {'user_id': 1000 + i, 'lat': 37.5 + rng.random() / 10, 'lng': 126.9 + rng.random() / 10}
+            for i in range(args.users)
+        ],
+    }
+    chat = {'party_id': '123', 'user_id': '42', 'user_name': 'Kim', 'message': '곧 도착해요! 5분만 기다려줘'}
+    n = args.iterations
+
+    rows = [
+        measure('location_update json', 'location_update', update, json.dumps, json.loads, n),
+        measure('location_update binary', 'location_update', update,
+                lambda d: wire.LOCATION_UPDATE.pack(int(d['party_id']), d['user_id'], wire.to_fixed(d['lat']), wire.to_fixed(d['lng'])),
+                wire.decode_location_update, n),
+        measure(f'location_batch x{args.users} json', 'location_batch', batch, json.dumps, json.loads, n),
+        measure(f'location_batch x{args.users} binary', 'location_batch', batch,
+                lambda d: wire.encode_location_batch(d['party_id'], d['locations']),
+                wire.decode_location_batch, n),
+        measure('chat_message json', 'chat_message', chat, json.dumps, json.loads, n),
+        measure('chat_message binary', 'chat_message', chat,
+                lambda d: wire.encode_chat_message(d['party_id'], d['user_id'], d['user_name'], d['message']),
+                wire.decode_chat_message, n),
+    ]
+    print_table('Wire format: bytes per frame and CPU per frame', rows)
+
+
+if __name__ == '__main__':
+    main()
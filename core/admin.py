@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Theme, Event, Participant, Todo, Friendship  # 모든 모델 import
+from .models import Theme, Event, Participant, Todo, Friendship, WaitlistEntry  # 모든 모델 import
 
 # 1. Theme 모델 등록
 @admin.register(Theme)
@@ -10,7 +10,8 @@ class ThemeAdmin(admin.ModelAdmin):
 # 2. 다른 모델들도 함께 등록하여 관리 편리성 높이기
 @admin.register(Event)
 class EventAdmin(admin.ModelAdmin):
-    list_display = ('name', 'date', 'theme', 'invite_code')
+    list_display = ('name', 'date', 'theme', 'invite_code', 'is_archived')
+    list_filter = ('is_archived',)
     search_fields = ('name', 'theme')
 
 
@@ -32,3 +33,9 @@ class FriendshipAdmin(admin.ModelAdmin):
     list_filter = ('status',)
 
 
+
+
+@admin.register(WaitlistEntry)
+class WaitlistEntryAdmin(admin.ModelAdmin):
+    list_display = ('user', 'event', 'created_at')
+    list_filter = ('event',)
@@ -0,0 +1,84 @@
+# core/archive.py
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import ArchivedChatMessage, ChatMessage, Event
+
+# 한 트랜잭션에서 보관 처리할 이벤트 수
+ARCHIVE_BATCH_SIZE = 100
+
+MESSAGE_COLUMNS = ('id', 'event_id', 'sender_id', 'message', 'created_at', 'uuid')
+
+
+def cutoff_for(days):
+    """오늘 기준 days 일 전 날짜. 이 날짜보다 이전에 열린 파티가 보관 대상입니다."""
+    return timezone.localdate() - timedelta(days=days)
+
+
+def archivable(cutoff):
+    return Event.objects.filter(is_archived=False, date__lt=cutoff)
+
+
+def move_messages(event_ids):
+    """
+    이벤트들의 ChatMessage 를 ArchivedChatMessage 로 옮깁니다. (INSERT ... SELECT 한 번 + DELETE 한 번)
+    옮긴 행만 지우므로, 그 사이 채팅 버퍼가 새로 쓴 메시지는 핫 테이블에 남습니다.
+    """
+    if not event_ids:
+        return 0
+    qn = connection.ops.quote_name
+    columns = ', '.join(qn(column) for column in MESSAGE_COLUMNS)
+    placeholders = ', '.join(['%s'] * len(event_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {qn(ArchivedChatMessage._meta.db_table)} ({columns}) '
+            f'SELECT {columns} FROM {qn(ChatMessage._meta.db_table)} WHERE {qn("event_id")} IN ({placeholders})',
+            list(event_ids),
+        )
+    moved = ArchivedChatMessage.objects.filter(event_id__in=event_ids).values('id')
+    deleted, _ = ChatMessage.objects.filter(event_id__in=event_ids, id__in=moved).delete()
+    return deleted
+
+
+def lock_batch(queryset, batch_size):
+    """
+    보관할 이벤트 id 를 잠급니다. SKIP LOCKED 를 지원하면 다른 워커가 처리 중인 행은 건너뛰므로
+    여러 워커의 스케줄 작업이 동시에 돌아도 같은 이벤트를 두 번 옮기지 않습니다.
+    """
+    queryset = queryset.order_by('id')
+    if connection.features.has_select_for_update_skip_locked:
+        queryset = queryset.select_for_update(skip_locked=True)
+    return list(queryset.values_list('id', flat=True)[:batch_size])
+
+
+# ----------------------------------------------------
+# 보관 처리 (management command / ASGI 스케줄 작업에서 호출)
+# ----------------------------------------------------
+def archive_events(cutoff, batch_size=ARCHIVE_BATCH_SIZE):
+    """
+    cutoff 이전에 열린 파티를 batch_size 개씩 보관 처리합니다.
+    배치마다 한 트랜잭션에서 채팅을 옮기고 is_archived=True 로 표시합니다.
+    보관 후에 들어온 채팅(보관된 파티에 늦게 온 메시지)도 함께 옮깁니다.
+    Participant 는 멤버십 확인과 '참여한 파티' 목록에 계속 쓰이므로 옮기지 않습니다.
+    Returns (보관한 이벤트 수, 옮긴 메시지 수).
+    """
+    events = messages = 0
+    while True:
+        with transaction.atomic():
+            batch = lock_batch(archivable(cutoff), batch_size)
+            if not batch:
+                break
+            messages += move_messages(batch)
+            Event.objects.filter(id__in=batch).update(is_archived=True)
+        events += len(batch)
+
+    stragglers = Event.objects.filter(is_archived=True, id__in=ChatMessage.objects.values('event_id'))
+    while True:
+        with transaction.atomic():
+            batch = lock_batch(stragglers, batch_size)
+            if not batch:
+                break
+            messages += move_messages(batch)
+    return events, messages
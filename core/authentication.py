@@ -1,15 +1,69 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.backends import ModelBackend
+from django.db.models import Case, IntegerField, Q, Value, When
+
+# request 에 조회 결과를 저장할 속성 이름 (serializer 와 backend 가 같은 요청에서 한 번만 조회)
+LOGIN_USER_CACHE = '_login_user_cache'
+
+
+def resolve_login_user(login_id, request=None):
+    """
+    이메일 또는 이름(username)으로 유저를 쿼리 한 번에 찾습니다. (대소문자 무시)
+    여러 명이 걸리면 이메일 정확히 일치 > 이메일 대소문자 무시 일치 > username 정확히 일치 > username 대소문자 무시 일치,
+    그다음 먼저 가입한 순. (대소문자만 다른 이메일이 둘이면 입력한 그대로의 이메일이 이깁니다)
+    Postgres 에서는 UPPER(email) / UPPER(username) 함수 인덱스를 탑니다. (0017 마이그레이션)
+    request 를 주면 결과를 request 에 저장해서 같은 요청의 다음 호출은 쿼리 없이 돌려줍니다.
+    """
+    if not login_id:
+        return None
+    cache = getattr(request, LOGIN_USER_CACHE, None) if request is not None else None
+    if cache is not None and login_id in cache:
+        return cache[login_id]
+
+    UserModel = get_user_model()
+    user = (
+        UserModel.objects.filter(Q(email__iexact=login_id) | Q(username__iexact=login_id))
+        .annotate(login_match=Case(
+            When(email=login_id, then=Value(0)),
+            When(email__iexact=login_id, then=Value(1)),
+            When(username=login_id, then=Value(2)),
+            default=Value(3),
+            output_field=IntegerField(),
+        ))
+        .order_by('login_match', 'id')
+        .first()
+    )
+
+    if request is not None:
+        if cache is None:
+            cache = {}
+            setattr(request, LOGIN_USER_CACHE, cache)
+        cache[login_id] = user
+        if user is not None:
+            # serializer 가 attrs['username'] 을 실제 username 으로 바꿔 넘겨도 다시 조회하지 않도록
+            cache[user.get_username()] = user
+    return user
+
 
 class EmailBackend(ModelBackend):
+    """
+    이메일 또는 username 로그인. 유저 조회 1번 + 비밀번호 해시 1번.
+    username 로그인도 여기서 처리하므로 settings 에 ModelBackend 를 따로 두지 않습니다.
+    (두면 로그인 실패 시 조회와 해시를 한 번씩 더 합니다)
+    """
     def authenticate(self, request, username=None, password=None, **kwargs):
         UserModel = get_user_model()
-        try:
-            # 이메일로 유저 찾기
-            user = UserModel.objects.get(email=username)
-        except UserModel.DoesNotExist:
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+
+        user = resolve_login_user(username, request)
+        if user is None:
+            # 없는 계정도 해시 한 번만큼 시간이 걸리게 해서 계정 존재 여부가 드러나지 않도록 (ModelBackend 와 동일)
+            UserModel().set_password(password)
             return None
 
-        if user.check_password(password):
+        if user.check_password(password) and self.user_can_authenticate(user):
             return user
         return None
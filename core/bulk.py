@@ -0,0 +1,50 @@
+# core/bulk.py
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.validators import validate_email
+from rest_framework.exceptions import ValidationError
+
+# 한 번의 bulk 요청에서 받는 최대 항목 수
+BULK_MAX_ITEMS = 500
+
+
+def email_list(data):
+    """요청 body 의 emails 배열을 꺼냅니다. 형식이 틀리면 400 (ValidationError)"""
+    emails = data.get('emails')
+    if not isinstance(emails, list) or not emails:
+        raise ValidationError({'emails': 'A non-empty list of emails is required.'})
+    if len(emails) > BULK_MAX_ITEMS:
+        raise ValidationError({'emails': f'At most {BULK_MAX_ITEMS} emails per request.'})
+    return emails
+
+
+def resolve_emails(emails):
+    """
+    이메일 목록을 User 쿼리 한 번으로 찾습니다.
+    요청 순서대로 [(email, user 또는 None, 실패 사유 또는 None)] 를 돌려줍니다.
+    실패 사유: 'duplicate' (같은 요청 안에서 중복) / 'invalid' (형식 오류) / 'not_found'
+    """
+    items, seen = [], set()
+    for raw in emails:
+        email = str(raw).strip()
+        if email in seen:
+            items.append((email, 'duplicate'))
+            continue
+        seen.add(email)
+        try:
+            validate_email(email)
+        except DjangoValidationError:
+            items.append((email, 'invalid'))
+            continue
+        items.append((email, None))
+
+    valid = [email for email, error in items if error is None]
+    users = {}
+    # 같은 이메일의 유저가 여러 명이면 먼저 가입한 유저 (id 가 작은 쪽)
+    for user in User.objects.filter(email__in=valid).order_by('-id'):
+        users[user.email] = user
+
+    return [
+        (email, users.get(email), error or (None if email in users else 'not_found'))
+        for email, error in items
+    ]
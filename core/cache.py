@@ -0,0 +1,179 @@
+# core/cache.py
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ValidationError
+
+MISSING = object()
+
+
+# ----------------------------------------------------
+# 1. 프로세스 로컬 LRU 캐시 (TTL 지원)
+# ----------------------------------------------------
+class LRUCache:
+    """스레드 안전한 프로세스 로컬 LRU 캐시. 항목은 ttl 초가 지나면 만료됩니다."""
+
+    def __init__(self, max_size=1024, ttl=5.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key, MISSING)
+            if item is MISSING:
+                return MISSING
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return MISSING
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+# ----------------------------------------------------
+# 2. 2단계 캐시 (로컬 LRU -> Django 캐시 백엔드)
+# ----------------------------------------------------
+class TieredCache:
+    """
+    로컬 LRU를 먼저 보고, 없으면 settings.CACHES 의 2단계 캐시(locmem/file/redis 등)를 봅니다.
+    쓰기는 두 단계 모두에 동시에 반영(write-through)합니다.
+    다른 프로세스의 로컬 LRU는 시그널로 지울 수 없으므로 로컬 TTL을 짧게 유지해야 합니다.
+
+    2단계가 LocMemCache 이면 그것도 프로세스 안에만 있습니다. (워커끼리 공유되지 않음)
+    이때는 무효화가 현재 워커에만 닿으므로 2단계 TTL 도 로컬 TTL 로 줄여서,
+    다른 워커가 옛 값을 돌려주는 시간을 로컬 LRU 와 같게 맞춥니다.
+    워커가 여럿이면 redis / memcached 같은 공유 백엔드(CACHE_BACKEND)를 쓰세요.
+    """
+
+    def __init__(self, name):
+        config = settings.EVENT_CACHE
+        self.name = name
+        self.local = LRUCache(max_size=config['LOCAL_MAX_SIZE'], ttl=config['LOCAL_TTL'])
+        self.alias = config['ALIAS']
+        self.shared_ttl = config['SHARED_TTL']
+        self._stats_lock = threading.Lock()
+        self.stats = {'local_hits': 0, 'shared_hits': 0, 'misses': 0}
+
+    @property
+    def shared(self):
+        return caches[self.alias]
+
+    @property
+    def shared_is_local(self):
+        """2단계 캐시가 이 프로세스 안에만 있는지 (LocMemCache)"""
+        return isinstance(self.shared, LocMemCache)
+
+    def ttl(self):
+        if self.shared_is_local:
+            return min(self.shared_ttl, self.local.ttl)
+        return self.shared_ttl
+
+    def make_key(self, key):
+        return f"joiny:{self.name}:{key}"
+
+    def count(self, stat):
+        with self._stats_lock:
+            self.stats[stat] += 1
+
+    def get(self, key):
+        value = self.local.get(key)
+        if value is not MISSING:
+            self.count('local_hits')
+            return value
+
+        value = self.shared.get(self.make_key(key), MISSING)
+        if value is not MISSING:
+            self.count('shared_hits')
+            self.local.set(key, value)
+            return value
+
+        self.count('misses')
+        return MISSING
+
+    def set(self, key, value):
+        self.local.set(key, value)
+        self.shared.set(self.make_key(key), value, self.ttl())
+
+    def delete(self, key):
+        self.local.delete(key)
+        self.shared.delete(self.make_key(key))
+
+    def clear(self):
+        self.local.clear()
+        with self._stats_lock:
+            self.stats = {'local_hits': 0, 'shared_hits': 0, 'misses': 0}
+
+    def snapshot(self):
+        """모니터링용 카운터 복사본"""
+        with self._stats_lock:
+            return {**self.stats, 'local_size': len(self.local)}
+
+
+invite_code_cache = TieredCache('invite_code')
+event_payload_cache = TieredCache('event_payload')
+
+# 테마 목록 (거의 바뀌지 않음): 프로세스 로컬에만 두고 Theme 시그널 / TTL 로 갱신합니다.
+theme_cache = LRUCache(max_size=1, ttl=settings.THEME_CACHE_TTL)
+
+
+def cache_stats():
+    """모니터링용 캐시 히트/미스 카운터"""
+    return {
+        cache.name: cache.snapshot()
+        for cache in (invite_code_cache, event_payload_cache)
+    }
+
+
+# ----------------------------------------------------
+# 3. 초대 코드 -> 이벤트 조회 헬퍼
+# ----------------------------------------------------
+def resolve_invite_code(invite_code):
+    """초대 코드에 해당하는 이벤트 id를 반환합니다. 없으면 None."""
+    from .models import Event
+
+    key = str(invite_code)
+    event_id = invite_code_cache.get(key)
+    if event_id is not MISSING:
+        return event_id
+
+    try:
+        event_id = Event.objects.filter(invite_code=invite_code).values_list('id', flat=True).first()
+    except ValidationError:
+        # UUID 형식이 아닌 코드
+        return None
+    if event_id is not None:
+        invite_code_cache.set(key, event_id)
+    return event_id
+
+
+def get_event_payload(event_id, build):
+    """직렬화된 이벤트 데이터를 캐시에서 가져오고, 없으면 build()로 만들어 저장합니다."""
+    payload = event_payload_cache.get(event_id)
+    if payload is MISSING:
+        payload = build()
+        event_payload_cache.set(event_id, payload)
+    return payload
@@ -0,0 +1,66 @@
+# core/conditional.py
+import hashlib
+import json
+
+from django.db.models import F
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from .models import Event
+
+
+# ----------------------------------------------------
+# Event 버전 키 (ETag / Last-Modified 의 기준)
+# ----------------------------------------------------
+def version_bump():
+    """Event 버전을 올리는 update() 인자 (참가자 수 갱신 같은 UPDATE 에 함께 넣을 수 있습니다)"""
+    return {'version': F('version') + 1, 'updated_at': timezone.now()}
+
+
+def bump_event_version(*event_ids):
+    Event.objects.filter(pk__in=event_ids).update(**version_bump())
+
+
+# 버전 키를 계산하는 데 필요한 Event 컬럼
+VERSION_COLUMNS = ('version', 'updated_at')
+
+
+def validators_for(event_id, version, updated_at):
+    """(ETag, Last-Modified 시각)"""
+    # 저장과 버전 갱신이 겹쳐 version 이 같아지는 경우에도 구분되도록 갱신 시각을 함께 씁니다.
+    return f'"{event_id}.{version}.{int(updated_at.timestamp() * 1_000_000)}"', updated_at
+
+
+def event_validators(event_id):
+    """버전 컬럼만 읽은 (ETag, Last-Modified 시각). 이벤트가 없으면 None. 직렬화 없음."""
+    row = Event.objects.filter(pk=event_id).values_list(*VERSION_COLUMNS).first()
+    return validators_for(event_id, *row) if row is not None else None
+
+
+def content_etag(data):
+    """응답 데이터 자체의 해시로 만든 ETag (버전 컬럼이 없는 리소스용)"""
+    payload = json.dumps(data, sort_keys=True, default=str).encode()
+    return f'"{hashlib.md5(payload, usedforsecurity=False).hexdigest()}"'
+
+
+# ----------------------------------------------------
+# 조건부 요청 처리
+# ----------------------------------------------------
+def is_conditional(request):
+    return 'HTTP_IF_NONE_MATCH' in request.META or 'HTTP_IF_MODIFIED_SINCE' in request.META
+
+
+def not_modified(request, etag, last_modified=None):
+    """If-None-Match / If-Modified-Since 가 맞으면 304 응답, 아니면 None."""
+    # HTTP 날짜는 초 단위이므로 초 미만은 버리고 비교합니다.
+    return get_conditional_response(
+        request, etag=etag, last_modified=int(last_modified.timestamp()) if last_modified else None
+    )
+
+
+def set_validators(response, etag, last_modified=None):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
@@ -0,0 +1,69 @@
+# core/friends.py
+from django.contrib.auth.models import User
+from django.db.models import Count
+
+from .models import FriendEdge, Friendship
+
+# 친구 추천 시 살펴볼 내 친구 수 상한 (친구가 아주 많은 유저도 조회 비용이 일정하도록)
+SUGGESTION_FANOUT = 500
+
+
+# ----------------------------------------------------
+# FriendEdge 갱신 (Friendship 시그널에서 호출)
+# ----------------------------------------------------
+def edges_for(from_user_id, to_user_id):
+    return [
+        FriendEdge(user_id=from_user_id, friend_id=to_user_id),
+        FriendEdge(user_id=to_user_id, friend_id=from_user_id),
+    ]
+
+
+def sync_edges(friendship):
+    """Friendship 상태에 맞춰 양방향 FriendEdge 를 만들거나 지웁니다."""
+    if friendship.status == 'accepted':
+        FriendEdge.objects.bulk_create(
+            edges_for(friendship.from_user_id, friendship.to_user_id), ignore_conflicts=True
+        )
+    else:
+        remove_edges(friendship)
+
+
+def remove_edges(friendship):
+    a, b = friendship.from_user_id, friendship.to_user_id
+    FriendEdge.objects.filter(user_id__in=(a, b), friend_id__in=(a, b)).delete()
+
+
+# ----------------------------------------------------
+# 조회 (친구 / 함께 아는 친구 / 친구 추천)
+# ----------------------------------------------------
+def friend_ids(user_id):
+    """내 친구 id 목록을 돌려주는 subquery"""
+    return FriendEdge.objects.filter(user_id=user_id).values('friend_id')
+
+
+def friends(user_id):
+    return User.objects.filter(id__in=friend_ids(user_id)).order_by('id')
+
+
+def mutual_friends(user_id, other_id):
+    return User.objects.filter(id__in=friend_ids(user_id)).filter(id__in=friend_ids(other_id)).order_by('id')
+
+
+def suggestions(user_id, limit=20, fanout=SUGGESTION_FANOUT):
+    """
+    친구의 친구를 함께 아는 친구 수 순으로 [(user_id, mutual_count), ...].
+    이미 친구이거나 친구 요청을 주고받은 유저, 나 자신은 제외합니다.
+    내 친구 중 fanout 명까지만 살펴보므로 조회 비용은 fanout x 친구 평균 친구 수로 제한됩니다.
+    """
+    my_friends = FriendEdge.objects.filter(user_id=user_id).order_by('friend_id').values('friend_id')[:fanout]
+    rows = (
+        FriendEdge.objects.filter(user_id__in=my_friends)
+        .exclude(friend_id=user_id)
+        # 수락된 친구도 Friendship 행이 있으므로 두 조건으로 친구 + 요청 중인 유저가 모두 빠집니다.
+        .exclude(friend_id__in=Friendship.objects.filter(from_user_id=user_id).values('to_user_id'))
+        .exclude(friend_id__in=Friendship.objects.filter(to_user_id=user_id).values('from_user_id'))
+        .values('friend_id')
+        .annotate(mutual=Count('id'))
+        .order_by('-mutual', 'friend_id')[:limit]
+    )
+    return [(row['friend_id'], row['mutual']) for row in rows]
@@ -0,0 +1,96 @@
+# core/geo.py
+import math
+
+import numpy as np
+
+EARTH_RADIUS_M = 6371000
+
+# ----------------------------------------------------
+# 위경도 격자 (Event.geo_cell)
+# ----------------------------------------------------
+# 지구를 GRID_DEG 도 간격 격자로 나누고, 셀 번호 = 행(위도) * GRID_COLS + 열(경도).
+# 같은 위도 줄의 셀 번호가 연속이라 반경 검색은 줄마다 BETWEEN 한 번 (B-tree 범위 스캔)으로 끝납니다.
+# GRID_DEG 를 바꾸면 저장된 geo_cell 을 모두 다시 계산해야 합니다. (0015 마이그레이션 참고)
+GRID_DEG = 0.05  # 위도 방향 약 5.5km
+GRID_ROWS = int(round(180 / GRID_DEG))
+GRID_COLS = int(round(360 / GRID_DEG))
+
+
+def _row(lat):
+    return min(int((lat + 90) // GRID_DEG), GRID_ROWS - 1)
+
+
+def _col(lng):
+    return int(((lng + 180) % 360) // GRID_DEG) % GRID_COLS
+
+
+def cell_for(lat, lng):
+    """위경도가 속한 격자 셀 번호 (좌표가 없으면 None)"""
+    if lat is None or lng is None:
+        return None
+    return _row(float(lat)) * GRID_COLS + _col(float(lng))
+
+
+def cell_ranges(lat, lng, radius_m):
+    """
+    중심에서 radius_m 안의 점을 모두 포함하는 셀 번호 구간 [(lo, hi), ...].
+    위도 줄마다 한 구간이고, 날짜변경선을 넘으면 두 구간으로 나뉩니다.
+    """
+    dlat = math.degrees(radius_m / EARTH_RADIUS_M)
+    lat_lo, lat_hi = max(lat - dlat, -90.0), min(lat + dlat, 90.0)
+    # 극에 가까워 경도 폭이 한 바퀴를 넘으면 줄 전체를 봅니다.
+    cos_lat = math.cos(math.radians(max(abs(lat_lo), abs(lat_hi))))
+    dlng = 360.0 if cos_lat < 1e-9 else math.degrees(radius_m / (EARTH_RADIUS_M * cos_lat))
+
+    if dlng >= 180:
+        col_spans = [(0, GRID_COLS - 1)]
+    else:
+        col_lo, col_hi = _col(lng - dlng), _col(lng + dlng)
+        if col_lo <= col_hi:
+            col_spans = [(col_lo, col_hi)]
+        else:
+            col_spans = [(col_lo, GRID_COLS - 1), (0, col_hi)]
+
+    ranges = []
+    for row in range(_row(lat_lo), _row(lat_hi) + 1):
+        base = row * GRID_COLS
+        ranges.extend((base + lo, base + hi) for lo, hi in col_spans)
+    return ranges
+
+
+def haversine_m(lat, lng, lats, lngs):
+    """중심점에서 각 점까지의 거리(m), lats / lngs 는 NumPy 배열 (벡터 연산)"""
+    lat1, lng1 = math.radians(lat), math.radians(lng)
+    lat2, lng2 = np.radians(lats), np.radians(lngs)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+# ----------------------------------------------------
+# 주변 파티 검색 (격자 prefilter -> 정확한 거리 필터)
+# ----------------------------------------------------
+def nearby_ids(queryset, lat, lng, radius_m, limit):
+    """
+    queryset 중 radius_m 안에 있는 이벤트를 가까운 순으로 [(id, 거리 m), ...] 최대 limit 개.
+    1) geo_cell 구간으로 후보를 좁히고 (인덱스), 2) 후보의 위경도만 읽어 NumPy로 거리를 한 번에 계산합니다.
+    """
+    from django.db.models import Q
+
+    cells = Q()
+    for lo, hi in cell_ranges(lat, lng, radius_m):
+        cells |= Q(geo_cell__range=(lo, hi))
+    rows = list(queryset.filter(cells).order_by().values_list('id', 'latitude', 'longitude'))
+    if not rows:
+        return []
+
+    ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+    lats = np.fromiter((row[1] for row in rows), dtype=np.float64, count=len(rows))
+    lngs = np.fromiter((row[2] for row in rows), dtype=np.float64, count=len(rows))
+    distances = haversine_m(lat, lng, lats, lngs)
+
+    inside = np.flatnonzero(distances <= radius_m)
+    if len(inside) > limit:
+        # 전체 정렬 대신 가까운 limit 개만 골라서 정렬
+        inside = inside[np.argpartition(distances[inside], limit - 1)[:limit]]
+    inside = inside[np.lexsort((ids[inside], distances[inside]))]  # 거리, 같으면 id 순
+    return [(int(ids[i]), float(distances[i])) for i in inside]
@@ -0,0 +1,13 @@
+# core/hashers.py
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class ConfigurablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    반복 횟수를 settings.PASSWORD_PBKDF2_ITERATIONS 로 정하는 PBKDF2 (알고리즘 이름은 Django 기본과 동일).
+    기존 해시도 그대로 검증되고, 반복 횟수가 다르면 다음 로그인 때 새 횟수로 다시 저장됩니다.
+    """
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERATIONS
@@ -0,0 +1,26 @@
+# core/management/commands/archive_events.py
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.archive import ARCHIVE_BATCH_SIZE, archivable, archive_events, cutoff_for
+
+
+class Command(BaseCommand):
+    help = '오래 지난 파티를 보관 처리하고 채팅 기록을 ArchivedChatMessage 로 옮깁니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.ARCHIVE_AFTER_DAYS,
+                            help='파티 날짜가 오늘보다 이만큼 이전이면 보관 (기본 ARCHIVE_AFTER_DAYS)')
+        parser.add_argument('--dry-run', action='store_true', help='옮기지 않고 대상 이벤트 수만 출력')
+        parser.add_argument('--batch-size', type=int, default=ARCHIVE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        cutoff = cutoff_for(options['days'])
+        if options['dry_run']:
+            count = archivable(cutoff).count()
+            self.stdout.write(self.style.SUCCESS(f'would archive {count} event(s) before {cutoff}'))
+            return
+        events, messages = archive_events(cutoff, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'archived {events} event(s) before {cutoff}, moved {messages} message(s)'
+        ))
@@ -0,0 +1,51 @@
+# core/management/commands/rebuild_participant_counts.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F
+
+from core.cache import event_payload_cache
+from core.conditional import bump_event_version
+from core.models import Event
+
+
+class Command(BaseCommand):
+    help = 'Event.participant_count 를 실제 Participant 행 수로 다시 계산합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='고치지 않고 어긋난 이벤트만 출력')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        # 카운트가 어긋난 이벤트만 골라서 고칩니다.
+        drifted = (
+            Event.objects.annotate(actual=Count('participant'))
+            .exclude(participant_count=F('actual'))
+            .values_list('id', 'participant_count', 'actual')
+        )
+        fixed = 0
+        batch = []
+        for event_id, stored, actual in drifted.iterator(chunk_size=options['batch_size']):
+            self.stdout.write(f'event {event_id}: {stored} -> {actual}')
+            batch.append(event_id)
+            if len(batch) >= options['batch_size']:
+                fixed += self.save(batch, options['dry_run'])
+                batch = []
+        fixed += self.save(batch, options['dry_run'])
+
+        verb = 'would fix' if options['dry_run'] else 'fixed'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {fixed} event(s)'))
+
+    def save(self, batch, dry_run):
+        if dry_run or not batch:
+            return len(batch)
+        with transaction.atomic():
+            # 참가/나가기 경로와 겹치지 않도록 행을 잠근 뒤 다시 셉니다.
+            list(Event.objects.select_for_update().filter(id__in=batch).values_list('id'))
+            events = list(Event.objects.filter(id__in=batch).annotate(actual=Count('participant')).only('id'))
+            for event in events:
+                event.participant_count = event.actual
+            Event.objects.bulk_update(events, ['participant_count'])
+            bump_event_version(*batch)
+        for event_id in batch:
+            event_payload_cache.delete(event_id)
+        return len(batch)
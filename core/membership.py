@@ -0,0 +1,145 @@
+# core/membership.py
+from collections import namedtuple
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+
+from .cache import event_payload_cache
+from .conditional import version_bump
+from .models import Event, Participant, WaitlistEntry
+from .signals import delete_on_commit, participants_bulk_created
+
+# status: 'joined' | 'already_joined' | 'waitlisted'
+JoinResult = namedtuple('JoinResult', ['status', 'participant', 'waitlist_position'])
+
+
+def waitlist_position(entry):
+    """대기열에서 몇 번째인지 (1부터)"""
+    return WaitlistEntry.objects.filter(event_id=entry.event_id).filter(
+        Q(created_at__lt=entry.created_at) | Q(created_at=entry.created_at, id__lt=entry.id)
+    ).count() + 1
+
+
+# ----------------------------------------------------
+# 파티 참가 (정원 확인 + 중복 방지를 한 트랜잭션에서)
+# ----------------------------------------------------
+def join_event(event_id, user, name):
+    """
+    이벤트 행을 잠근 상태(SELECT ... FOR UPDATE)에서 중복/정원을 확인하고 참가자를 만듭니다.
+    같은 이벤트에 대한 동시 참가 요청은 잠금 순서대로 처리되므로 max_members를 넘지 않습니다.
+    정원이 찼으면 대기열에 넣고 순번을 돌려줍니다. 이벤트가 없으면 Event.DoesNotExist.
+    정원 비교는 잠근 행의 participant_count 로 하므로 참가자 수를 세는 쿼리가 없습니다.
+    """
+    with transaction.atomic():
+        event = Event.objects.select_for_update().only('id', 'max_members', 'participant_count').get(pk=event_id)
+
+        existing = Participant.objects.filter(event_id=event.id, user=user).first()
+        if existing:
+            return JoinResult('already_joined', existing, None)
+
+        if event.participant_count >= event.max_members:
+            entry, _ = WaitlistEntry.objects.get_or_create(event_id=event.id, user=user)
+            return JoinResult('waitlisted', None, waitlist_position(entry))
+
+        try:
+            with transaction.atomic():
+                # 카운트를 먼저 올려야 참가자 post_save 의 캐시 무효화 이후에 옛 카운트가 남지 않습니다.
+                Event.objects.filter(pk=event.id).update(participant_count=F('participant_count') + 1)
+                participant = Participant.objects.create(event_id=event.id, user=user, name=name)
+        except IntegrityError:
+            # 유니크 제약이 마지막 방어선 (잠금 없이 들어온 다른 경로와 경합한 경우)
+            return JoinResult('already_joined', Participant.objects.get(event_id=event.id, user=user), None)
+
+        WaitlistEntry.objects.filter(event_id=event.id, user=user).delete()
+        return JoinResult('joined', participant, None)
+
+
+
+def bulk_join_event(event_id, users):
+    """
+    여러 유저를 한 번에 참가시키고 {user_id: JoinResult} 를 돌려줍니다.
+    유저 수와 상관없이 이벤트 잠금 / 기존 참가자 조회 / 대기열 조회 / bulk_create 로 끝납니다.
+    남은 자리는 users 순서대로 채우고, 모자라면 나머지는 대기열에 넣습니다.
+    """
+    users = list({user.id: user for user in users}.values())
+    user_ids = [user.id for user in users]
+    results = {}
+    with transaction.atomic():
+        event = Event.objects.select_for_update().only('id', 'max_members', 'participant_count').get(pk=event_id)
+
+        existing = {p.user_id: p for p in Participant.objects.filter(event_id=event.id, user_id__in=user_ids)}
+        for user_id, participant in existing.items():
+            results[user_id] = JoinResult('already_joined', participant, None)
+
+        new_users = [user for user in users if user.id not in existing]
+        free = max(event.max_members - event.participant_count, 0)
+        joining, waiting = new_users[:free], new_users[free:]
+
+        if joining:
+            # bulk_create 는 post_save 시그널을 보내지 않으므로 버전도 여기서 올립니다.
+            Event.objects.filter(pk=event.id).update(
+                participant_count=F('participant_count') + len(joining), **version_bump()
+            )
+            created = Participant.objects.bulk_create(
+                [Participant(event_id=event.id, user=user, name=user.username) for user in joining]
+            )
+            WaitlistEntry.objects.filter(event_id=event.id, user_id__in=[user.id for user in joining]).delete()
+            for participant in created:
+                results[participant.user_id] = JoinResult('joined', participant, None)
+
+        if waiting:
+            WaitlistEntry.objects.bulk_create(
+                [WaitlistEntry(event_id=event.id, user=user) for user in waiting], ignore_conflicts=True
+            )
+            order = WaitlistEntry.objects.filter(event_id=event.id).order_by('created_at', 'id')
+            positions = {user_id: i for i, user_id in enumerate(order.values_list('user_id', flat=True), 1)}
+            for user in waiting:
+                results[user.id] = JoinResult('waitlisted', None, positions[user.id])
+
+    if joining:
+        # bulk_create 는 post_save 시그널을 보내지 않으므로 캐시를 직접 지우고 따로 알립니다.
+        delete_on_commit(event_payload_cache, event.id)
+        participants_bulk_created.send(sender=Participant, participants=created)
+    return results
+
+# ----------------------------------------------------
+# 파티 나가기 (빈 자리는 대기열 첫 번째 유저에게)
+# ----------------------------------------------------
+def leave_event(participant):
+    """참가자를 삭제하고, 대기자가 있으면 먼저 기다린 순서대로 빈 자리를 채웁니다."""
+    with transaction.atomic():
+        event = (
+            Event.objects.select_for_update()
+            .only('id', 'max_members', 'participant_count')
+            .get(pk=participant.event_id)
+        )
+        Event.objects.filter(pk=event.id).update(participant_count=F('participant_count') - 1)
+        participant.delete()
+        return fill_from_waitlist(event, event.participant_count - 1)
+
+
+def promote_waitlist(event_id):
+    """정원(max_members)이 늘었을 때 빈 자리만큼 대기자를 먼저 기다린 순서대로 참가시킵니다."""
+    with transaction.atomic():
+        event = Event.objects.select_for_update().only('id', 'max_members', 'participant_count').get(pk=event_id)
+        return fill_from_waitlist(event, event.participant_count)
+
+
+def fill_from_waitlist(event, participant_count):
+    """잠근 이벤트 행 기준으로 빈 자리를 대기열로 채우고 참가시킨 Participant 목록을 돌려줍니다."""
+    free = event.max_members - participant_count
+    if free <= 0:
+        return []
+    entries = list(
+        WaitlistEntry.objects.filter(event_id=event.id)
+        .select_related('user')
+        .order_by('created_at', 'id')[:free]
+    )
+    if not entries:
+        return []
+    Event.objects.filter(pk=event.id).update(participant_count=F('participant_count') + len(entries))
+    promoted = []
+    for entry in entries:
+        promoted.append(Participant.objects.create(event_id=event.id, user=entry.user, name=entry.user.username))
+        entry.delete()
+    return promoted
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-17 00:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_event_date_id_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='chatmessage',
+            index=models.Index(fields=['event', 'created_at', 'id'], name='chat_event_created_idx'),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.6 on 2026-10-17 00:52
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def remove_duplicate_participants(apps, schema_editor):
+    # 유니크 제약 추가 전, 같은 (event, user) 중복 참가 행은 가장 먼저 참가한 행만 남깁니다.
+    Participant = apps.get_model('core', 'Participant')
+    seen = set()
+    duplicates = []
+    rows = Participant.objects.filter(user__isnull=False).order_by('id').values_list('id', 'event_id', 'user_id')
+    for pk, event_id, user_id in rows.iterator():
+        if (event_id, user_id) in seen:
+            duplicates.append(pk)
+        else:
+            seen.add((event_id, user_id))
+    Participant.objects.filter(id__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_chatmessage_event_created_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_participants, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name='WaitlistEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='participant',
+            constraint=models.UniqueConstraint(fields=('event', 'user'), name='unique_event_participant'),
+        ),
+        migrations.AddField(
+            model_name='waitlistentry',
+            name='event',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='waitlist', to='core.event'),
+        ),
+        migrations.AddField(
+            model_name='waitlistentry',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='waitlistentry',
+            index=models.Index(fields=['event', 'created_at', 'id'], name='waitlist_event_order_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='waitlistentry',
+            constraint=models.UniqueConstraint(fields=('event', 'user'), name='unique_event_waitlist'),
+        ),
+    ]
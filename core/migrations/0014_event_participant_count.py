@@ -0,0 +1,31 @@
+# Generated by Django 5.2.6 on 2026-10-17 00:55
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_participant_counts(apps, schema_editor):
+    Event = apps.get_model('core', 'Event')
+    Participant = apps.get_model('core', 'Participant')
+    counts = (
+        Participant.objects.filter(event=OuterRef('pk'))
+        .order_by().values('event').annotate(n=Count('id')).values('n')
+    )
+    Event.objects.update(participant_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_participant_unique_waitlist'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='participant_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_participant_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.6 on 2026-10-17 00:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+# core/geo.py 의 격자 정의를 이 시점 값으로 고정합니다.
+GRID_DEG = 0.05
+GRID_ROWS = 3600
+GRID_COLS = 7200
+
+
+def backfill_geo_cells(apps, schema_editor):
+    Event = apps.get_model('core', 'Event')
+    events = list(
+        Event.objects.filter(latitude__isnull=False, longitude__isnull=False).only('id', 'latitude', 'longitude')
+    )
+    for event in events:
+        row = min(int((float(event.latitude) + 90) // GRID_DEG), GRID_ROWS - 1)
+        col = int(((float(event.longitude) + 180) % 360) // GRID_DEG) % GRID_COLS
+        event.geo_cell = row * GRID_COLS + col
+    Event.objects.bulk_update(events, ['geo_cell'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_event_participant_count'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='geo_cell',
+            field=models.IntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['geo_cell'], name='event_geo_cell_idx'),
+        ),
+        migrations.RunPython(backfill_geo_cells, migrations.RunPython.noop),
+    ]
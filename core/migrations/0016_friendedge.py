@@ -0,0 +1,38 @@
+# Generated by Django 5.2.6 on 2026-10-17 01:02
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_friend_edges(apps, schema_editor):
+    Friendship = apps.get_model('core', 'Friendship')
+    FriendEdge = apps.get_model('core', 'FriendEdge')
+    edges = []
+    for from_id, to_id in Friendship.objects.filter(status='accepted').values_list('from_user_id', 'to_user_id').iterator():
+        edges.append(FriendEdge(user_id=from_id, friend_id=to_id))
+        edges.append(FriendEdge(user_id=to_id, friend_id=from_id))
+    FriendEdge.objects.bulk_create(edges, batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_event_geo_cell'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FriendEdge',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('friend', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='friend_edges', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'friend'), name='unique_friend_edge')],
+            },
+        ),
+        migrations.RunPython(backfill_friend_edges, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+from django.db import migrations
+
+
+# 로그인 조회 (email__iexact / username__iexact -> UPPER(...) = UPPER(%s)) 용 함수 인덱스.
+# auth_user 는 Django 기본 테이블이라 모델 Meta 대신 SQL 로 만들고, Postgres 에서만 적용합니다.
+INDEXES = [
+    ('core_auth_user_upper_email_idx', 'email'),
+    ('core_auth_user_upper_username_idx', 'username'),
+]
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, column in INDEXES:
+        schema_editor.execute(f'CREATE INDEX IF NOT EXISTS {name} ON auth_user (UPPER({column}::text))')
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _ in INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('core', '0016_friendedge'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
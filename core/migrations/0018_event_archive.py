@@ -0,0 +1,51 @@
+# Generated by Django 5.2.6 on 2026-10-17 01:16
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_user_login_upper_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedChatMessage',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('message', models.TextField()),
+                ('created_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name='event',
+            name='event_date_id_idx',
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='is_archived',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['is_archived', '-date', '-id'], name='event_archived_date_id_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivedchatmessage',
+            name='event',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_messages', to='core.event'),
+        ),
+        migrations.AddField(
+            model_name='archivedchatmessage',
+            name='sender',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='archivedchatmessage',
+            index=models.Index(fields=['event', 'created_at', 'id'], name='archived_chat_event_idx'),
+        ),
+    ]
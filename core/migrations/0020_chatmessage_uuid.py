@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-17 02:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_event_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedchatmessage',
+            name='uuid',
+            field=models.UUIDField(blank=True, editable=False, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='chatmessage',
+            name='uuid',
+            field=models.UUIDField(blank=True, editable=False, null=True, unique=True),
+        ),
+    ]
@@ -1,6 +1,9 @@
 import uuid
 from django.db import models
 from django.contrib.auth.models import User
+from django.utils import timezone
+
+from .geo import cell_for
 
 
 # ----------------------------------------------------
@@ -27,6 +30,8 @@ class Event(models.Model):
     latitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True)  # 위도
     longitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True)  # 경도
     place_id = models.CharField(max_length=255, blank=True, null=True)  # 구글 Place ID
+    # 위경도 격자 셀 번호 (주변 파티 검색용, save() 에서 위경도로 자동 계산 - core/geo.py)
+    geo_cell = models.IntegerField(blank=True, null=True, editable=False)
 
     #프론트엔드로부터 받을 테마 및 음식 정보
     theme = models.CharField(max_length=50, default='기본')  # 선택된 테마 이름 저장
@@ -39,6 +44,48 @@ class Event(models.Model):
     # 초대 링크에 사용될 고유 코드 필드
     invite_code = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
     max_members = models.PositiveIntegerField(default=10)
+    # 참가자 수 (참가/나가기 경로에서 같은 트랜잭션으로 갱신, rebuild_participant_counts 로 재계산 가능)
+    participant_count = models.PositiveIntegerField(default=0)
+    # 보관 처리 여부 (지난 파티의 채팅을 ArchivedChatMessage 로 옮긴 뒤 True, core/archive.py)
+    is_archived = models.BooleanField(default=False)
+    # 조건부 GET (ETag / Last-Modified) 용 버전 키
+    # 이벤트 저장, 참가자 / 할 일 변경 시 올라갑니다. (core/conditional.py, core/signals.py)
+    version = models.PositiveIntegerField(default=1)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # 목록 keyset 페이지네이션 (is_archived, date, id) 정렬용 인덱스
+            # 기본 목록은 진행 중인 파티(is_archived=False)만 훑습니다.
+            models.Index(fields=['is_archived', '-date', '-id'], name='event_archived_date_id_idx'),
+            # 주변 파티 검색 격자 셀 범위 조회용 인덱스
+            models.Index(fields=['geo_cell'], name='event_geo_cell_idx'),
+        ]
+
+    # 참가/나가기 경로가 F() 로만 갱신하는 컬럼. 기존 행을 통째로 저장할 때 불러온 값을 덮어쓰지 않습니다.
+    counter_fields = ('participant_count',)
+
+    def save(self, *args, **kwargs):
+        self.geo_cell = cell_for(self.latitude, self.longitude)
+        if self._state.adding:
+            super().save(*args, **kwargs)
+            return
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            # Django 기본 동작처럼 .only() 로 불러오지 않은 컬럼도 제외
+            skip = {*self.counter_fields, *self.get_deferred_fields()}
+            update_fields = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in skip and f.attname not in skip
+            ]
+        elif {'latitude', 'longitude'} & set(update_fields):
+            update_fields = {*update_fields, 'geo_cell'}
+        kwargs['update_fields'] = {*update_fields, 'version', 'updated_at'}
+        # 동시에 커밋된 참가 / 버전 갱신을 잃지 않도록 DB 값 기준으로 올립니다.
+        self.version = models.F('version') + 1
+        super().save(*args, **kwargs)
+        self.refresh_from_db(fields=['version', *self.counter_fields])
 
     def __str__(self):
         return self.name
@@ -50,11 +97,36 @@ class Participant(models.Model):
     name = models.CharField(max_length=100)
     joined_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            # 같은 유저가 같은 파티에 두 번 참가하지 못하도록 (user가 없는 기존 데이터는 제외)
+            models.UniqueConstraint(fields=['event', 'user'], name='unique_event_participant'),
+        ]
 
     def __str__(self):
         return self.name
 
 
+# ----------------------------------------------------
+# 3. WaitlistEntry 모델 (정원이 찬 파티의 대기열)
+# ----------------------------------------------------
+class WaitlistEntry(models.Model):
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='waitlist')
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['event', 'user'], name='unique_event_waitlist'),
+        ]
+        indexes = [
+            models.Index(fields=['event', 'created_at', 'id'], name='waitlist_event_order_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user} waiting for {self.event}"
+
+
 class Todo(models.Model):
     event = models.ForeignKey(Event, on_delete=models.CASCADE)
     task = models.CharField(max_length=200)
@@ -71,7 +143,17 @@ class ChatMessage(models.Model):
     event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='messages')
     sender = models.ForeignKey(User, on_delete=models.CASCADE)
     message = models.TextField()
-    created_at = models.DateTimeField(auto_now_add=True)
+    # auto_now_add 는 bulk_create 시각으로 덮어쓰므로, 채팅 버퍼가 메시지를 받은 시각을 직접 넣습니다.
+    created_at = models.DateTimeField(default=timezone.now)
+    # 채팅 버퍼가 메시지를 받을 때 붙이는 키. id 는 DB 에 쓰인 뒤에야 생기므로
+    # 실시간으로 받은 메시지에서 이어 받기(last_message_uuid)는 이 값으로 합니다. (예전 메시지는 NULL)
+    uuid = models.UUIDField(null=True, blank=True, unique=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # 채팅 기록 페이지 조회 (event_id, created_at, id) keyset 용 인덱스
+            models.Index(fields=['event', 'created_at', 'id'], name='chat_event_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.sender.username}: {self.message[:20]}"
@@ -95,3 +177,48 @@ class Friendship(models.Model):
 
     def __str__(self):
         return f"{self.from_user} -> {self.to_user} ({self.status})"
+
+
+# ----------------------------------------------------
+# 6. FriendEdge 모델 (수락된 친구 관계의 양방향 인접 리스트)
+# ----------------------------------------------------
+class FriendEdge(models.Model):
+    """
+    수락된 Friendship 하나당 (A -> B), (B -> A) 두 행.
+    "user 의 친구" 가 항상 user 컬럼 한쪽 조건이라 (user, friend) 인덱스 범위 스캔 한 번으로 끝납니다.
+    Friendship 저장/삭제 시그널에서 갱신합니다. (core/signals.py)
+    """
+    user = models.ForeignKey(User, related_name='friend_edges', on_delete=models.CASCADE)
+    friend = models.ForeignKey(User, related_name='+', on_delete=models.CASCADE)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'friend'], name='unique_friend_edge'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.friend_id}"
+
+
+# ----------------------------------------------------
+# 7. ArchivedChatMessage 모델 (보관 처리된 파티의 채팅 기록)
+# ----------------------------------------------------
+class ArchivedChatMessage(models.Model):
+    """
+    ChatMessage 와 같은 컬럼. 보관 처리 시 id 를 그대로 옮기므로 클라이언트의 메시지 id 커서가 계속 유효합니다.
+    chat_history 가 보관된 파티의 기록을 이 테이블(과 보관 후 들어온 ChatMessage)에서 읽습니다.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='archived_messages')
+    sender = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    message = models.TextField()
+    created_at = models.DateTimeField()
+    uuid = models.UUIDField(null=True, blank=True, unique=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['event', 'created_at', 'id'], name='archived_chat_event_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.sender_id}: {self.message[:20]}"
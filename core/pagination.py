@@ -0,0 +1,116 @@
+# core/pagination.py
+import base64
+from datetime import date
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+# ----------------------------------------------------
+# Event Keyset Pagination (date, id 기준 커서 페이지네이션)
+# ----------------------------------------------------
+class EventKeysetPagination(BasePagination):
+    """
+    (date, id) 복합 키 기준 커서 페이지네이션.
+    OFFSET 없이 마지막 행의 (date, id) 다음부터 읽기 때문에
+    이벤트 테이블이 커져도 페이지 조회 비용이 일정합니다.
+    - GET /api/events/?page_size=20
+    - GET /api/events/?cursor=<next 링크의 cursor 값>
+    """
+    page_size = 20
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.cursor = self.decode_cursor(request)
+
+        reverse = bool(self.cursor and self.cursor[2])
+        if reverse:
+            # 이전 페이지: 커서보다 "새로운" 행을 오래된 순으로 읽은 뒤 뒤집습니다.
+            queryset = queryset.order_by('date', 'id')
+            d, pk, _ = self.cursor
+            queryset = queryset.filter(Q(date__gt=d) | Q(date=d, id__gt=pk))
+        else:
+            queryset = queryset.order_by('-date', '-id')
+            if self.cursor:
+                d, pk, _ = self.cursor
+                queryset = queryset.filter(Q(date__lt=d) | Q(date=d, id__lt=pk))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+
+        if reverse:
+            self.page.reverse()
+            self.has_previous, self.has_next = has_more, True
+        else:
+            self.has_previous, self.has_next = self.cursor is not None, has_more
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded.encode('ascii')).decode('ascii')
+            d, pk, reverse = raw.split(',')
+            return date.fromisoformat(d), int(pk), reverse == '1'
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, obj, reverse):
+        # 모델 인스턴스와 .values() 행(dict) 모두 지원
+        if isinstance(obj, dict):
+            d, pk = obj['date'], obj['id']
+        else:
+            d, pk = obj.date, obj.pk
+        raw = f"{d.isoformat()},{pk},{int(reverse)}"
+        encoded = base64.urlsafe_b64encode(raw.encode('ascii')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
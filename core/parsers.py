@@ -0,0 +1,21 @@
+# core/parsers.py
+import orjson
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+from .renderers import ORJSONRenderer
+
+
+# ----------------------------------------------------
+# orjson 기반 JSON Parser
+# ----------------------------------------------------
+class ORJSONParser(BaseParser):
+    """요청 본문 JSON을 orjson으로 파싱합니다. (NaN/Infinity는 거부)"""
+    media_type = 'application/json'
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
@@ -0,0 +1,57 @@
+# core/renderers.py
+import datetime
+import decimal
+
+import orjson
+from django.db.models.query import QuerySet
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+from rest_framework.renderers import JSONRenderer
+
+
+def orjson_default(obj):
+    """orjson이 직접 처리하지 못하는 타입 (DRF JSONEncoder와 같은 규칙)"""
+    if isinstance(obj, Promise):
+        return force_str(obj)
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, datetime.timedelta):
+        return str(obj.total_seconds())
+    if isinstance(obj, QuerySet):
+        return tuple(obj)
+    if isinstance(obj, bytes):
+        return obj.decode()
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    if hasattr(obj, '__getitem__'):
+        try:
+            return dict(obj)
+        except Exception:
+            pass
+    if hasattr(obj, '__iter__'):
+        return tuple(item for item in obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+# ----------------------------------------------------
+# orjson 기반 JSON Renderer
+# ----------------------------------------------------
+class ORJSONRenderer(JSONRenderer):
+    """
+    orjson으로 응답을 직렬화합니다. datetime(UTC는 'Z'), date, UUID는 orjson이 직접 처리하고
+    Decimal 위도/경도 등은 orjson_default 에서 처리해 기본 JSONRenderer와 같은 결과를 냅니다.
+    """
+    options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        options = self.options
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context):
+            options |= orjson.OPT_INDENT_2
+
+        ret = orjson.dumps(data, default=orjson_default, option=options)
+        # JSONRenderer와 동일하게 U+2028/U+2029를 이스케이프 (JS 임베딩 안전)
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
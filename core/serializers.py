@@ -4,10 +4,13 @@ from .models import Event, Participant, Todo, Theme, Friendship # Theme, Friends
 from django.contrib.auth.models import User
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
+from .authentication import resolve_login_user
+from joiny_server.metrics import TimedSerializerMixin, timed_data  # 직렬화 시간 기록
+
 # ----------------------------------------------------
 # Theme Serializer 추가
 # ----------------------------------------------------
-class ThemeSerializer(serializers.ModelSerializer):
+class ThemeSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """테마 목록을 위한 Serializer"""
     class Meta:
         model = Theme
@@ -17,7 +20,7 @@ class ThemeSerializer(serializers.ModelSerializer):
 # ----------------------------------------------------
 # User Serializer (사용자 정보 조회)
 # ----------------------------------------------------
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     name = serializers.CharField(source='username', read_only=True)
     
     class Meta:
@@ -28,7 +31,7 @@ class UserSerializer(serializers.ModelSerializer):
 # ----------------------------------------------------
 # Register Serializer (회원가입)
 # ----------------------------------------------------
-class RegisterSerializer(serializers.ModelSerializer):
+class RegisterSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     email = serializers.EmailField(required=True)
     password = serializers.CharField(write_only=True)
 
@@ -49,17 +52,12 @@ class RegisterSerializer(serializers.ModelSerializer):
 class EmailTokenObtainPairSerializer(TokenObtainPairSerializer):
     def validate(self, attrs):
         # 이메일 또는 이름(username)으로 유저를 찾아서 username 필드에 넣어줌
+        # 조회 결과는 request 에 저장되므로 EmailBackend 는 다시 조회하지 않습니다. (쿼리 1번)
         login_id = attrs.get("username")
         password = attrs.get("password")
 
         if login_id and password:
-            # 1. 이메일로 찾기
-            user = User.objects.filter(email=login_id).first()
-            
-            # 2. 없으면 이름(username)으로 찾기
-            if not user:
-                 user = User.objects.filter(username=login_id).first()
-
+            user = resolve_login_user(login_id, self.context.get("request"))
             if user:
                 # 찾은 유저의 실제 username을 attrs에 다시 설정
                 attrs["username"] = user.username
@@ -69,15 +67,16 @@ class EmailTokenObtainPairSerializer(TokenObtainPairSerializer):
 # ----------------------------------------------------
 # 추가적 Event Serializer 확장 (장소, 테마, 음식 필드 반영)
 # ----------------------------------------------------
-class ParticipantSerializer(serializers.ModelSerializer):
+class ParticipantSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Participant
         fields = '__all__'
 
 
-class EventSerializer(serializers.ModelSerializer):
+class EventSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     invite_url = serializers.SerializerMethodField()
     members = ParticipantSerializer(many=True, read_only=True, source='participant_set')
+    spots_left = serializers.SerializerMethodField()
 
     class Meta:
         model = Event
@@ -86,21 +85,56 @@ class EventSerializer(serializers.ModelSerializer):
             'location_name', 'latitude', 'longitude', 'place_id',
             'theme', 'food_description',
             'host_name', 'host', 'fee', # host_name, fee 필드 추가
-            'invite_code', 'invite_url', 'members', 'max_members'
+            'invite_code', 'invite_url', 'members', 'max_members',
+            'participant_count', 'spots_left',
         ]
-        read_only_fields = ['invite_code', 'invite_url', 'host']
+        read_only_fields = ['invite_code', 'invite_url', 'host', 'participant_count']
+
+    # 계산 필드 -> 읽어야 하는 Event 컬럼 (나머지 필드는 같은 이름의 컬럼)
+    field_columns = {
+        'invite_url': ('invite_code',),
+        'members': (),
+        'spots_left': ('max_members', 'participant_count'),
+    }
+
+    def __init__(self, *args, fields=None, **kwargs):
+        # fields 를 주면 그 필드만 응답합니다. (?fields= sparse fieldset)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    @classmethod
+    def columns_for(cls, fields):
+        """응답 필드 목록에 필요한 Event 컬럼 (.only() / .values() 용)"""
+        columns = ['id']
+        for name in fields:
+            for column in cls.field_columns.get(name, (name,)):
+                if column not in columns:
+                    columns.append(column)
+        return columns
 
     def get_invite_url(self, obj):
-        request = self.context.get('request')
+        return self.build_invite_url(self.context.get('request'), obj.invite_code)
+
+    @staticmethod
+    def build_invite_url(request, invite_code):
         if request is None:
             return None
         # 초대 코드를 통해 이벤트 상세 페이지로 연결되는 URL 생성
         # 예시 URL: http://.../api/events/by_invite_code/uuid_code/
-        return request.build_absolute_uri(f"/invite/{obj.invite_code}")
+        return request.build_absolute_uri(f"/invite/{invite_code}")
+
+    def get_spots_left(self, obj):
+        return self.count_spots_left(obj.max_members, obj.participant_count)
 
+    @staticmethod
+    def count_spots_left(max_members, participant_count):
+        return max(max_members - participant_count, 0)
 
 
-class TodoSerializer(serializers.ModelSerializer):
+
+class TodoSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Todo
         fields = '__all__'
@@ -110,10 +144,148 @@ class TodoSerializer(serializers.ModelSerializer):
 # ----------------------------------------------------
 # Friendship Serializer (친구 목록)
 # ----------------------------------------------------
-class FriendshipSerializer(serializers.ModelSerializer):
+class FriendshipSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     from_user = UserSerializer(read_only=True)
     to_user = UserSerializer(read_only=True)
 
     class Meta:
         model = Friendship
         fields = ['id', 'from_user', 'to_user', 'status', 'created_at']
+
+
+# ----------------------------------------------------
+# 목록 전용 빠른 읽기 Serializer (.values() 행 -> dict)
+# ----------------------------------------------------
+# DRF 필드 machinery를 행마다 거치지 않고 같은 JSON을 만듭니다.
+# EventSerializer / FriendshipSerializer 필드를 바꾸면 여기도 같이 바꿔야 합니다. (core/tests.py golden 테스트)
+_decimal_field = serializers.DecimalField(max_digits=9, decimal_places=6)  # Event.latitude / longitude
+_datetime_field = serializers.DateTimeField()
+
+
+def _decimal(value):
+    return None if value is None else _decimal_field.to_representation(value)
+
+
+def _datetime(value):
+    return None if value is None else _datetime_field.to_representation(value)
+
+
+class EventListSerializer:
+    """
+    EventSerializer(many=True) 와 같은 출력을 .values() 행에서 바로 만듭니다.
+    참가자(members)는 이벤트 id 목록으로 한 번에 조회합니다.
+    fields 를 주면 그 필드만 (EventSerializer 필드 순서대로) 응답하고,
+    members 가 없으면 참가자 조회를 건너뜁니다. (카드 목록용)
+    """
+    member_fields = ('id', 'name', 'joined_at', 'event', 'user')
+
+    def __init__(self, rows, context=None, fields=None):
+        self.rows = rows
+        self.context = context or {}
+        self.fields = self.resolve_fields(fields)
+
+    @staticmethod
+    def resolve_fields(fields):
+        if fields is None:
+            return list(EventSerializer.Meta.fields)
+        return [name for name in EventSerializer.Meta.fields if name in fields]
+
+    @classmethod
+    def values(cls, queryset, fields=None):
+        """모델 queryset을 이 Serializer가 읽는 컬럼만 가진 .values() queryset으로 바꿉니다."""
+        # date 는 keyset 페이지네이션 커서에 항상 필요합니다.
+        columns = EventSerializer.columns_for(cls.resolve_fields(fields) + ['date'])
+        return queryset.select_related(None).prefetch_related(None).values(*columns)
+
+    @classmethod
+    def members_by_event(cls, event_ids):
+        members = {}
+        rows = (
+            Participant.objects.filter(event_id__in=event_ids)
+            .order_by('id')
+            .values_list(*cls.member_fields)
+        )
+        for pk, name, joined_at, event_id, user_id in rows.iterator(chunk_size=2000):
+            members.setdefault(event_id, []).append({
+                'id': pk,
+                'name': name,
+                'joined_at': _datetime(joined_at),
+                'event': event_id,
+                'user': user_id,
+            })
+        return members
+
+    @timed_data  # property, 직렬화 시간 기록 (joiny_server/metrics.py)
+    def data(self):
+        rows = list(self.rows)
+        members = self.members_by_event([row['id'] for row in rows]) if rows and 'members' in self.fields else {}
+        request = self.context.get('request')
+        build_invite_url = EventSerializer.build_invite_url
+        count_spots_left = EventSerializer.count_spots_left
+        # 변환이 필요한 필드만 함수로, 나머지는 .values() 값을 그대로 씁니다.
+        converters = {
+            'date': lambda row: row['date'].isoformat(),
+            'latitude': lambda row: _decimal(row['latitude']),
+            'longitude': lambda row: _decimal(row['longitude']),
+            'invite_code': lambda row: str(row['invite_code']),
+            'invite_url': lambda row: build_invite_url(request, row['invite_code']),
+            'members': lambda row: members.get(row['id'], []),
+            'spots_left': lambda row: count_spots_left(row['max_members'], row['participant_count']),
+        }
+        plan = [(name, converters.get(name)) for name in self.fields]
+        return [
+            {name: convert(row) if convert else row[name] for name, convert in plan}
+            for row in rows
+        ]
+
+
+class FriendListSerializer:
+    """FriendshipSerializer(many=True) 와 같은 출력을 유저 JOIN 한 번으로 만듭니다."""
+    value_fields = (
+        'id', 'status', 'created_at',
+        'from_user__id', 'from_user__username', 'from_user__email',
+        'to_user__id', 'to_user__username', 'to_user__email',
+    )
+
+    def __init__(self, rows, context=None):
+        self.rows = rows
+        self.context = context or {}
+
+    @classmethod
+    def values(cls, queryset):
+        return queryset.values_list(*cls.value_fields)
+
+    @timed_data
+    def data(self):
+        return [
+            {
+                'id': pk,
+                'from_user': {'id': from_id, 'username': from_username, 'name': from_username, 'email': from_email},
+                'to_user': {'id': to_id, 'username': to_username, 'name': to_username, 'email': to_email},
+                'status': status,
+                'created_at': _datetime(created_at),
+            }
+            for (pk, status, created_at,
+                 from_id, from_username, from_email,
+                 to_id, to_username, to_email) in self.rows
+        ]
+
+
+class UserListSerializer:
+    """UserSerializer(many=True) 와 같은 출력을 .values_list() 행에서 바로 만듭니다."""
+    value_fields = ('id', 'username', 'email')
+
+    def __init__(self, rows, context=None):
+        self.rows = rows
+        self.context = context or {}
+
+    @classmethod
+    def values(cls, queryset):
+        return queryset.values_list(*cls.value_fields)
+
+    @timed_data
+    def data(self):
+        return [
+            {'id': pk, 'username': username, 'name': username, 'email': email}
+            for pk, username, email in self.rows
+        ]
@@ -0,0 +1,77 @@
+# core/signals.py
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from .cache import event_payload_cache, invite_code_cache, theme_cache
+from .conditional import bump_event_version
+from .friends import remove_edges, sync_edges
+from .models import Event, Friendship, Participant, Theme, Todo
+
+# bulk_create 로 참가자를 한꺼번에 추가했을 때 (post_save 대신, sender=Participant, participants=[...])
+participants_bulk_created = Signal()
+
+
+# ----------------------------------------------------
+# 캐시 무효화 (Event / Participant 변경 시)
+# ----------------------------------------------------
+def delete_on_commit(cache, key):
+    """
+    커밋된 뒤에 캐시를 지웁니다. 트랜잭션 안에서 바로 지우면 커밋 전에 다른 요청이
+    아직 옛 행을 읽어 캐시를 다시 채울 수 있습니다. (트랜잭션 밖이면 바로 지움)
+    """
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+@receiver(post_save, sender=Event)
+def invalidate_event_cache_on_save(sender, instance, **kwargs):
+    delete_on_commit(event_payload_cache, instance.pk)
+
+
+@receiver(post_save, sender=Event)
+def promote_waitlist_on_save(sender, instance, created, update_fields=None, **kwargs):
+    # 정원을 늘리면 빈 자리만큼 대기자를 참가시킵니다. (나가기로 생긴 자리는 leave_event 가 채움)
+    if created or (update_fields is not None and 'max_members' not in update_fields):
+        return
+    if instance.participant_count >= instance.max_members:
+        return
+    from .membership import promote_waitlist  # membership 이 이 모듈을 import 하므로 여기서
+
+    if promote_waitlist(instance.pk):
+        # 응답에 늘어난 참가자 수 / 참가자 저장으로 올라간 버전이 보이도록
+        instance.refresh_from_db(fields=['version', 'updated_at', *instance.counter_fields])
+
+
+@receiver(post_delete, sender=Event)
+def invalidate_event_cache_on_delete(sender, instance, **kwargs):
+    delete_on_commit(event_payload_cache, instance.pk)
+    delete_on_commit(invite_code_cache, str(instance.invite_code))
+
+
+@receiver([post_save, post_delete], sender=Participant)
+def invalidate_event_cache_on_participant_change(sender, instance, **kwargs):
+    delete_on_commit(event_payload_cache, instance.event_id)
+    bump_event_version(instance.event_id)
+
+
+@receiver([post_save, post_delete], sender=Todo)
+def bump_event_version_on_todo_change(sender, instance, **kwargs):
+    bump_event_version(instance.event_id)
+
+
+@receiver([post_save, post_delete], sender=Theme)
+def invalidate_theme_cache(sender, instance, **kwargs):
+    theme_cache.clear()
+
+
+# ----------------------------------------------------
+# 친구 인접 리스트 (FriendEdge) 갱신
+# ----------------------------------------------------
+@receiver(post_save, sender=Friendship)
+def sync_friend_edges_on_save(sender, instance, **kwargs):
+    sync_edges(instance)
+
+
+@receiver(post_delete, sender=Friendship)
+def remove_friend_edges_on_delete(sender, instance, **kwargs):
+    remove_edges(instance)
@@ -1,3 +1,1681 @@
-from django.test import TestCase
+import asyncio
+import threading
+from unittest import skipUnless
+from datetime import date, timedelta
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from .cache import LRUCache, MISSING, event_payload_cache, invite_code_cache, theme_cache
+from .models import ArchivedChatMessage, ChatMessage, Event, FriendEdge, Friendship, Participant, Theme, Todo, WaitlistEntry
+
+
+# ----------------------------------------------------
+# Event 목록 keyset 페이지네이션
+# ----------------------------------------------------
+class EventListPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.host = User.objects.create_user(username='host', email='host@example.com', password='pw')
+        base = date(2026, 1, 1)
+        for i in range(25):
+            # 같은 날짜가 여러 개 섞이도록 해서 id 타이브레이크를 검증합니다.
+            event = Event.objects.create(name=f'party {i}', date=base + timedelta(days=i // 3), host=cls.host)
+            for j in range(i % 4):
+                Participant.objects.create(event=event, name=f'guest {i}-{j}')
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def collect_pages(self, url):
+        ids, pages = [], 0
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            ids.extend(item['id'] for item in response.data['results'])
+            url = response.data['next']
+            pages += 1
+        return ids, pages
+
+    def test_pages_cover_all_events_in_order_without_duplicates(self):
+        ids, pages = self.collect_pages('/api/events/?page_size=7')
+        expected = list(Event.objects.order_by('-date', '-id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+        self.assertEqual(pages, 4)
+
+    def test_previous_link_returns_preceding_page(self):
+        first = self.client.get('/api/events/?page_size=5').data
+        second = self.client.get(first['next']).data
+        back = self.client.get(second['previous']).data
+        self.assertEqual([e['id'] for e in back['results']], [e['id'] for e in first['results']])
+        self.assertIsNone(first['previous'])
+
+    def test_invalid_cursor_is_404(self):
+        response = self.client.get('/api/events/?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, 404)
+
+    def test_query_count_is_constant_per_page(self):
+        # 페이지 크기와 참가자 수에 상관없이 이벤트 1회 + 참가자 prefetch 1회
+        for page_size in (1, 10, 25):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(f'/api/events/?page_size={page_size}')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(ctx.captured_queries), 2, page_size)
+
+
+# ----------------------------------------------------
+# 초대 코드 / 이벤트 상세 캐시
+# ----------------------------------------------------
+class LRUCacheTests(TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(max_size=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertIs(cache.get('b'), MISSING)
+        self.assertEqual(cache.get('a'), 1)
+
+    def test_expired_items_are_missing(self):
+        cache = LRUCache(max_size=2, ttl=-1)
+        cache.set('a', 1)
+        self.assertIs(cache.get('a'), MISSING)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests'}})
+class InviteCodeCacheTests(TestCase):
+    def setUp(self):
+        invite_code_cache.clear()
+        event_payload_cache.clear()
+        invite_code_cache.shared.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='guest', email='guest@example.com', password='pw')
+        self.event = Event.objects.create(name='party', date=date(2026, 1, 1))
+        self.url = f'/api/events/by_invite_code/{self.event.invite_code}/'
+
+    def test_second_lookup_hits_cache(self):
+        first = self.client.get(self.url)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+        self.assertEqual(first.data, second.data)
+        self.assertTrue(second.data['invite_url'].endswith(f'/invite/{self.event.invite_code}'))
+        self.assertEqual(invite_code_cache.stats['local_hits'], 1)
+
+    def test_participant_join_invalidates_payload(self):
+        self.client.get(self.url)
+        self.client.force_authenticate(self.user)
+        # 캐시는 커밋된 뒤에 지워집니다. (TestCase 트랜잭션은 커밋되지 않으므로 콜백을 직접 실행)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/participants/', {'event': str(self.event.invite_code)})
+        self.assertEqual(response.status_code, 201)
+        members = self.client.get(self.url).data['members']
+        self.assertEqual([m['name'] for m in members], ['guest'])
+
+    def test_payload_is_kept_until_commit(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks() as callbacks:
+            Participant.objects.create(event=self.event, user=self.user, name='guest')
+            # 커밋 전에 다시 채워져도 커밋 후 무효화가 지웁니다.
+            self.assertIsNot(event_payload_cache.get(self.event.id), MISSING)
+        for callback in callbacks:
+            callback()
+        self.assertIs(event_payload_cache.get(self.event.id), MISSING)
+
+    def test_process_local_backend_keeps_local_ttl(self):
+        from django.conf import settings
+
+        # locmem 은 다른 워커에서 지울 수 없으므로 로컬 LRU 와 같은 시간만 둡니다.
+        self.assertEqual(event_payload_cache.ttl(), min(settings.EVENT_CACHE['SHARED_TTL'], settings.EVENT_CACHE['LOCAL_TTL']))
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}):
+            self.assertEqual(event_payload_cache.ttl(), settings.EVENT_CACHE['SHARED_TTL'])
+
+    def test_unknown_invite_code_is_404(self):
+        self.assertEqual(self.client.get('/api/events/by_invite_code/not-a-uuid/').status_code, 404)
+
+
+# ----------------------------------------------------
+# 채팅 write-behind 버퍼
+# ----------------------------------------------------
+# 테스트 트랜잭션 안의 행은 다른 스레드에서 보이지 않으므로 DB 호출을 공용 스레드에서 실행
+@override_settings(DB_EXECUTOR_WORKERS=0)
+class ChatWriteBufferTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='kim', email='kim@example.com', password='pw')
+        self.event = Event.objects.create(name='party', date=date(2026, 1, 1))
+
+    async def test_pending_is_visible_until_flushed(self):
+        from joiny_server.chat_buffer import ChatWriteBuffer
+
+        buffer = ChatWriteBuffer(batch_size=10, flush_interval=60, max_pending=10)
+        for text in ('one', 'two', 'three'):
+            await buffer.add(self.event.id, self.user.id, 'kim', text)
+        self.assertEqual(await ChatMessage.objects.filter(event=self.event).acount(), 0)
+        self.assertEqual([e['message'] for e in buffer.pending_for(self.event.id)], ['one', 'two', 'three'])
+
+        await buffer.close()
+        self.assertEqual(await ChatMessage.objects.filter(event=self.event).acount(), 3)
+        self.assertEqual(buffer.pending_for(self.event.id), [])
+
+    async def test_full_batch_is_written_without_waiting_for_interval(self):
+        from joiny_server.chat_buffer import ChatWriteBuffer
+
+        buffer = ChatWriteBuffer(batch_size=2, flush_interval=60, max_pending=10)
+        await buffer.add(self.event.id, self.user.id, 'kim', 'one')
+        await buffer.add(self.event.id, self.user.id, 'kim', 'two')
+        await asyncio.wait_for(buffer._queue.join(), 5)
+        self.assertEqual(await ChatMessage.objects.filter(event=self.event).acount(), 2)
+        await buffer.close()
+
+    async def test_stores_the_time_the_message_was_received(self):
+        from joiny_server.chat_buffer import ChatWriteBuffer
+
+        buffer = ChatWriteBuffer(batch_size=10, flush_interval=60, max_pending=10)
+        entry = await buffer.add(self.event.id, self.user.id, 'kim', 'hello')
+        await asyncio.sleep(0.01)
+        await buffer.close()
+        message = await ChatMessage.objects.aget(event=self.event)
+        self.assertEqual((message.created_at, message.uuid), (entry['created_at'], entry['uuid']))
+
+    async def test_cancelled_add_is_not_left_pending(self):
+        from joiny_server.chat_buffer import ChatWriteBuffer
+
+        buffer = ChatWriteBuffer(batch_size=10, flush_interval=60, max_pending=1)
+        await buffer.add(self.event.id, self.user.id, 'kim', 'one')
+        await asyncio.sleep(0)  # 워커가 'one'을 꺼내 배치를 기다립니다
+        await buffer.add(self.event.id, self.user.id, 'kim', 'two')
+        # 큐가 가득 차 기다리던 add가 취소되면 pending에도 남지 않습니다.
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(buffer.add(self.event.id, self.user.id, 'kim', 'three'), 0.05)
+        self.assertEqual([e['message'] for e in buffer.pending_for(self.event.id)], ['one', 'two'])
+
+        await buffer.close()
+        messages = ChatMessage.objects.filter(event=self.event).order_by('created_at')
+        self.assertEqual([m.message async for m in messages], ['one', 'two'])
+        self.assertEqual(buffer.pending_for(self.event.id), [])
+
+    async def test_failed_batch_stays_pending_and_is_retried(self):
+        from unittest import mock
+
+        from django.db import OperationalError
+
+        from joiny_server.chat_buffer import ChatWriteBuffer
+
+        buffer = ChatWriteBuffer(batch_size=2, flush_interval=0.2, max_pending=10)
+        bulk_create = ChatWriteBuffer._bulk_create
+        calls = []
+
+        def flaky(batch):
+            calls.append(len(batch))
+            if len(calls) == 1:
+                raise OperationalError('server closed the connection unexpectedly')
+            bulk_create(batch)
+
+        with mock.patch.object(ChatWriteBuffer, '_bulk_create', staticmethod(flaky)):
+            await buffer.add(self.event.id, self.user.id, 'kim', 'one')
+            await buffer.add(self.event.id, self.user.id, 'kim', 'two')
+            while not calls:
+                await asyncio.sleep(0.005)
+            async with buffer.lock.reading():
+                self.assertEqual([e['message'] for e in buffer.pending_for(self.event.id)], ['one', 'two'])
+            await asyncio.wait_for(buffer._queue.join(), 5)
+            await buffer.close()
+        self.assertEqual(calls, [2, 2])
+        messages = ChatMessage.objects.filter(event=self.event).order_by('created_at')
+        self.assertEqual([m.message async for m in messages], ['one', 'two'])
+        self.assertEqual(buffer.pending_for(self.event.id), [])
+
+
+class ChatWriteBufferIntegrityTests(TransactionTestCase):
+    async def test_bad_row_does_not_drop_batch(self):
+        from joiny_server.chat_buffer import ChatWriteBuffer
+
+        user = await User.objects.acreate(username='kim', email='kim@example.com')
+        event = await Event.objects.acreate(name='party', date=date(2026, 1, 1))
+        buffer = ChatWriteBuffer(batch_size=2, flush_interval=60, max_pending=10)
+        await buffer.add(event.id, user.id, 'kim', 'ok')
+        await buffer.add(event.id + 999, user.id, 'kim', 'orphan')
+        await buffer.close()
+        self.assertEqual(await ChatMessage.objects.acount(), 1)
+
+
+# ----------------------------------------------------
+# 채팅 기록 페이지 조회
+# ----------------------------------------------------
+class ChatHistoryPagingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='kim', email='kim@example.com', password='pw')
+        cls.event = Event.objects.create(name='party', date=date(2026, 1, 1))
+        participant = Participant.objects.create(event=cls.event, user=cls.user, name='kim')
+        cls.joined_at = participant.joined_at
+        ChatMessage.objects.bulk_create([
+            ChatMessage(event=cls.event, sender=cls.user, message=f'm{i}') for i in range(7)
+        ])
+        cls.ids = list(ChatMessage.objects.order_by('created_at', 'id').values_list('id', flat=True))
+
+    def test_page_before_walks_back_to_the_first_message(self):
+        from joiny_server import chat_history
+
+        seen, before = [], None
+        while True:
+            page, has_more = chat_history.page_before(self.event.id, self.joined_at, before, 3)
+            seen = [m['id'] for m in page] + seen
+            if not has_more:
+                break
+            before = chat_history.message_key(self.event.id, page[0]['id'])
+        self.assertEqual(seen, self.ids)
+
+    def test_page_after_resumes_from_last_seen_message(self):
+        from joiny_server import chat_history
+
+        after = chat_history.message_key(self.event.id, self.ids[2])
+        page, after = chat_history.page_after(self.event.id, self.joined_at, after, 3)
+        self.assertEqual([m['id'] for m in page], self.ids[3:6])
+        page, _ = chat_history.page_after(self.event.id, self.joined_at, after, 3)
+        self.assertEqual([m['id'] for m in page], self.ids[6:])
+        self.assertEqual(page[0]['user_name'], 'kim')
+
+    @override_settings(DB_EXECUTOR_WORKERS=0)
+    async def test_load_history_handler_sends_older_page(self):
+        from unittest import mock
+
+        from joiny_server import sio, socket_auth
+
+        namespace = sio.ChatNamespace('/chat')
+        session = await sync_to_async(socket_auth.load_session)(self.user.id)
+        namespace.get_session = mock.AsyncMock(return_value=session)
+        namespace.emit = mock.AsyncMock()
+        with override_settings(CHAT_HISTORY_PAGE_SIZE=3):
+            await namespace.on_load_history('sid', {'party_id': str(self.event.id), 'before_id': self.ids[5]})
+        namespace.emit.assert_awaited_once()
+        event, payload = namespace.emit.await_args.args
+        self.assertEqual(event, 'chat_history_page')
+        self.assertEqual([m['id'] for m in payload['messages']], self.ids[2:5])
+        self.assertTrue(payload['has_more'])
+        self.assertEqual(namespace.emit.await_args.kwargs, {'room': 'sid'})
+
+    @override_settings(DB_EXECUTOR_WORKERS=0)
+    async def test_resume_from_message_seen_only_live(self):
+        from unittest import mock
+
+        from joiny_server import sio, socket_auth
+        from joiny_server.chat_buffer import ChatWriteBuffer
+
+        namespace = sio.ChatNamespace('/chat')
+        session = await sync_to_async(socket_auth.load_session)(self.user.id)
+        namespace.get_session = mock.AsyncMock(return_value=session)
+        namespace.emit = mock.AsyncMock()
+        buffer = ChatWriteBuffer(batch_size=10, flush_interval=60, max_pending=10)
+        party_id = str(self.event.id)
+
+        def sent(name):
+            return [call.args[1] for call in namespace.emit.await_args_list if call.args[0] == name]
+
+        with mock.patch.object(sio, 'chat_buffer', buffer):
+            for text in ('live1', 'live2', 'live3'):
+                await namespace.on_chat_message('sid', {'party_id': party_id, 'message': text})
+            live = [m for m in sent('chat_message') if isinstance(m, dict)]
+            self.assertTrue(all(m['uuid'] for m in live))
+
+            # 아직 버퍼에 있을 때
+            namespace.emit.reset_mock()
+            await namespace.send_history_since('sid', party_id, self.joined_at, last_message_uuid=live[0]['uuid'])
+            [history] = sent('chat_history')
+            self.assertEqual([m['message'] for m in history], ['live2', 'live3'])
+
+            # DB 에 쓰인 뒤
+            await buffer.close()
+            namespace.emit.reset_mock()
+            await namespace.send_history_since('sid', party_id, self.joined_at, last_message_uuid=live[0]['uuid'])
+            [history] = sent('chat_history')
+            self.assertEqual([m['message'] for m in history], ['live2', 'live3'])
+            self.assertTrue(all(m['id'] for m in history))
+            self.assertEqual([m['uuid'] for m in history], [m['uuid'] for m in live[1:]])
+
+
+# ----------------------------------------------------
+# 위치 업데이트 coalescing
+# ----------------------------------------------------
+class LocationCoalescerTests(TestCase):
+    async def test_one_batch_per_tick_with_latest_position_per_user(self):
+        from joiny_server.location import LocationCoalescer, LocationStats
+
+        frames = []
+
+        async def emit_batch(room, payload):
+            frames.append((room, payload))
+            return 3
+
+        stats = LocationStats()
+        coalescer = LocationCoalescer(emit_batch, interval=0.01, min_distance_m=5, stats=stats)
+        coalescer.push('party_1', 'a', {'lat': 37.5, 'lng': 127.0})
+        coalescer.push('party_1', 'a', {'lat': 37.501, 'lng': 127.0})
+        coalescer.push('party_1', 'b', {'lat': 37.6, 'lng': 127.1})
+        await asyncio.sleep(0.05)
+
+        self.assertEqual(len(frames), 1)
+        locations = {loc['user_id']: loc['lat'] for loc in frames[0][1]['locations']}
+        self.assertEqual(locations, {'a': 37.501, 'b': 37.6})
+
+        # 1m 이동은 임계값(5m) 미만이라 무시됩니다.
+        self.assertFalse(coalescer.push('party_1', 'a', {'lat': 37.50101, 'lng': 127.0}))
+        snapshot = stats.snapshot()
+        self.assertEqual((snapshot['inbound'], snapshot['dropped'], snapshot['coalesced']), (4, 1, 1))
+        self.assertEqual(snapshot['deliveries'], 3)
+        await coalescer.close()
+
+    async def test_disconnect_forgets_the_sockets_positions(self):
+        from unittest import mock
+
+        from joiny_server import sio
+
+        namespace = sio.LocationNamespace('/location')
+        namespace.get_session = mock.AsyncMock(return_value={})
+        await namespace.on_location_update('sid', {'party_id': '1', 'user_id': 'a', 'lat': 37.5, 'lng': 127.0})
+        self.assertIn('a', namespace.coalescer.latest['party_1'])
+
+        await namespace.on_disconnect('sid')
+        self.assertEqual(namespace.coalescer.latest['party_1'], {})
+        self.assertNotIn('sid', namespace.positions)
+        await namespace.coalescer.close()
+
+
+# ----------------------------------------------------
+# 바이너리 wire format
+# ----------------------------------------------------
+class WireFormatTests(TestCase):
+    def test_negotiation_defaults_to_json(self):
+        from joiny_server import wire
+
+        self.assertEqual(wire.negotiate({'QUERY_STRING': 'EIO=4'}, None), wire.JSON)
+        self.assertEqual(wire.negotiate({'QUERY_STRING': 'format=binary'}, None), wire.BINARY)
+        self.assertEqual(wire.negotiate({}, {'format': 'binary'}), wire.BINARY)
+
+    def test_location_batch_round_trip(self):
+        from joiny_server import wire
+
+        frame = wire.encode_location_batch('7', [
+            {'user_id': 1, 'lat': 37.566535, 'lng': 126.977969},
+            {'user_id': 'guest', 'lat': 0, 'lng': 0},  # JSON 전용 id는 제외
+        ])
+        self.assertEqual(len(frame), wire.LOCATION_HEADER.size + wire.LOCATION_ENTRY.size)
+        self.assertEqual(wire.decode_location_batch(frame), {
+            'party_id': '7',
+            'locations': [{'user_id': 1, 'lat': 37.566535, 'lng': 126.977969}],
+        })
+
+    def test_location_batch_skips_ids_outside_uint32(self):
+        from joiny_server import wire
+
+        frame = wire.encode_location_batch('7', [
+            {'user_id': -1, 'lat': 0, 'lng': 0},
+            {'user_id': 2 ** 32, 'lat': 0, 'lng': 0},
+            {'user_id': 2, 'lat': 0, 'lng': 0},
+        ])
+        self.assertEqual([loc['user_id'] for loc in wire.decode_location_batch(frame)['locations']], [2])
+
+    def test_chat_message_round_trip(self):
+        from joiny_server import wire
+
+        message_uuid = '6f1c2a9e-3b4d-4e5f-8a7b-9c0d1e2f3a4b'
+        frame = wire.encode_chat_message('7', '3', '김철수', '안녕하세요', 1700000000000, message_uuid)
+        decoded = wire.decode_chat_message(frame)
+        self.assertEqual(
+            (decoded['party_id'], decoded['user_id'], decoded['user_name'], decoded['message'], decoded['timestamp_ms']),
+            ('7', '3', '김철수', '안녕하세요', 1700000000000),
+        )
+        self.assertEqual(decoded['uuid'], message_uuid)
+        self.assertIsNone(wire.decode_chat_message(wire.encode_chat_message('7', '3', 'kim', 'hi'))['uuid'])
+
+    def test_version_1_chat_frames_from_clients(self):
+        from joiny_server import wire
+
+        name = 'kim'.encode('utf-8')
+        frame = wire.CHAT_HEADER_V1.pack(7, 3, 0, len(name)) + name + '안녕'.encode('utf-8')
+        decoded = wire.decode_chat_message(frame)
+        self.assertEqual(
+            (decoded['party_id'], decoded['user_id'], decoded['user_name'], decoded['message'], decoded['uuid']),
+            ('7', '3', 'kim', '안녕', None),
+        )
+
+
+# ----------------------------------------------------
+# orjson 렌더러 / 파서
+# ----------------------------------------------------
+class ORJSONRendererTests(TestCase):
+    def test_matches_default_renderer_output(self):
+        import decimal
+        import uuid
+        from datetime import datetime, timezone as dt_timezone
+
+        from rest_framework.renderers import JSONRenderer
+
+        from .renderers import ORJSONRenderer
+        from .serializers import EventSerializer
+
+        host = User.objects.create_user(username='host', email='host@example.com', password='pw')
+        event = Event.objects.create(
+            name='파티\u2028초대', date=date(2026, 1, 1), host=host,
+            latitude=decimal.Decimal('37.566535'), longitude=decimal.Decimal('126.977969'),
+        )
+        Participant.objects.create(event=event, user=host, name='host')
+        payloads = [
+            EventSerializer([event], many=True).data,
+            {
+                'lat': decimal.Decimal('37.566535'),
+                'code': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+                'at': datetime(2026, 1, 1, 12, 30, 15, 123456, tzinfo=dt_timezone.utc),
+                'day': date(2026, 1, 1),
+            },
+        ]
+        for payload in payloads:
+            self.assertEqual(ORJSONRenderer().render(payload), JSONRenderer().render(payload))
+
+    def test_parser_round_trip_and_errors(self):
+        import io
+
+        from rest_framework.exceptions import ParseError
+
+        from .parsers import ORJSONParser
+
+        self.assertEqual(ORJSONParser().parse(io.BytesIO('{"name": "파티"}'.encode())), {'name': '파티'})
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b'{"name": NaN}'))
+
+
+# ----------------------------------------------------
+# 빠른 읽기 Serializer golden 출력
+# ----------------------------------------------------
+class FastListSerializerGoldenTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        import decimal
+
+        cls.kim = User.objects.create_user(username='kim', email='kim@example.com', password='pw')
+        cls.lee = User.objects.create_user(username='lee', email='lee@example.com', password='pw')
+        cls.park = User.objects.create_user(username='park', email='', password='pw')
+        full = Event.objects.create(
+            name='한강 피크닉', description='돗자리 지참', date=date(2026, 5, 5),
+            location_name='여의도 한강공원', latitude=decimal.Decimal('37.528'), longitude=decimal.Decimal('-126.9341'),
+            place_id='ChIJ', theme='피크닉', food_description='치킨', host_name='kim', host=cls.kim, fee=15000,
+        )
+        Event.objects.create(name='빈 파티', date=date(2026, 5, 5))  # null 필드, 참가자 없음
+        Participant.objects.create(event=full, user=cls.kim, name='kim')
+        Participant.objects.create(event=full, name='게스트')
+        Friendship.objects.create(from_user=cls.kim, to_user=cls.lee, status='accepted')
+        Friendship.objects.create(from_user=cls.park, to_user=cls.kim)
+
+    def render(self, data):
+        from .renderers import ORJSONRenderer
+
+        return ORJSONRenderer().render(data)
+
+    def test_event_list_matches_event_serializer(self):
+        from rest_framework.test import APIRequestFactory
+
+        from .serializers import EventListSerializer, EventSerializer
+
+        request = APIRequestFactory().get('/api/events/')
+        queryset = Event.objects.prefetch_related('participant_set').order_by('-date', '-id')
+        expected = EventSerializer(queryset, many=True, context={'request': request}).data
+        fast = EventListSerializer(EventListSerializer.values(queryset), context={'request': request}).data
+        self.assertEqual(self.render(fast), self.render(expected))
+
+    def test_friend_list_matches_friendship_serializer(self):
+        from .serializers import FriendListSerializer, FriendshipSerializer
+
+        queryset = Friendship.objects.order_by('id')
+        expected = FriendshipSerializer(queryset, many=True).data
+        fast = FriendListSerializer(FriendListSerializer.values(queryset)).data
+        self.assertEqual(self.render(fast), self.render(expected))
+
+    def test_friend_list_endpoint_is_one_query(self):
+        client = APIClient()
+        client.force_authenticate(self.kim)
+        with self.assertNumQueries(1):
+            response = client.get('/api/friendships/')
+        self.assertEqual(len(response.data), 2)
+
+
+# ----------------------------------------------------
+# 정원 제한 참가 / 대기열
+# ----------------------------------------------------
+class CapacityJoinTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.event = Event.objects.create(name='small party', date=date(2026, 1, 1), max_members=2)
+        self.users = [User.objects.create_user(username=f'user{i}', password='pw') for i in range(4)]
+
+    def join(self, user):
+        self.client.force_authenticate(user)
+        return self.client.post('/api/participants/', {'event': str(self.event.id)})
+
+    def test_join_until_full_then_waitlist(self):
+        self.assertEqual(self.join(self.users[0]).status_code, 201)
+        self.assertEqual(self.join(self.users[1]).status_code, 201)
+
+        third = self.join(self.users[2])
+        fourth = self.join(self.users[3])
+        self.assertEqual(third.status_code, 202)
+        self.assertEqual((third.data['position'], fourth.data['position']), (1, 2))
+        self.assertEqual(self.event.participant_set.count(), 2)
+
+        # 다시 요청해도 순번은 그대로
+        self.assertEqual(self.join(self.users[2]).data['position'], 1)
+
+    def test_already_joined_is_not_duplicated(self):
+        self.join(self.users[0])
+        response = self.join(self.users[0])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.event.participant_set.filter(user=self.users[0]).count(), 1)
+
+    def test_leave_promotes_first_waitlisted_user(self):
+        for user in self.users:
+            self.join(user)
+        leaving = Participant.objects.get(event=self.event, user=self.users[0])
+        self.client.force_authenticate(self.users[0])
+        self.assertEqual(self.client.delete(f'/api/participants/{leaving.id}/').status_code, 204)
+
+        members = set(self.event.participant_set.values_list('user_id', flat=True))
+        self.assertEqual(members, {self.users[1].id, self.users[2].id})
+        self.assertEqual(list(WaitlistEntry.objects.values_list('user_id', flat=True)), [self.users[3].id])
+
+    def test_raising_max_members_promotes_waitlisted_users(self):
+        for user in self.users:
+            self.join(user)
+        self.client.force_authenticate(self.users[0])
+        response = self.client.patch(f'/api/events/{self.event.id}/', {'max_members': 3}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['participant_count'], response.data['spots_left']), (3, 0))
+
+        members = set(self.event.participant_set.values_list('user_id', flat=True))
+        self.assertEqual(members, {self.users[0].id, self.users[1].id, self.users[2].id})
+        self.assertEqual(list(WaitlistEntry.objects.values_list('user_id', flat=True)), [self.users[3].id])
+
+
+class ConcurrentJoinTests(TransactionTestCase):
+    """여러 스레드가 동시에 참가해도 max_members를 넘지 않는지 (row lock이 있는 DB에서만)"""
+
+    @skipUnless(connection.features.has_select_for_update, 'needs SELECT ... FOR UPDATE')
+    def test_concurrent_joins_do_not_overfill(self):
+        from .membership import join_event
+
+        event = Event.objects.create(name='hot party', date=date(2026, 1, 1), max_members=5)
+        users = [User.objects.create_user(username=f'rush{i}', password='pw') for i in range(20)]
+        barrier = threading.Barrier(len(users))
+        results = []
+
+        def worker(user):
+            barrier.wait()
+            try:
+                results.append(join_event(event.id, user, user.username).status)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(u,)) for u in users]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(Participant.objects.filter(event=event).count(), 5)
+        self.assertEqual(results.count('joined'), 5)
+        self.assertEqual(WaitlistEntry.objects.filter(event=event).count(), 15)
+
+
+# ----------------------------------------------------
+# 참가자 수 (participant_count / spots_left)
+# ----------------------------------------------------
+class ParticipantCountTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.host = User.objects.create_user(username='host', password='pw')
+        self.guest = User.objects.create_user(username='guest', password='pw')
+        self.client.force_authenticate(self.host)
+        response = self.client.post('/api/events/', {'name': 'party', 'date': '2026-01-01', 'max_members': 3})
+        self.event = Event.objects.get(pk=response.data['id'])
+
+    def test_create_counts_host(self):
+        self.assertEqual(self.event.participant_count, 1)
+        data = self.client.get(f'/api/events/{self.event.id}/').data
+        self.assertEqual((data['participant_count'], data['spots_left']), (1, 2))
+
+    def test_join_and_leave_update_count(self):
+        self.client.force_authenticate(self.guest)
+        self.client.post('/api/participants/', {'event': str(self.event.id)})
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.participant_count, 2)
+
+        participant = Participant.objects.get(event=self.event, user=self.guest)
+        self.client.delete(f'/api/participants/{participant.id}/')
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.participant_count, 1)
+
+    def test_list_without_members(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/events/?members=false')
+        row = response.data['results'][0]
+        self.assertNotIn('members', row)
+        self.assertEqual((row['participant_count'], row['spots_left']), (1, 2))
+
+    def test_rebuild_command_fixes_drift(self):
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        Event.objects.filter(pk=self.event.pk).update(participant_count=7)
+        out = StringIO()
+        call_command('rebuild_participant_counts', stdout=out)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.participant_count, 1)
+        self.assertIn('fixed 1 event(s)', out.getvalue())
+
+    def test_host_edit_keeps_joins_committed_after_load(self):
+        from .membership import join_event
+        from .serializers import EventSerializer
+
+        stale = Event.objects.get(pk=self.event.pk)  # 호스트 수정 요청이 불러온 행
+        join_event(self.event.id, self.guest, 'guest')
+        version = Event.objects.get(pk=self.event.pk).version
+
+        serializer = EventSerializer(stale, data={'name': 'renamed'}, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.name, 'renamed')
+        self.assertEqual(self.event.participant_count, 2)
+        self.assertEqual(self.event.version, version + 1)
+        self.assertEqual((stale.participant_count, stale.version), (2, version + 1))
+
+
+# ----------------------------------------------------
+# ?fields= / ?expand= sparse fieldset
+# ----------------------------------------------------
+class SparseFieldsetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='host', password='pw')
+        self.client.force_authenticate(self.user)
+        response = self.client.post('/api/events/', {'name': 'party', 'date': '2026-01-01'})
+        self.event_id = response.data['id']
+
+    def test_list_selects_only_requested_columns(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/events/?fields=id,name,spots_left')
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertNotIn('description', ctx.captured_queries[0]['sql'])
+        self.assertEqual(response.data['results'], [{'id': self.event_id, 'name': 'party', 'spots_left': 9}])
+
+    def test_expand_members(self):
+        response = self.client.get('/api/events/joined/?fields=name&expand=members')
+        self.assertEqual(list(response.data[0]), ['name', 'members'])
+        self.assertEqual([m['name'] for m in response.data[0]['members']], ['host'])
+
+    def test_retrieve_with_fields(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/events/{self.event_id}/?fields=name,invite_url')
+        self.assertEqual(list(response.data), ['name', 'invite_url'])
+        self.assertTrue(response.data['invite_url'].startswith('http://testserver/invite/'))
+
+    def test_full_payload_without_params(self):
+        response = self.client.get(f'/api/events/{self.event_id}/')
+        self.assertIn('members', response.data)
+        self.assertIn('description', response.data)
+
+    def test_unknown_field_is_400(self):
+        self.assertEqual(self.client.get('/api/events/?fields=id,password').status_code, 400)
+        self.assertEqual(self.client.get('/api/events/?expand=todos').status_code, 400)
+
+
+# ----------------------------------------------------
+# 주변 파티 검색 (격자 셀 + 거리 필터)
+# ----------------------------------------------------
+class NearbySearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        # 서울시청 기준: 약 0m / 약 1.1km / 약 11km / 부산
+        self.city_hall = Event.objects.create(name='city hall', date=date(2026, 1, 1), latitude='37.566535', longitude='126.977969')
+        self.near = Event.objects.create(name='near', date=date(2026, 1, 1), latitude='37.576535', longitude='126.977969')
+        self.far = Event.objects.create(name='far', date=date(2026, 1, 1), latitude='37.666535', longitude='126.977969')
+        Event.objects.create(name='busan', date=date(2026, 1, 1), latitude='35.179554', longitude='129.075642')
+        Event.objects.create(name='no location', date=date(2026, 1, 1))
+
+    def test_cell_ranges_cover_radius(self):
+        from .geo import cell_for, cell_ranges
+
+        ranges = cell_ranges(37.566535, 126.977969, 12000)
+        for event in (self.city_hall, self.near, self.far):
+            self.assertTrue(any(lo <= event.geo_cell <= hi for lo, hi in ranges))
+        self.assertEqual(cell_for(None, 1), None)
+        # 날짜변경선을 넘으면 한 줄이 두 구간으로 나뉩니다.
+        self.assertEqual(len(cell_ranges(0.01, 179.999, 1000)), 2 * len(cell_ranges(0.01, 0, 1000)))
+
+    def test_results_sorted_by_distance(self):
+        response = self.client.get('/api/events/nearby/?lat=37.566535&lng=126.977969&radius=5000')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([e['name'] for e in response.data], ['city hall', 'near'])
+        self.assertEqual(response.data[0]['distance_m'], 0)
+        self.assertAlmostEqual(response.data[1]['distance_m'], 1112, delta=2)
+
+        response = self.client.get('/api/events/nearby/?lat=37.566535&lng=126.977969&radius=20000&limit=2&fields=id')
+        self.assertEqual([e['id'] for e in response.data], [self.city_hall.id, self.near.id])
+
+    def test_location_update_moves_cell(self):
+        self.far.latitude, self.far.longitude = '37.566', '126.978'
+        self.far.save(update_fields=['latitude', 'longitude'])
+        response = self.client.get('/api/events/nearby/?lat=37.566535&lng=126.977969&radius=500')
+        self.assertIn('far', [e['name'] for e in response.data])
+
+    def test_invalid_params(self):
+        self.assertEqual(self.client.get('/api/events/nearby/?lng=126.9').status_code, 400)
+        self.assertEqual(self.client.get('/api/events/nearby/?lat=95&lng=126.9').status_code, 400)
+        self.assertEqual(self.client.get('/api/events/nearby/?lat=37&lng=126&radius=abc').status_code, 400)
+
+
+# ----------------------------------------------------
+# 친구 그래프 (FriendEdge / 함께 아는 친구 / 추천)
+# ----------------------------------------------------
+class FriendGraphTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.me, self.a, self.b, self.c, self.d, self.e = [
+            User.objects.create_user(username=name, email=f'{name}@example.com', password='pw')
+            for name in ('me', 'a', 'b', 'c', 'd', 'e')
+        ]
+        # me - a, me - b / a - c, b - c, a - d / me -> e (요청 중), a - e
+        for x, y in [(self.me, self.a), (self.me, self.b), (self.a, self.c), (self.b, self.c), (self.a, self.d), (self.a, self.e)]:
+            Friendship.objects.create(from_user=x, to_user=y, status='accepted')
+        Friendship.objects.create(from_user=self.me, to_user=self.e, status='pending')
+        self.client.force_authenticate(self.me)
+
+    def test_edges_follow_friendship_status(self):
+        self.assertEqual(FriendEdge.objects.filter(user=self.me).count(), 2)
+        pending = Friendship.objects.create(from_user=self.c, to_user=self.d)
+        self.assertFalse(FriendEdge.objects.filter(user=self.c, friend=self.d).exists())
+        pending.status = 'accepted'
+        pending.save()
+        self.assertTrue(FriendEdge.objects.filter(user=self.d, friend=self.c).exists())
+        pending.delete()
+        self.assertFalse(FriendEdge.objects.filter(user__in=[self.c, self.d], friend__in=[self.c, self.d]).exists())
+
+    def test_friends_and_mutual(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/friendships/friends/')
+        self.assertEqual([u['username'] for u in response.data], ['a', 'b'])
+        response = self.client.get(f'/api/friendships/mutual/{self.c.id}/')
+        self.assertEqual([u['username'] for u in response.data], ['a', 'b'])
+        self.assertEqual(self.client.get('/api/friendships/mutual/999999/').status_code, 404)
+
+    def test_suggestions_ranked_by_mutual_count(self):
+        response = self.client.get('/api/friendships/suggestions/')
+        # c: a, b 둘 다 아는 사이 / d: a 만 / e: 이미 요청 중이라 제외
+        self.assertEqual([(u['username'], u['mutual_count']) for u in response.data], [('c', 2), ('d', 1)])
+
+
+# ----------------------------------------------------
+# Bulk 친구 요청 / Bulk 참가자 추가
+# ----------------------------------------------------
+class BulkRequestTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.me = User.objects.create_user(username='me', email='me@example.com', password='pw')
+        self.friend = User.objects.create_user(username='friend', email='friend@example.com', password='pw')
+        self.others = [User.objects.create_user(username=f'u{i}', email=f'u{i}@example.com', password='pw') for i in range(3)]
+        Friendship.objects.create(from_user=self.friend, to_user=self.me, status='accepted')
+        self.client.force_authenticate(self.me)
+
+    def test_bulk_friend_requests(self):
+        emails = ['u0@example.com', 'friend@example.com', 'me@example.com', 'nobody@example.com',
+                  'not-an-email', 'u1@example.com', 'u0@example.com']
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post('/api/friendships/bulk/', {'emails': emails}, format='json')
+        # 유저 조회 / 기존 관계 조회 / INSERT (SAVEPOINT 제외)
+        queries = [q['sql'] for q in ctx.captured_queries if 'SAVEPOINT' not in q['sql']]
+        self.assertEqual(len(queries), 3)
+        statuses = [item['status'] for item in response.data['results']]
+        self.assertEqual(statuses, ['sent', 'already_friends', 'self', 'not_found', 'invalid', 'sent', 'duplicate'])
+        self.assertEqual(Friendship.objects.filter(from_user=self.me, status='pending').count(), 2)
+
+        again = self.client.post('/api/friendships/bulk/', {'emails': ['u0@example.com']}, format='json')
+        self.assertEqual(again.data['results'][0]['status'], 'already_requested')
+
+    def test_bulk_requires_email_list(self):
+        self.assertEqual(self.client.post('/api/friendships/bulk/', {'emails': 'u0@example.com'}, format='json').status_code, 400)
+
+    def test_bulk_participants_fill_then_waitlist(self):
+        event = self.client.post('/api/events/', {'name': 'party', 'date': '2026-01-01', 'max_members': 3}).data
+        emails = ['friend@example.com', 'u0@example.com', 'u1@example.com', 'me@example.com', 'ghost@example.com']
+        response = self.client.post(f"/api/events/{event['id']}/participants/bulk/", {'emails': emails}, format='json')
+        self.assertEqual(
+            [(item['status'], item.get('position')) for item in response.data['results']],
+            [('joined', None), ('joined', None), ('waitlisted', 1), ('already_joined', None), ('not_found', None)],
+        )
+        self.assertEqual(Event.objects.get(pk=event['id']).participant_count, 3)
+
+        self.client.force_authenticate(self.friend)
+        forbidden = self.client.post(f"/api/events/{event['id']}/participants/bulk/", {'emails': emails}, format='json')
+        self.assertEqual(forbidden.status_code, 403)
+
+
+# ----------------------------------------------------
+# Socket.IO JWT 인증 (socket_auth)
+# ----------------------------------------------------
+@override_settings(DB_EXECUTOR_WORKERS=0)  # 테스트 트랜잭션의 행을 보려면 공용 스레드에서 실행
+class SocketAuthTests(TestCase):
+    def setUp(self):
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        self.user = User.objects.create_user(username='kim', email='kim@example.com', password='pw')
+        self.other = User.objects.create_user(username='lee', email='lee@example.com', password='pw')
+        self.event = Event.objects.create(name='party', date=date(2026, 1, 1))
+        self.participant = Participant.objects.create(event=self.event, user=self.user, name='kim')
+        self.token = str(AccessToken.for_user(self.user))
+
+    def test_token_sources_and_validation(self):
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        from joiny_server.socket_auth import decode_user_id, get_token
+
+        self.assertEqual(get_token({}, {'token': 'a'}), 'a')
+        self.assertEqual(get_token({'QUERY_STRING': 'EIO=4&token=b'}, None), 'b')
+        self.assertEqual(get_token({'HTTP_AUTHORIZATION': 'Bearer c'}, None), 'c')
+        self.assertEqual(decode_user_id(self.token), self.user.id)
+        self.assertIsNone(decode_user_id('not-a-jwt'))
+
+        expired = AccessToken.for_user(self.user)
+        expired.set_exp(lifetime=-timedelta(minutes=1))
+        self.assertIsNone(decode_user_id(str(expired)))
+
+    async def test_connect_loads_memberships_once(self):
+        from socketio.exceptions import ConnectionRefusedError
+
+        from joiny_server import socket_auth
+
+        session = await socket_auth.authenticate({}, {'token': self.token})
+        self.assertEqual(session['user_id'], self.user.id)
+        self.assertEqual(await socket_auth.joined_at(session, self.event.id), self.participant.joined_at)
+        # 비회원 파티는 한 번만 DB 확인 후 잠시 거부 상태로 기억
+        self.assertIsNone(await socket_auth.joined_at(session, self.event.id + 1))
+        self.assertIn(str(self.event.id + 1), session['denied'])
+
+        with self.assertRaises(ConnectionRefusedError):
+            await socket_auth.authenticate({}, {'token': 'garbage'})
+        with self.assertRaises(ConnectionRefusedError):
+            await socket_auth.authenticate({}, None)
+        with override_settings(SOCKETIO_REQUIRE_AUTH=False):
+            self.assertEqual(await socket_auth.authenticate({}, None), {})
+
+    def test_cached_membership_needs_no_queries(self):
+        from joiny_server import socket_auth
+
+        session = socket_auth.load_session(self.user.id)
+        with self.assertNumQueries(0):
+            asyncio.run(socket_auth.joined_at(session, self.event.id))
+
+    async def test_chat_message_sender_comes_from_token(self):
+        from unittest import mock
+
+        from joiny_server import sio, socket_auth
+
+        namespace = sio.ChatNamespace('/chat')
+        session = await socket_auth.authenticate({}, {'token': self.token})
+        namespace.get_session = mock.AsyncMock(return_value=session)
+        namespace.emit_by_format = mock.AsyncMock()
+        with mock.patch.object(sio.chat_buffer, 'add', mock.AsyncMock(return_value={'created_at': self.participant.joined_at})) as add:
+            await namespace.on_chat_message('sid', {'party_id': str(self.event.id), 'message': 'hi', 'user_id': str(self.other.id)})
+            add.assert_awaited_once_with(str(self.event.id), self.user.id, 'kim', 'hi')
+
+            # 멤버가 아닌 파티로는 보내지 않습니다.
+            add.reset_mock()
+            await namespace.on_chat_message('sid', {'party_id': str(self.event.id + 1), 'message': 'hi'})
+            add.assert_not_awaited()
+
+    async def test_anonymous_chat_is_saved_only_for_members(self):
+        from unittest import mock
+
+        from joiny_server import sio
+
+        namespace = sio.ChatNamespace('/chat')
+        namespace.get_session = mock.AsyncMock(return_value={})
+        namespace.emit_by_format = mock.AsyncMock()
+        party_id = str(self.event.id)
+        with mock.patch.object(sio.chat_buffer, 'add', mock.AsyncMock(return_value={'created_at': self.participant.joined_at})) as add:
+            await namespace.on_chat_message('sid', {'party_id': party_id, 'message': 'hi', 'user_id': str(self.user.id), 'user_name': 'kim'})
+            add.assert_awaited_once_with(party_id, str(self.user.id), 'kim', 'hi')
+
+            # 회원이 아닌 user_id 로는 저장하지 않고 방송만 합니다.
+            add.reset_mock()
+            for user_id in (str(self.other.id), 'guest'):
+                await namespace.on_chat_message('sid', {'party_id': party_id, 'message': 'hi', 'user_id': user_id})
+            add.assert_not_awaited()
+            self.assertEqual(namespace.emit_by_format.await_count, 3)
+
+
+# ----------------------------------------------------
+# 로그인 (이메일 / 이름, 쿼리 한 번)
+# ----------------------------------------------------
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class LoginTests(TestCase):
+    url = '/api/auth/login/'
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='kim@example.com', email='Kim@Example.com', password='pw-1234')
+
+    def login(self, login_id, password='pw-1234'):
+        return self.client.post(self.url, {'username': login_id, 'password': password}, format='json')
+
+    def test_email_or_username_in_one_query(self):
+        for login_id in ('kim@example.com', 'KIM@EXAMPLE.COM', 'Kim@example.com'):
+            with self.assertNumQueries(1):
+                response = self.login(login_id)
+            self.assertEqual(response.status_code, 200, login_id)
+            self.assertIn('access', response.data)
+
+    def test_wrong_password_hashes_once(self):
+        from unittest import mock
+
+        with mock.patch.object(User, 'check_password', autospec=True, return_value=False) as check, \
+                self.assertNumQueries(1):
+            response = self.login('kim@example.com', 'wrong')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(check.call_count, 1)
+        self.assertEqual(self.login('nobody@example.com').status_code, 401)
+
+    def test_email_match_wins_over_username(self):
+        from .authentication import resolve_login_user
+
+        other = User.objects.create_user(username='lee@example.com', email='someone@example.com')
+        User.objects.filter(pk=self.user.pk).update(email='LEE@example.com')
+        self.assertEqual(resolve_login_user('lee@example.com'), self.user)
+        self.assertEqual(resolve_login_user('someone@example.com'), other)
+
+    def test_exact_email_wins_over_case_insensitive_match(self):
+        from .authentication import resolve_login_user
+
+        # 먼저 가입한 Kim@Example.com 이 있어도 입력한 그대로의 이메일 계정으로 로그인됩니다.
+        later = User.objects.create_user(username='kim2', email='kim@example.com', password='pw-5678')
+        self.assertEqual(resolve_login_user('kim@example.com'), later)
+        self.assertEqual(resolve_login_user('Kim@Example.com'), self.user)
+        self.assertEqual(self.login('kim@example.com', 'pw-5678').status_code, 200)
+
+    @override_settings(PASSWORD_HASHERS=['core.hashers.ConfigurablePBKDF2PasswordHasher',
+                                         'django.contrib.auth.hashers.MD5PasswordHasher'],
+                       PASSWORD_PBKDF2_ITERATIONS=1000)
+    def test_hash_profile_rehashes_on_login(self):
+        self.assertEqual(self.login('kim@example.com').status_code, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$1000$'))
+
+
+# ----------------------------------------------------
+# 지난 파티 보관 처리
+# ----------------------------------------------------
+class ArchiveTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='kim', email='kim@example.com', password='pw')
+        today = date.today()
+        cls.old = Event.objects.create(name='old', date=today - timedelta(days=40))
+        cls.recent = Event.objects.create(name='recent', date=today - timedelta(days=3))
+        for event in (cls.old, cls.recent):
+            Participant.objects.create(event=event, user=cls.user, name='kim')
+            ChatMessage.objects.bulk_create([
+                ChatMessage(event=event, sender=cls.user, message=f'm{i}') for i in range(4)
+            ])
+        cls.joined_at = Participant.objects.get(event=cls.old).joined_at
+        cls.old_ids = list(ChatMessage.objects.filter(event=cls.old).order_by('created_at', 'id').values_list('id', flat=True))
+
+    def archive(self):
+        from .archive import archive_events, cutoff_for
+
+        return archive_events(cutoff_for(30), batch_size=1)
+
+    def test_moves_old_events_and_their_messages(self):
+        self.assertEqual(self.archive(), (1, 4))
+        self.assertEqual(self.archive(), (0, 0))
+        self.old.refresh_from_db()
+        self.recent.refresh_from_db()
+        self.assertTrue(self.old.is_archived)
+        self.assertFalse(self.recent.is_archived)
+        self.assertFalse(ChatMessage.objects.filter(event=self.old).exists())
+        self.assertEqual(ChatMessage.objects.filter(event=self.recent).count(), 4)
+        self.assertEqual(
+            list(ArchivedChatMessage.objects.filter(event=self.old).order_by('id').values_list('id', flat=True)),
+            sorted(self.old_ids),
+        )
+        # 참가 기록은 그대로 (멤버십 확인, 참여한 파티 목록)
+        self.assertEqual(Participant.objects.filter(event=self.old).count(), 1)
+
+    def test_history_reads_through_archive(self):
+        from joiny_server import chat_history
+
+        self.archive()
+        late = ChatMessage.objects.create(event=self.old, sender=self.user, message='late')
+        page, has_more = chat_history.page_before(self.old.id, self.joined_at, None, 10)
+        self.assertFalse(has_more)
+        self.assertEqual([m['id'] for m in page], self.old_ids + [late.id])
+        after = chat_history.message_key(self.old.id, self.old_ids[1])
+        page, _ = chat_history.page_after(self.old.id, self.joined_at, after, 10)
+        self.assertEqual([m['id'] for m in page], self.old_ids[2:] + [late.id])
+        # 다음 보관 작업이 늦게 온 메시지도 옮깁니다.
+        self.assertEqual(self.archive(), (0, 1))
+        self.assertTrue(ArchivedChatMessage.objects.filter(id=late.id).exists())
+
+    def test_lists_show_active_events_by_default(self):
+        self.archive()
+        client = APIClient()
+        names = lambda response: [e['name'] for e in response.data['results']]
+        self.assertEqual(names(client.get('/api/events/')), ['recent'])
+        self.assertEqual(names(client.get('/api/events/?archived=true')), ['old'])
+        self.assertEqual(names(client.get('/api/events/?archived=all')), ['recent', 'old'])
+        self.assertEqual(client.get('/api/events/?archived=maybe').status_code, 400)
+        self.assertEqual(client.get(f'/api/events/{self.old.id}/').status_code, 200)
+
+        client.force_authenticate(self.user)
+        self.assertEqual([e['name'] for e in client.get('/api/events/joined/').data], ['recent'])
+        self.assertEqual(len(client.get('/api/events/joined/?archived=all').data), 2)
+
+    def test_command_dry_run(self):
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        out = StringIO()
+        call_command('archive_events', '--dry-run', '--days', '30', stdout=out)
+        self.assertIn('would archive 1 event(s)', out.getvalue())
+        self.assertFalse(Event.objects.filter(is_archived=True).exists())
+        call_command('archive_events', '--days', '1', stdout=out)
+        self.assertIn('archived 2 event(s)', out.getvalue())
+
+
+# ----------------------------------------------------
+# 조건부 GET (ETag / Last-Modified)
+# ----------------------------------------------------
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='kim', email='kim@example.com', password='pw')
+        cls.event = Event.objects.create(name='party', date=date(2026, 1, 1))
+        Theme.objects.create(name='캠핑')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.url = f'/api/events/{self.event.id}/'
+        theme_cache.clear()
+
+    def test_unchanged_event_returns_304_without_serializing(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, 200)
+        self.assertIn('Last-Modified', first)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], first['ETag'])
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_participant_todo_and_edit_change_the_etag(self):
+        etags = [self.client.get(self.url)['ETag']]
+        participant = Participant.objects.create(event=self.event, user=self.user, name='kim')
+        etags.append(self.client.get(self.url)['ETag'])
+        Todo.objects.create(event=self.event, task='장보기')
+        etags.append(self.client.get(self.url)['ETag'])
+        participant.delete()
+        etags.append(self.client.get(self.url)['ETag'])
+        event = Event.objects.get(pk=self.event.pk)
+        event.name = 'renamed'
+        event.save(update_fields=['name'])
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etags[-1])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['name'], 'renamed')
+        etags.append(response['ETag'])
+        self.assertEqual(len(set(etags)), len(etags))
+
+    def test_bulk_join_changes_the_etag(self):
+        from .membership import bulk_join_event
+
+        etag = self.client.get(self.url)['ETag']
+        bulk_join_event(self.event.id, [self.user])
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_missing_event_is_404(self):
+        self.assertEqual(self.client.get('/api/events/999999/').status_code, 404)
+
+    def test_theme_list_served_from_process_cache(self):
+        first = self.client.get('/api/themes/')
+        self.assertEqual([t['name'] for t in first.data], ['캠핑'])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/api/themes/', HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+            self.assertEqual(self.client.get('/api/themes/').data, first.data)
+        Theme.objects.create(name='보드게임')
+        response = self.client.get('/api/themes/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 2)
+
+    def test_theme_detail_conditional_get(self):
+        theme = Theme.objects.get(name='캠핑')
+        url = f'/api/themes/{theme.id}/'
+        first = self.client.get(url)
+        self.assertEqual(first.data['name'], '캠핑')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+        Theme.objects.filter(pk=theme.pk).update(description='바뀜')
+        theme_cache.clear()  # Theme 시그널이 하는 일 (update() 는 시그널을 보내지 않음)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], first['ETag'])
+        self.assertEqual(self.client.get('/api/themes/999999/').status_code, 404)
+
+
+# ----------------------------------------------------
+# /party 변경 알림 (joiny_server/party_push.py)
+# ----------------------------------------------------
+class PartyPushTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.host = User.objects.create_user(username='host', email='host@example.com', password='pw')
+        cls.user = User.objects.create_user(username='kim', email='kim@example.com', password='pw')
+        cls.event = Event.objects.create(name='party', date=date(2026, 1, 1), host=cls.host)
+
+    def setUp(self):
+        from joiny_server.party_push import party_publisher
+
+        self.publisher = party_publisher
+        self.sent = []
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+        async def start():
+            party_publisher.start(self.collect)
+
+        asyncio.run_coroutine_threadsafe(start(), self.loop).result()
+        self.client = APIClient()
+
+    def tearDown(self):
+        self.publisher.stop()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+    async def collect(self, event, party_id, payload):
+        self.sent.append((event, party_id, payload))
+
+    def deltas(self):
+        # 루프에 넘긴 emit 이 모두 실행될 때까지 기다립니다.
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0), self.loop).result()
+        sent, self.sent = self.sent, []
+        return sent
+
+    def test_rest_changes_are_pushed_to_the_party_room(self):
+        self.client.force_authenticate(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.client.post('/api/participants/', {'event': self.event.id}).status_code, 201)
+        [(name, party_id, payload)] = self.deltas()
+        self.assertEqual((name, party_id), ('participant_joined', self.event.id))
+        self.assertEqual(payload['party_id'], str(self.event.id))
+        self.assertEqual(payload['participant']['user'], self.user.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            todo_id = self.client.post('/api/todos/', {'event': self.event.id, 'task': '장보기'}).data['id']
+            self.client.patch(f'/api/todos/{todo_id}/', {'is_completed': True})
+        created, completed = self.deltas()
+        self.assertEqual((created[0], created[2]['created']), ('todo_updated', True))
+        self.assertEqual((completed[0], completed[2]['created']), ('todo_updated', False))
+        self.assertTrue(completed[2]['todo']['is_completed'])
+
+        self.client.force_authenticate(self.host)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f'/api/events/{self.event.id}/', {'name': 'renamed'})
+        [(name, _, payload)] = self.deltas()
+        self.assertEqual(name, 'event_updated')
+        self.assertEqual(payload['event']['name'], 'renamed')
+        self.assertNotIn('members', payload['event'])
+
+    def test_bulk_join_and_partial_save(self):
+        from .membership import bulk_join_event
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk_join_event(self.event.id, [self.user, self.host])
+            event = Event.objects.get(pk=self.event.pk)
+            event.max_members = 20
+            event.save(update_fields=['max_members'])
+        deltas = self.deltas()
+        self.assertEqual([name for name, _, _ in deltas], ['participant_joined', 'participant_joined', 'event_updated'])
+        self.assertEqual(set(deltas[-1][2]['event']), {'id', 'max_members', 'spots_left'})
+
+    def test_nothing_is_sent_before_commit_or_without_a_server(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            Todo.objects.create(event=self.event, task='장보기')
+        self.assertEqual(self.deltas(), [])
+
+        self.publisher.stop()
+        skipped = self.publisher.stats.skipped
+        Todo.objects.create(event=self.event, task='음료')
+        self.assertEqual(self.publisher.stats.skipped, skipped + 1)
+
+
+class UnixSocketBrokerTests(TestCase):
+    async def test_frames_are_json_and_socket_is_private(self):
+        import os
+        import pickle
+        import tempfile
+
+        from joiny_server.pubsub import UnixSocketPubSubManager, run_broker, write_frame
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'sio.sock')
+            broker = asyncio.create_task(run_broker(path))
+            try:
+                while not os.path.exists(path):
+                    await asyncio.sleep(0.01)
+                self.assertEqual(os.stat(path).st_mode & 0o777, 0o600)
+
+                listener = UnixSocketPubSubManager(path)._listen()
+                received = asyncio.ensure_future(anext(listener))
+                await asyncio.sleep(0.05)  # 리스너가 브로커에 붙을 때까지
+
+                # pickle 프레임은 풀지 않고 버립니다.
+                _, raw = await asyncio.open_unix_connection(path)
+                with self.assertLogs('socketio', 'ERROR') as logs:
+                    await write_frame(raw, pickle.dumps(('socketio', {'method': 'emit'})))
+                    message = {'method': 'emit', 'event': 'chat_message', 'data': {'message': '안녕'}, 'room': 'party_1'}
+                    publisher = UnixSocketPubSubManager(path)
+                    await publisher._publish(message)
+                    self.assertEqual(await asyncio.wait_for(received, 2), message)
+                self.assertIn('invalid pubsub frame', logs.output[0])
+                raw.close()
+                publisher._writer.close()
+                await listener.aclose()
+                await asyncio.sleep(0.05)  # 브로커가 끊긴 연결을 정리할 때까지
+            finally:
+                broker.cancel()
+                with self.assertRaises(asyncio.CancelledError):
+                    await broker
+
+    async def test_binary_emits_are_relayed(self):
+        import os
+        import tempfile
+
+        from joiny_server import wire
+        from joiny_server.pubsub import UnixSocketPubSubManager, run_broker
+
+        frame = wire.encode_chat_message(1, 7, 'kim', '안녕', 1700000000000)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'sio.sock')
+            broker = asyncio.create_task(run_broker(path))
+            try:
+                while not os.path.exists(path):
+                    await asyncio.sleep(0.01)
+                listener = UnixSocketPubSubManager(path)._listen()
+                received = asyncio.ensure_future(anext(listener))
+                await asyncio.sleep(0.05)  # 리스너가 브로커에 붙을 때까지
+
+                # 바이너리 클라이언트용 emit (wire.py 프레임) 도 JSON 으로 중계됩니다.
+                publisher = UnixSocketPubSubManager(path)
+                await publisher.emit('chat_message', frame, namespace='/chat', room='party_1/binary')
+                message = await asyncio.wait_for(received, 2)
+                self.assertEqual((message['event'], message['room']), ('chat_message', 'party_1/binary'))
+                self.assertEqual(message['data'], frame)
+                publisher._writer.close()
+                await listener.aclose()
+                await asyncio.sleep(0.05)
+            finally:
+                broker.cancel()
+                with self.assertRaises(asyncio.CancelledError):
+                    await broker
+
+
+# ----------------------------------------------------
+# 요청 / Socket.IO 이벤트 계측 (joiny_server/metrics.py)
+# ----------------------------------------------------
+class MetricsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='kim', email='kim@example.com', password='pw')
+        cls.event = Event.objects.create(name='party', date=date(2026, 1, 1))
+        Participant.objects.create(event=cls.event, user=cls.user, name='kim')
+
+    def setUp(self):
+        from joiny_server.metrics import registry
+
+        self.registry = registry
+        registry.reset()
+
+    def histogram(self, name, **labels):
+        return self.registry.histograms[(name, tuple(sorted(labels.items())))]
+
+    def test_records_queries_and_serializer_time_per_route(self):
+        client = APIClient()
+        client.get(f'/api/events/{self.event.id}/')
+        client.get(f'/api/events/{self.event.id}/')
+        labels = {'method': 'GET', 'route': 'event-detail', 'status': '200'}
+        queries = self.histogram('joiny_http_request_queries', **labels)
+        self.assertEqual(queries.count, 2)
+        self.assertEqual(queries.sum, 4)  # 요청마다 이벤트 + 참가자 prefetch
+        self.assertGreater(self.histogram('joiny_http_request_serializer_seconds', **labels).sum, 0)
+        self.assertGreater(self.histogram('joiny_http_request_db_seconds', **labels).sum, 0)
+        # 목록은 .values() 기반 EventListSerializer 도 직렬화 시간으로 잡힙니다.
+        client.get('/api/events/')
+        labels['route'] = 'event-list'
+        self.assertGreater(self.histogram('joiny_http_request_serializer_seconds', **labels).sum, 0)
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_prometheus_endpoint(self):
+        client = APIClient()
+        client.get('/api/themes/')
+        self.assertEqual(client.get('/metrics').status_code, 403)
+        response = client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+        text = response.content.decode()
+        self.assertIn('# TYPE joiny_http_request_duration_seconds histogram', text)
+        self.assertIn(
+            'joiny_http_request_queries_count{method="GET",route="theme-list",status="200"} 1', text
+        )
+
+    def test_socketio_events(self):
+        from joiny_server.sio import party_namespace
+
+        asyncio.run(party_namespace.trigger_event('leave_party', 'sid', {}))
+        asyncio.run(party_namespace.trigger_event('no_such_event', 'sid', {}))
+        self.assertEqual(
+            self.histogram('joiny_socketio_event_duration_seconds', namespace='/party', event='leave_party').count, 1
+        )
+        self.assertEqual(
+            self.histogram('joiny_socketio_event_queries', namespace='/party', event='unknown').count, 1
+        )
+
+    @override_settings(METRICS_ENABLED=False)
+    def test_disabled_metrics_patch_nothing(self):
+        from unittest import mock
+
+        from django.core.exceptions import MiddlewareNotUsed
+        from rest_framework import serializers
+
+        from joiny_server.metrics import MetricsMiddleware
+
+        with mock.patch('joiny_server.metrics.install') as install:
+            with self.assertRaises(MiddlewareNotUsed):
+                MetricsMiddleware(lambda request: None)
+        install.assert_not_called()
+        # DRF 클래스는 어느 경우에도 건드리지 않습니다.
+        self.assertEqual(serializers.BaseSerializer.data.fget.__module__, 'rest_framework.serializers')
+
+    def test_slow_request_profile_is_dumped(self):
+        import os
+        import tempfile
+
+        from django.http import HttpResponse
+        from django.test import RequestFactory
+
+        from joiny_server.metrics import SlowRequestProfiler
+
+        with tempfile.TemporaryDirectory() as directory:
+            profiler = SlowRequestProfiler(threshold_ms=0, sample_rate=1.0, directory=directory)
+            response = profiler.run(lambda request: HttpResponse('ok'), RequestFactory().get('/api/events/'))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(os.listdir(directory)), 1)
+
+
+class DatabaseConnectionTests(TestCase):
+    def setUp(self):
+        from joiny_server.metrics import registry
+
+        self.registry = registry
+        registry.reset()
+
+    def test_database_sync_to_async_releases_around_the_call(self):
+        from unittest import mock
+
+        from asgiref.sync import async_to_sync
+
+        from joiny_server.db import database_sync_to_async
+
+        calls = []
+        with mock.patch('joiny_server.db.release_connections', side_effect=lambda: calls.append('release')):
+            result = async_to_sync(database_sync_to_async(lambda: calls.append('call') or 42))()
+        self.assertEqual(result, 42)
+        self.assertEqual(calls, ['release', 'call', 'release'])
+
+    def test_release_keeps_connections_inside_a_transaction(self):
+        from unittest import mock
+
+        from django.db import connections
+
+        from joiny_server.db import release_connections
+
+        # TestCase 는 트랜잭션 안에서 실행되므로 연결을 닫거나 풀에 돌려주면 안 됩니다.
+        connection.ensure_connection()
+        with mock.patch.object(type(connections['default']), 'close_if_unusable_or_obsolete') as close:
+            release_connections()
+        close.assert_not_called()
+
+    def test_opened_connections_are_counted(self):
+        from django.db import connections
+        from django.db.backends.base.base import BaseDatabaseWrapper
+
+        from joiny_server import metrics
+        from joiny_server.metrics import install
+
+        connect = BaseDatabaseWrapper.connect
+        install()  # MetricsMiddleware 가 METRICS_ENABLED 일 때 부르는 것과 같음
+        self.assertIs(BaseDatabaseWrapper.connect, connect)  # Django 클래스는 그대로
+        wrapper = connections.create_connection('default')
+        try:
+            wrapper.ensure_connection()
+            self.assertIn(metrics.record_query, wrapper.execute_wrappers)
+        finally:
+            wrapper.close()
+        self.assertEqual(self.registry.counters[('joiny_db_connections_opened_total', (('alias', 'default'),))], 1)
+        self.assertIn('# TYPE joiny_db_connections_opened_total counter', self.registry.render())
+
+    async def test_background_tasks_do_not_inherit_the_handler_sample(self):
+        from joiny_server import metrics
+        from joiny_server.presence import PresenceRegistry, PresenceSweeper
+
+        seen = []
+
+        async def emit_offline(changes):
+            seen.append(metrics.current.get())
+
+        registry = PresenceRegistry(timeout=0.02)
+        registry.join('a', 1, 7)
+        sweeper = PresenceSweeper(registry, emit_offline)
+        with metrics.observe('joiny_socketio_event', {'event': 'join_party'}):
+            sweeper.start()  # 첫 핸들러 안에서 시작됨
+        while not seen:
+            await asyncio.sleep(0.01)
+        registry.disconnect('a')
+        await sweeper.close()
+        self.assertEqual(seen, [None])
+
+    def test_pool_stats_are_exported_as_gauges(self):
+        from unittest import mock
+
+        from django.db import connections
+
+        class FakePool:
+            def get_stats(self):
+                return {'pool_size': 4, 'pool_available': 1, 'requests_wait_ms': 250}
+
+        pool_settings = {**connections.settings['default'], 'OPTIONS': {'pool': {'max_size': 4}}}
+        with mock.patch.dict(connections.settings, {'default': pool_settings}), \
+                mock.patch.object(type(connections['default']), 'pool', FakePool(), create=True):
+            text = self.registry.render()
+        self.assertIn('# TYPE joiny_db_pool_pool_size gauge', text)
+        self.assertIn('joiny_db_pool_pool_size{alias="default"} 4', text)
+        self.assertIn('joiny_db_pool_requests_wait_ms{alias="default"} 250', text)
+        self.assertIn('joiny_db_pool_requests_waiting{alias="default"} 0', text)
+
+
+class DataLayerTests(TransactionTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='kim', email='kim@example.com', password='pw')
+        self.event = Event.objects.create(name='party', date=date(2026, 1, 1))
+        self.participant = Participant.objects.create(event=self.event, user=self.user, name='kim')
+
+    def tearDown(self):
+        from joiny_server import data
+
+        data.shutdown()
+
+    @override_settings(DB_EXECUTOR_WORKERS=2)
+    def test_calls_run_on_the_db_pool_concurrently(self):
+        from joiny_server import data
+
+        # 공용 스레드 하나였다면 첫 호출이 barrier 에서 멈춰 두 번째 호출이 시작되지 못합니다.
+        barrier = threading.Barrier(2, timeout=5)
+
+        def wait_for_each_other():
+            barrier.wait()
+            return threading.current_thread().name
+
+        async def both():
+            return await asyncio.gather(data.run(wait_for_each_other), data.run(wait_for_each_other))
+
+        names = asyncio.run(both())
+        self.assertEqual(len(set(names)), 2)
+        self.assertTrue(all(name.startswith('joiny-db') for name in names))
+
+    @override_settings(DB_EXECUTOR_WORKERS=2)
+    def test_lookups(self):
+        from joiny_server import data
+
+        message = ChatMessage.objects.create(event=self.event, sender=self.user, message='hi')
+        joined_at = asyncio.run(data.joined_at(str(self.event.id), self.user.id))
+        self.assertEqual(joined_at, self.participant.joined_at)
+        key = asyncio.run(data.message_key(str(self.event.id), message.id))
+        self.assertEqual(key, (message.created_at, message.id))
+
+
+# ----------------------------------------------------
+# 접속 상태 (presence)
+# ----------------------------------------------------
+class PresenceTests(TestCase):
+    def setUp(self):
+        from joiny_server.presence import PresenceRegistry
+
+        self.now = 0.0
+        self.registry = PresenceRegistry(timeout=60, clock=lambda: self.now)
+
+    def test_online_until_the_last_socket_leaves(self):
+        registry = self.registry
+        self.assertEqual(registry.join('a', 1, 7), ([('1', '7')], []))
+        self.assertEqual(registry.join('b', '1', '7'), ([], []))  # 같은 유저의 두 번째 탭
+        self.assertEqual(registry.join('c', 1, 8), ([('1', '8')], []))
+        self.assertEqual(registry.counts([1, 2]), {'1': 2, '2': 0})
+        self.assertEqual(registry.leave('a', 1), [])
+        self.assertEqual(registry.disconnect('b'), [('1', '7')])
+        self.assertEqual(registry.online(1), ['8'])
+
+    def test_silent_sockets_expire_and_come_back(self):
+        registry = self.registry
+        registry.join('a', 1, 7)
+        registry.join('a', 2, 7)
+        registry.join('b', 1, 8)
+        self.now = 50
+        registry.touch('b')
+        self.now = 61
+        self.assertEqual(sorted(registry.expire()), [('1', '7'), ('2', '7')])
+        self.assertEqual(registry.expire(), [])
+        self.assertEqual(registry.online(1), ['8'])
+        self.assertEqual(sorted(registry.touch('a')), [('1', '7'), ('2', '7')])
+        self.assertEqual(registry.counts([1, 2]), {'1': 2, '2': 1})
+
+    async def test_namespace_sends_diffs_and_snapshot(self):
+        from unittest import mock
+
+        from django.utils import timezone
+
+        from joiny_server import sio
+
+        with mock.patch.object(sio, 'presence', self.registry):
+            namespace = sio.ChatNamespace('/chat')
+            namespace.member = mock.AsyncMock(return_value=(7, timezone.now()))
+            namespace.is_authenticated = mock.AsyncMock(return_value=True)
+            namespace.enter_party = mock.AsyncMock()
+            namespace.leave_party = mock.AsyncMock()
+            namespace.send_latest_history = mock.AsyncMock()
+            namespace.emit = mock.AsyncMock()
+            self.registry.join('other', 1, 8)
+
+            await namespace.on_join_party('a', {'party_id': '1'})
+            namespace.emit.assert_any_await(
+                'presence', {'party_id': '1', 'online': ['7'], 'offline': []}, room='party_1'
+            )
+            namespace.emit.assert_any_await(
+                'presence', {'party_id': '1', 'online': ['7', '8'], 'offline': [], 'snapshot': True}, room='a'
+            )
+
+            namespace.emit.reset_mock()
+            await namespace.on_leave_party('a', {'party_id': '1'})
+            namespace.emit.assert_awaited_once_with(
+                'presence', {'party_id': '1', 'online': [], 'offline': ['7']}, room='party_1'
+            )
+            await namespace.presence_sweeper.close()
+
+    async def test_only_confirmed_members_of_authenticated_sockets(self):
+        from unittest import mock
+
+        from django.utils import timezone
+
+        from joiny_server import sio
+
+        with mock.patch.object(sio, 'presence', self.registry):
+            namespace = sio.ChatNamespace('/chat')
+            namespace.enter_party = mock.AsyncMock()
+            namespace.send_latest_history = mock.AsyncMock()
+            namespace.emit = mock.AsyncMock()
+            # 익명 소켓이 보낸 user_id: 멤버가 아니어도, 멤버여도 접속 상태로 올리지 않습니다.
+            namespace.is_authenticated = mock.AsyncMock(return_value=False)
+            for joined_at in (None, timezone.now()):
+                namespace.member = mock.AsyncMock(return_value=(7, joined_at))
+                await namespace.on_join_party('anon', {'party_id': '1', 'user_id': '7'})
+            # 인증된 소켓이라도 멤버가 아니면 마찬가지
+            namespace.is_authenticated = mock.AsyncMock(return_value=True)
+            namespace.member = mock.AsyncMock(return_value=(8, None))
+            await namespace.on_join_party('a', {'party_id': '1'})
+        self.assertEqual(self.registry.sockets, {})
+        self.assertNotIn('presence', [call.args[0] for call in namespace.emit.await_args_list])
+
+    def test_online_counts_endpoint(self):
+        from unittest import mock
+
+        self.registry.join('a', 1, 7)
+        self.registry.join('b', 3, 8)
+        client = APIClient()
+        with mock.patch('core.views.presence', self.registry), self.assertNumQueries(0):
+            response = client.get('/api/events/online/?ids=1,2,3')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'1': 1, '2': 0, '3': 1})
+        self.assertEqual(client.get('/api/events/online/?ids=1,x').status_code, 400)
+        self.assertEqual(client.get('/api/events/online/').status_code, 400)
+
+    @override_settings(SOCKETIO_MANAGER_URL='unix:///tmp/joiny-sio.sock')
+    async def test_not_tracked_with_multiple_workers(self):
+        from unittest import mock
+
+        from django.utils import timezone
+
+        from joiny_server import sio
+
+        # 다른 워커의 소켓을 모르므로 부분 집계나 잘못된 offline 을 보내지 않습니다.
+        response = await sync_to_async(APIClient().get)('/api/events/online/?ids=1')
+        self.assertEqual(response.status_code, 501)
+        with mock.patch.object(sio, 'presence', self.registry):
+            namespace = sio.ChatNamespace('/chat')
+            namespace.member = mock.AsyncMock(return_value=(7, timezone.now()))
+            namespace.is_authenticated = mock.AsyncMock(return_value=True)
+            namespace.enter_party = mock.AsyncMock()
+            namespace.send_latest_history = mock.AsyncMock()
+            namespace.emit = mock.AsyncMock()
+            await namespace.on_join_party('a', {'party_id': '1'})
+            await namespace.on_disconnect('a')
+        self.assertEqual(self.registry.sockets, {})
+        self.assertNotIn('presence', [call.args[0] for call in namespace.emit.await_args_list])
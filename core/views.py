@@ -1,17 +1,33 @@
 # core/views.py
+import math
 
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from .models import Event, Participant, Todo, Theme, Friendship
 from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
 from django.db.models import Q
 
 from .serializers import EventSerializer, ParticipantSerializer, TodoSerializer, ThemeSerializer, RegisterSerializer, UserSerializer, FriendshipSerializer
+from .serializers import EventListSerializer, FriendListSerializer, UserListSerializer
 from rest_framework import generics, permissions
+from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from django.db.models import Prefetch
+from .pagination import EventKeysetPagination
+from .cache import MISSING, resolve_invite_code, get_event_payload, cache_stats, theme_cache
+from .conditional import VERSION_COLUMNS, content_etag, event_validators, is_conditional, not_modified
+from .conditional import set_validators, validators_for
+from .membership import bulk_join_event, join_event, leave_event
+from .bulk import email_list, resolve_emails
+from .geo import nearby_ids
+from . import friends as friend_graph
+from joiny_server.location import location_stats
+from joiny_server.party_push import party_publisher
+from joiny_server.presence import available as presence_available, presence
 
 class EventViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.AllowAny] # 누구나 파티 목록 조회 가능
@@ -19,11 +35,119 @@ class EventViewSet(viewsets.ModelViewSet):
     # 최신 이벤트 순으로 정렬하고, Nested Serializer를 위해 모든 관련 데이터(참가자, 할일 등)를 미리 가져옵니다.
     queryset = Event.objects.all()
     serializer_class = EventSerializer
+    pagination_class = EventKeysetPagination
+
+    # ?fields= / ?expand= 를 적용하는 조회 액션
+    sparse_actions = ('list', 'retrieve', 'joined', 'nearby')
+
+    # 주변 파티 검색 기본값 / 상한 (미터, 개수)
+    nearby_default_radius_m = 3000
+    nearby_max_radius_m = 50000
+    nearby_default_limit = 50
+    nearby_max_limit = 200
+
+    # 접속 인원 조회 한 번에 받는 이벤트 id 수 상한
+    online_max_ids = 200
 
     def get_queryset(self):
         # 파티 목록을 최신순으로 정렬하여 반환합니다.
         # 인증 기능 추가 후에는 request.user를 사용해 필터링해야 합니다.
-        return Event.objects.all().order_by('-date')
+        fields = self.get_fields() if self.action in self.sparse_actions else None
+        if fields is not None:
+            # 요청한 필드에 필요한 컬럼만 읽고, members 를 요청했을 때만 참가자를 가져옵니다.
+            columns = EventSerializer.columns_for(fields)
+            if self.action == 'retrieve':
+                # ETag 계산용 버전 컬럼
+                columns = [*columns, *VERSION_COLUMNS]
+            queryset = Event.objects.only(*columns)
+            if 'members' in fields:
+                queryset = queryset.prefetch_related(self.members_prefetch())
+            return queryset.order_by('-date', '-id')
+        # host와 참가자 목록을 한 번에 가져와 이벤트마다 추가 쿼리(N+1)가 발생하지 않게 합니다.
+        return (
+            Event.objects.select_related('host')
+            .prefetch_related(self.members_prefetch())
+            .order_by('-date', '-id')
+        )
+
+    @staticmethod
+    def members_prefetch():
+        return Prefetch('participant_set', queryset=Participant.objects.order_by('id'))
+
+    def get_fields(self):
+        """
+        응답할 필드 목록. None 이면 전체 필드 (기존 응답 그대로).
+        - ?fields=id,name,date       : 고른 필드만
+        - ?expand=members            : fields 와 함께 쓰면 members 를 추가로 포함
+        - ?members=false             : 전체 필드에서 members 만 제외
+        """
+        if hasattr(self, '_fields'):
+            return self._fields
+        params = self.request.query_params
+        expand = {name.strip() for name in params.get('expand', '').split(',') if name.strip()}
+        unknown = expand - {'members'}
+        if unknown:
+            raise ValidationError({'expand': f"Unknown relation(s): {', '.join(sorted(unknown))}"})
+
+        fields = None
+        if params.get('fields'):
+            fields = [name.strip() for name in params['fields'].split(',') if name.strip()]
+            unknown = set(fields) - set(EventSerializer.Meta.fields)
+            if unknown:
+                raise ValidationError({'fields': f"Unknown field(s): {', '.join(sorted(unknown))}"})
+            if 'members' in expand:
+                fields.append('members')
+        elif params.get('members', '').lower() in ('0', 'false', 'no'):
+            fields = [name for name in EventSerializer.Meta.fields if name != 'members']
+        self._fields = fields
+        return fields
+
+    def get_serializer(self, *args, **kwargs):
+        if self.action in self.sparse_actions:
+            kwargs.setdefault('fields', self.get_fields())
+        return super().get_serializer(*args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        # 목록은 DRF 필드 machinery 대신 .values() 기반 EventListSerializer로 응답합니다. (출력 동일)
+        fields = self.get_fields()
+        queryset = self.filter_archived(self.filter_queryset(self.get_queryset()))
+        queryset = EventListSerializer.values(queryset, fields)
+        page = self.paginate_queryset(queryset)
+        serializer = EventListSerializer(
+            queryset if page is None else page,
+            context=self.get_serializer_context(),
+            fields=fields,
+        )
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
+
+    def retrieve(self, request, *args, **kwargs):
+        # 조건부 요청(폴링)은 버전 키만 읽어서 바뀌지 않았으면 직렬화 없이 304 로 응답합니다.
+        pk = str(kwargs.get(self.lookup_field, ''))
+        if is_conditional(request) and pk.isdigit():
+            validators = event_validators(pk)
+            if validators is not None:
+                response = not_modified(request, *validators)
+                if response is not None:
+                    return set_validators(response, *validators)
+        instance = self.get_object()
+        response = Response(self.get_serializer(instance).data)
+        return set_validators(response, *validators_for(instance.pk, instance.version, instance.updated_at))
+
+    def filter_archived(self, queryset):
+        """
+        목록 조회 범위 (기본은 진행 중인 파티만, (is_archived, date, id) 인덱스 사용)
+        - ?archived=false : 진행 중인 파티만 (기본)
+        - ?archived=true  : 보관된 지난 파티만
+        - ?archived=all   : 전체
+        """
+        archived = self.request.query_params.get('archived', 'false').lower()
+        if archived == 'all':
+            return queryset
+        if archived not in ('true', 'false'):
+            raise ValidationError({'archived': "Must be one of 'true', 'false', 'all'."})
+        return queryset.filter(is_archived=archived == 'true')
 
     def check_host_permission(self, request, instance):
         if not request.user.is_authenticated:
@@ -49,33 +173,73 @@ class EventViewSet(viewsets.ModelViewSet):
         # 파티 생성 시 현재 로그인한 유저를 호스트로 파티 저장 후, 참가자로 자동 등록
         host_name = self.request.user.username if self.request.user.is_authenticated else "Guest"
         host = self.request.user if self.request.user.is_authenticated else None
-        event = serializer.save(host_name=host_name, host=host)
-        
-        # 생성자를 참가자(호스트)로 추가
-        if self.request.user.is_authenticated:
-            Participant.objects.create(
-                event=event, 
-                user=self.request.user, 
-                name=host_name
-            )
+        # 생성자를 참가자(호스트)로 추가 (이벤트 저장과 같은 트랜잭션, 참가자 수 1로 시작)
+        with transaction.atomic():
+            if self.request.user.is_authenticated:
+                event = serializer.save(host_name=host_name, host=host, participant_count=1)
+                Participant.objects.create(
+                    event=event,
+                    user=self.request.user,
+                    name=host_name
+                )
+            else:
+                serializer.save(host_name=host_name, host=host)
 
     # 초대 코드를 통해 이벤트를 조회하는 커스텀 액션
     @action(detail=False, methods=['get'], url_path='by_invite_code/(?P<invite_code>[^/.]+)')
     def retrieve_by_invite_code(self, request, invite_code=None):
+        # 초대 링크는 단톡방 공유 시 가장 많이 호출되므로 캐시를 먼저 확인합니다.
+        event_id = resolve_invite_code(invite_code)
+        if event_id is None:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+
+        def build():
+            event = self.get_queryset().get(pk=event_id)
+            # invite_url은 요청 호스트마다 달라지므로 캐시에는 None으로 저장합니다.
+            return dict(self.get_serializer_class()(event, context={'request': None}).data)
+
         try:
-            # UUID 형식으로 검색
-            event = self.queryset.get(invite_code=invite_code)
+            payload = dict(get_event_payload(event_id, build))
         except Event.DoesNotExist:
             return Response(status=status.HTTP_404_NOT_FOUND)
 
-        # 상세 Serializer 사용
-        serializer = self.get_serializer(event)
-        return Response(serializer.data)
+        payload['invite_url'] = EventSerializer.build_invite_url(request, payload['invite_code'])
+        return Response(payload)
+
+    @action(detail=True, methods=['post'], url_path='participants/bulk')
+    def bulk_participants(self, request, pk=None):
+        """
+        여러 명을 한 번에 파티에 추가 (호스트만)
+        - POST /api/events/{id}/participants/bulk/  body: { "emails": ["a@x.com", ...] }
+        항목마다 joined / already_joined / waitlisted / not_found / invalid / duplicate 결과를 돌려줍니다.
+        """
+        event = Event.objects.select_related('host').filter(pk=pk).first()
+        if event is None:
+            return Response({'error': 'Event not found.'}, status=status.HTTP_404_NOT_FOUND)
+        if not self.check_host_permission(request, event):
+            return Response({'error': 'Only host can add participants.'}, status=status.HTTP_403_FORBIDDEN)
+
+        items = resolve_emails(email_list(request.data))
+        joins = bulk_join_event(event.id, [user for _, user, error in items if error is None])
+
+        results = []
+        for email, user, error in items:
+            if error:
+                results.append({'email': email, 'status': error})
+                continue
+            result = joins[user.id]
+            item = {'email': email, 'status': result.status}
+            if result.participant is not None:
+                item['participant'] = result.participant.id
+            if result.waitlist_position is not None:
+                item['position'] = result.waitlist_position
+            results.append(item)
+        return Response({'results': results})
 
     @action(detail=False, methods=['get'])
     def joined(self, request):
         """
-        내가 참여한 파티 목록 조회
+        내가 참여한 파티 목록 조회 (?archived=all 이면 지난 파티까지)
         """
         user = request.user
         if not user.is_authenticated:
@@ -83,12 +247,71 @@ class EventViewSet(viewsets.ModelViewSet):
         
         # Participant 모델을 통해 내가 참여한 이벤트 ID 목록을 가져옴
         # 혹은 Event 모델에서 participant__user=user 로 바로 필터링 가능
-        events = Event.objects.filter(participant__user=user).order_by('-date')
-        
-        serializer = self.get_serializer(events, many=True)
+        events = self.filter_archived(Event.objects.filter(participant__user=user)).order_by('-date', '-id')
+
+        fields = self.get_fields()
+        serializer = EventListSerializer(
+            EventListSerializer.values(events, fields),
+            context=self.get_serializer_context(),
+            fields=fields,
+        )
         return Response(serializer.data)
 
 
+    @action(detail=False, methods=['get'])
+    def nearby(self, request):
+        """
+        주변 파티 검색 (가까운 순)
+        - GET /api/events/nearby/?lat=37.56&lng=126.97&radius=3000&limit=50
+        radius 는 미터 단위 (기본 3km, 최대 50km). 각 항목에 distance_m 이 붙습니다.
+        """
+        lat = self.query_float('lat', -90, 90)
+        lng = self.query_float('lng', -180, 180)
+        radius = self.query_float('radius', 1, self.nearby_max_radius_m, default=self.nearby_default_radius_m)
+        limit = int(self.query_float('limit', 1, self.nearby_max_limit, default=self.nearby_default_limit))
+
+        hits = nearby_ids(self.filter_archived(self.filter_queryset(Event.objects.all())), lat, lng, radius, limit)
+        fields = self.get_fields()
+        queryset = Event.objects.filter(id__in=[pk for pk, _ in hits])
+        rows = {row['id']: row for row in EventListSerializer.values(queryset, fields)}
+        hits = [(pk, distance) for pk, distance in hits if pk in rows]  # 그 사이 삭제된 이벤트 제외
+
+        data = EventListSerializer([rows[pk] for pk, _ in hits], context=self.get_serializer_context(), fields=fields).data
+        for item, (_, distance) in zip(data, hits):
+            item['distance_m'] = round(distance, 1)
+        return Response(data)
+
+    @action(detail=False, methods=['get'])
+    def online(self, request):
+        """
+        파티별 접속 중인 멤버 수 (/chat 소켓 기준, DB 조회 없음)
+        - GET /api/events/online/?ids=1,2,3 -> {"1": 2, "2": 0, "3": 1}
+        이 워커에 연결된 소켓만 집계하므로, 워커가 여럿(SOCKETIO_MANAGER_URL)이면 부분 집계 대신 501 을 돌려줍니다. (presence.py)
+        """
+        if not presence_available():
+            return Response(
+                {'error': 'Online counts are not available with multiple Socket.IO workers.'},
+                status=status.HTTP_501_NOT_IMPLEMENTED,
+            )
+        ids = [pk for pk in request.query_params.get('ids', '').split(',') if pk]
+        if not ids or len(ids) > self.online_max_ids or not all(pk.isdigit() for pk in ids):
+            raise ValidationError({'ids': f'1-{self.online_max_ids} comma-separated event ids are required.'})
+        return Response(presence.counts(int(pk) for pk in ids))
+
+    def query_float(self, name, low, high, default=None):
+        raw = self.request.query_params.get(name)
+        if raw in (None, ''):
+            if default is None:
+                raise ValidationError({name: 'This parameter is required.'})
+            return default
+        try:
+            value = float(raw)
+        except ValueError:
+            raise ValidationError({name: 'A number is required.'})
+        if not (low <= value <= high) or math.isnan(value):
+            raise ValidationError({name: f'Must be between {low} and {high}.'})
+        return value
+
 # POST 요청을 오버라이드하여 초대 코드를 통한 참가자 등록 로직 구현
 class ParticipantViewSet(viewsets.ModelViewSet):
     queryset = Participant.objects.all()
@@ -114,32 +337,40 @@ class ParticipantViewSet(viewsets.ModelViewSet):
         if not event_id:
             return Response({'error': 'Event ID is required.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        try:
-            # 2. 이벤트 찾기 (ID로 검색 시도, 실패시 invite_code로 시도 - 호환성)
-            # api.ts에서 id를 보낸다면 id로 검색이 맞음.
-            if str(event_id).isdigit():
-                event = Event.objects.get(id=event_id)
-            else:
-                 event = Event.objects.get(invite_code=event_id)
-        except Event.DoesNotExist:
+        # 2. 이벤트 찾기 (ID로 검색 시도, 실패시 invite_code로 시도 - 호환성)
+        # api.ts에서 id를 보낸다면 id로 검색이 맞음. 초대 코드는 캐시를 통해 조회합니다.
+        if str(event_id).isdigit():
+            event_pk = Event.objects.filter(id=event_id).values_list('id', flat=True).first()
+        else:
+            event_pk = resolve_invite_code(event_id)
+        if event_pk is None:
             return Response({'error': 'Event not found.'}, status=status.HTTP_404_NOT_FOUND)
 
-        # 3. 중복 참여 확인
-        if Participant.objects.filter(event=event, user=user).exists():
-             return Response({'message': 'Already joined.'}, status=status.HTTP_200_OK)
+        # 3. 참가자 이름 (유저 이름 사용, 클라이언트가 별도로 보내면 그것을 사용)
+        participant_name = request.data.get('name') or user.username
 
-        # 4. 참가자 생성 (User와 연결)
-        # 이름은 유저 이름 사용 (또는 별명 입력 받을 수도 있음)
-        participant_name = user.username 
-        # 만약 클라이언트가 이름을 별도로 보내면 그것을 사용할 수도 있음
-        if request.data.get('name'):
-            participant_name = request.data.get('name')
+        # 4. 중복 확인 + 정원 확인 + 참가자 생성을 한 트랜잭션에서 처리 (동시 참가 시 정원 초과 방지)
+        try:
+            result = join_event(event_pk, user, participant_name)
+        except Event.DoesNotExist:
+            return Response({'error': 'Event not found.'}, status=status.HTTP_404_NOT_FOUND)
 
-        participant = Participant.objects.create(event=event, user=user, name=participant_name)
-        serializer = self.get_serializer(participant)
+        if result.status == 'already_joined':
+            return Response({'message': 'Already joined.'}, status=status.HTTP_200_OK)
+        if result.status == 'waitlisted':
+            # 정원이 찼으면 대기열 순번을 알려줍니다. 자리가 나면 순서대로 자동 참가됩니다.
+            return Response(
+                {'message': 'Event is full.', 'waitlisted': True, 'position': result.waitlist_position},
+                status=status.HTTP_202_ACCEPTED,
+            )
 
+        serializer = self.get_serializer(result.participant)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
+    def perform_destroy(self, instance):
+        # 나간 자리는 대기열 첫 번째 유저에게 넘깁니다.
+        leave_event(instance)
+
 
 class TodoViewSet(viewsets.ModelViewSet):
     # TodoViewSet 로직 (Todo 항목 관리)
@@ -154,6 +385,52 @@ class ThemeViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Theme.objects.all()
     serializer_class = ThemeSerializer
 
+    def cached_themes(self):
+        """(목록 데이터, 목록 ETag, {id: (테마 데이터, ETag)})"""
+        # 테마는 거의 바뀌지 않으므로 직렬화 결과와 ETag 를 프로세스 캐시에 둡니다.
+        cached = theme_cache.get('list')
+        if cached is MISSING:
+            data = self.get_serializer(self.filter_queryset(self.get_queryset()), many=True).data
+            cached = (data, content_etag(data), {str(item['id']): (item, content_etag(item)) for item in data})
+            theme_cache.set('list', cached)
+        return cached
+
+    def list(self, request, *args, **kwargs):
+        data, etag, _ = self.cached_themes()
+        response = not_modified(request, etag)
+        if response is None:
+            response = Response(data)
+        return set_validators(response, etag)
+
+    def retrieve(self, request, *args, **kwargs):
+        # 상세도 같은 캐시에서 꺼내고, 테마 하나의 내용으로 만든 ETag 를 붙입니다.
+        found = self.cached_themes()[2].get(str(kwargs[self.lookup_field]))
+        if found is None:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        data, etag = found
+        response = not_modified(request, etag)
+        if response is None:
+            response = Response(data)
+        return set_validators(response, etag)
+
+# ----------------------------------------------------
+# Stats Views (모니터링용 캐시 / 실시간 메시지 카운터)
+# ----------------------------------------------------
+class CacheStatsView(APIView):
+    """초대 코드/이벤트 캐시 카운터 조회 (GET /api/cache/stats/)"""
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(cache_stats())
+
+
+class RealtimeStatsView(APIView):
+    """위치 공유 inbound/outbound 메시지, /party 변경 알림 카운터 조회 (GET /api/realtime/stats/)"""
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response({'location': location_stats.snapshot(), 'party': party_publisher.stats.snapshot()})
+
 # ----------------------------------------------------
 # Auth Views (회원가입, 유저 정보)
 # ----------------------------------------------------
@@ -194,6 +471,10 @@ class FriendshipViewSet(viewsets.ModelViewSet):
     - POST /: 친구 요청 보내기 (body: { "email": "target@email.com" })
     - DELETE /{id}/: 친구 삭제 또는 요청 취소/거절
     - POST /{id}/accept/: 친구 요청 수락
+    - GET /friends/: 내 친구(수락된 관계) 유저 목록
+    - GET /mutual/{user_id}/: 그 유저와 함께 아는 친구 목록
+    - GET /suggestions/?limit=20: 친구의 친구 추천 (함께 아는 친구 수 순)
+    - POST /bulk/: 여러 명에게 친구 요청 (body: { "emails": [...] })
     """
     serializer_class = FriendshipSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -203,6 +484,11 @@ class FriendshipViewSet(viewsets.ModelViewSet):
         user = self.request.user
         return Friendship.objects.filter(Q(from_user=user) | Q(to_user=user))
 
+    def list(self, request, *args, **kwargs):
+        # 친구 목록은 유저 JOIN 한 번으로 만드는 FriendListSerializer 사용 (출력 동일)
+        queryset = FriendListSerializer.values(self.filter_queryset(self.get_queryset()))
+        return Response(FriendListSerializer(queryset, context=self.get_serializer_context()).data)
+
     def create(self, request, *args, **kwargs):
         # 이메일로 유저 찾아서 친구 요청
         target_email = request.data.get('email')
@@ -244,3 +530,73 @@ class FriendshipViewSet(viewsets.ModelViewSet):
         friendship.status = 'accepted'
         friendship.save()
         return Response({'message': 'Friend request accepted.'})
+
+    @action(detail=False, methods=['get'])
+    def friends(self, request):
+        # FriendEdge (user, friend) 인덱스 범위 스캔 한 번
+        queryset = UserListSerializer.values(friend_graph.friends(request.user.id))
+        return Response(UserListSerializer(queryset).data)
+
+    @action(detail=False, methods=['get'], url_path=r'mutual/(?P<user_id>\d+)')
+    def mutual(self, request, user_id=None):
+        if not User.objects.filter(id=user_id).exists():
+            return Response({'error': 'User not found.'}, status=status.HTTP_404_NOT_FOUND)
+        queryset = UserListSerializer.values(friend_graph.mutual_friends(request.user.id, int(user_id)))
+        return Response(UserListSerializer(queryset).data)
+
+    @action(detail=False, methods=['get'])
+    def suggestions(self, request):
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+        except ValueError:
+            return Response({'error': 'limit must be a number.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        ranked = friend_graph.suggestions(request.user.id, limit=limit)
+        users = {row[0]: row for row in UserListSerializer.values(User.objects.filter(id__in=[pk for pk, _ in ranked]))}
+        data = UserListSerializer([users[pk] for pk, _ in ranked if pk in users]).data
+        mutual_counts = dict(ranked)
+        for item in data:
+            item['mutual_count'] = mutual_counts[item['id']]
+        return Response(data)
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        이메일 목록으로 친구 요청을 한 번에 보냅니다.
+        유저 조회 1번 + 기존 관계 조회 1번 + bulk_create 1번. 항목마다 결과를 돌려줍니다.
+        (sent / already_friends / already_requested / self / not_found / invalid / duplicate)
+        """
+        me = request.user
+        items = resolve_emails(email_list(request.data))
+        target_ids = [user.id for _, user, error in items if error is None and user.id != me.id]
+
+        existing = {}
+        relations = Friendship.objects.filter(
+            Q(from_user=me, to_user_id__in=target_ids) | Q(from_user_id__in=target_ids, to_user=me)
+        ).only('id', 'from_user_id', 'to_user_id', 'status')
+        for friendship in relations:
+            other_id = friendship.to_user_id if friendship.from_user_id == me.id else friendship.from_user_id
+            existing[other_id] = friendship
+
+        new = [Friendship(from_user=me, to_user_id=pk, status='pending') for pk in dict.fromkeys(target_ids) if pk not in existing]
+        try:
+            with transaction.atomic():
+                created = Friendship.objects.bulk_create(new)
+        except IntegrityError:
+            # 같은 요청이 동시에 들어온 경우: 한 건씩 만들고, 이미 있으면 그대로 둡니다.
+            created = [Friendship.objects.get_or_create(from_user=me, to_user_id=f.to_user_id)[0] for f in new]
+        created = {friendship.to_user_id: friendship for friendship in created}
+
+        results = []
+        for email, user, error in items:
+            if error:
+                results.append({'email': email, 'status': error})
+            elif user.id == me.id:
+                results.append({'email': email, 'status': 'self'})
+            elif user.id in existing:
+                friendship = existing[user.id]
+                state = 'already_friends' if friendship.status == 'accepted' else 'already_requested'
+                results.append({'email': email, 'status': state, 'id': friendship.id})
+            else:
+                results.append({'email': email, 'status': 'sent', 'id': created[user.id].id})
+        return Response({'results': results})
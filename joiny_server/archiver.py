@@ -0,0 +1,68 @@
+import asyncio
+import logging
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from core.archive import archive_events, cutoff_for
+
+from .db import release_connections
+
+logger = logging.getLogger(__name__)
+
+
+def run_once(days):
+    """One archive pass in a worker thread (fresh DB connection state each run)."""
+    release_connections()
+    try:
+        return archive_events(cutoff_for(days))
+    finally:
+        release_connections()
+
+
+class ArchiveScheduler:
+    """
+    Periodically archives past events from inside the ASGI worker.
+
+    Started from the ASGI lifespan startup hook and cancelled on shutdown.
+    Every `interval` seconds it runs core.archive.archive_events in a thread.
+    Several workers may run it at once: batches are claimed with
+    SELECT ... FOR UPDATE SKIP LOCKED, so each event is moved by one worker.
+    `interval <= 0` disables the job (use the archive_events command instead).
+    """
+
+    def __init__(self, interval=3600, days=30):
+        self.interval = interval
+        self.days = days
+        self._task = None
+
+    @classmethod
+    def from_settings(cls):
+        return cls(interval=settings.ARCHIVE_INTERVAL, days=settings.ARCHIVE_AFTER_DAYS)
+
+    def start(self):
+        if self.interval > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                events, messages = await sync_to_async(run_once, thread_sensitive=False)(self.days)
+            except Exception:
+                logger.exception('Archive pass failed')
+                continue
+            if events or messages:
+                logger.info('Archived %d event(s), moved %d message(s)', events, messages)
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+archive_scheduler = ArchiveScheduler.from_settings()
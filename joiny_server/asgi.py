@@ -15,7 +15,29 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'joiny_server.settings')
 
 application = get_asgi_application()
 
-from .sio import sio
+from .sio import sio, chat_buffer, chat_namespace, party_namespace, party_publisher
+from .archiver import archive_scheduler
+from . import data
 import socketio
 
-application = socketio.ASGIApp(sio, application, socketio_path='/socket.io')
+
+async def on_startup():
+    archive_scheduler.start()
+    # Model-change deltas for /party are emitted on this worker's event loop
+    party_publisher.start(party_namespace.push)
+
+
+async def on_shutdown():
+    # Stop the archive job, delta pushes and presence expiry, flush buffered chat messages, then stop the DB threads
+    party_publisher.stop()
+    await archive_scheduler.close()
+    await chat_namespace.presence_sweeper.close()
+    await chat_buffer.close()
+    data.shutdown()
+
+
+application = socketio.ASGIApp(
+    sio, application, socketio_path='/socket.io',
+    on_startup=on_startup,
+    on_shutdown=on_shutdown,
+)
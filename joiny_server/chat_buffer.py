@@ -0,0 +1,250 @@
+import asyncio
+import contextvars
+import uuid
+from collections import defaultdict
+from contextlib import asynccontextmanager
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from core.models import ChatMessage
+
+from . import data
+
+
+class ReadWriteLock:
+    """
+    asyncio lock held by any number of readers or by one writer.
+    A waiting writer holds back new readers, so a stream of history reads
+    can't starve batch writes.
+    """
+
+    def __init__(self):
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+        self._changed = asyncio.Condition()
+
+    @asynccontextmanager
+    async def reading(self):
+        async with self._changed:
+            await self._changed.wait_for(lambda: not self._writer and not self._writers_waiting)
+            self._readers += 1
+        try:
+            yield
+        finally:
+            async with self._changed:
+                self._readers -= 1
+                self._changed.notify_all()
+
+    @asynccontextmanager
+    async def writing(self):
+        async with self._changed:
+            self._writers_waiting += 1
+            try:
+                await self._changed.wait_for(lambda: not self._writer and not self._readers)
+            finally:
+                self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            async with self._changed:
+                self._writer = False
+                self._changed.notify_all()
+
+
+class ChatWriteBuffer:
+    """
+    Write-behind queue for chat messages.
+
+    Messages are broadcast immediately by the namespace and persisted here in
+    batches with bulk_create, flushed when `batch_size` messages are waiting or
+    `flush_interval` seconds have passed. The queue is bounded by `max_pending`,
+    so producers wait (back-pressure) when the database falls behind.
+
+    Messages that are queued but not yet committed are kept in `pending` per
+    event so that history replay can include them. A batch that fails to write
+    stays there and is retried.
+    """
+
+    def __init__(self, batch_size=100, flush_interval=0.2, max_pending=5000, max_retry_delay=5.0, close_attempts=3):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        # A failed batch is retried with doubling delays up to max_retry_delay,
+        # and at most close_attempts times once close() has been called.
+        self.max_retry_delay = max_retry_delay
+        self.close_attempts = close_attempts
+        self.pending = defaultdict(list)
+        # Written batches hold it exclusively, history reads share it, so a
+        # message is always seen exactly once: either in the DB or in pending.
+        self.lock = None
+        self._queue = None
+        self._wakeup = None
+        self._worker = None
+        self._flushing = 0
+        self._closing = False
+
+    @classmethod
+    def from_settings(cls):
+        config = settings.CHAT_BUFFER
+        return cls(
+            batch_size=config['BATCH_SIZE'],
+            flush_interval=config['FLUSH_INTERVAL'],
+            max_pending=config['MAX_PENDING'],
+        )
+
+    def start(self):
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue(maxsize=self.max_pending)
+            self._wakeup = asyncio.Event()
+            self.lock = ReadWriteLock()
+            self._closing = False
+            # Fresh context: started from a handler, it must not inherit that handler's metrics sample
+            self._worker = asyncio.create_task(self._run(), context=contextvars.Context())
+
+    async def add(self, event_id, sender_id, sender_name, message):
+        """Queue a message for persistence. Waits while the queue is full."""
+        if self._closing:
+            raise RuntimeError('Chat buffer is shutting down.')
+        self.start()
+        entry = {
+            'event_id': int(event_id),
+            'sender_id': int(sender_id),
+            'user_name': sender_name,
+            'message': message,
+            'created_at': timezone.now(),
+            'uuid': uuid.uuid4(),  # Resume cursor for clients that only saw the live message
+        }
+        pending = self.pending[entry['event_id']]
+        pending.append(entry)
+        try:
+            await self._queue.put(entry)
+        except asyncio.CancelledError:
+            # Never queued, so the worker will not clear it from pending
+            pending.remove(entry)
+            if not pending:
+                self.pending.pop(entry['event_id'], None)
+            raise
+        if self._queue.qsize() >= self.batch_size - 1:
+            # A full batch is waiting (the worker holds one more), write it now
+            self._wakeup.set()
+        return entry
+
+    def pending_for(self, event_id, since=None, after_uuid=None):
+        """
+        Unflushed messages for an event, oldest first. Call inside `lock.reading()`.
+        after_uuid skips up to and including that message if it is still pending.
+        """
+        entries = self.pending.get(int(event_id), [])
+        if after_uuid is not None:
+            for i, entry in enumerate(entries):
+                if entry['uuid'] == after_uuid:
+                    entries = entries[i + 1:]
+                    break
+        if since is not None:
+            entries = [e for e in entries if e['created_at'] >= since]
+        return list(entries)
+
+    def pending_entry(self, event_id, message_uuid):
+        """The pending entry with this uuid, or None. Call inside `lock.reading()`."""
+        for entry in self.pending.get(int(event_id), []):
+            if entry['uuid'] == message_uuid:
+                return entry
+        return None
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            if not self._flushing and self._queue.qsize() < self.batch_size - 1:
+                # Wait for more messages, up to flush_interval
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            self._wakeup.clear()
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            await self._write(batch)
+
+    async def _write(self, batch):
+        delay = self.flush_interval or 0.1
+        attempts = 0
+        while True:
+            attempts += 1
+            async with self.lock.writing():
+                try:
+                    await data.run(self._bulk_create, batch)
+                    self._done(batch)
+                    return
+                except Exception as e:
+                    if self._closing and attempts >= self.close_attempts:
+                        print(f"Failed to save {len(batch)} chat messages, dropping them on shutdown: {e}")
+                        self._done(batch)
+                        return
+                    # Database unreachable, connection dropped...: keep the batch
+                    # pending and try again. Later batches wait behind it (and
+                    # producers behind max_pending), so messages stay in order.
+                    print(f"Failed to save {len(batch)} chat messages, retrying in {delay:g}s: {e}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_retry_delay)
+
+    def _done(self, batch):
+        for entry in batch:
+            entries = self.pending.get(entry['event_id'])
+            if entries:
+                entries.remove(entry)
+                if not entries:
+                    del self.pending[entry['event_id']]
+        for _ in batch:
+            self._queue.task_done()
+
+    @staticmethod
+    def _bulk_create(batch):
+        # created_at is the time the message was received and broadcast, not the flush time
+        rows = [
+            ChatMessage(
+                event_id=e['event_id'], sender_id=e['sender_id'], message=e['message'],
+                created_at=e['created_at'], uuid=e['uuid'],
+            )
+            for e in batch
+        ]
+        try:
+            with transaction.atomic():
+                ChatMessage.objects.bulk_create(rows)
+        except IntegrityError:
+            # One bad row (deleted event, unknown sender) must not drop the whole batch.
+            # A row already saved by an earlier attempt fails here on its unique uuid.
+            for row in rows:
+                try:
+                    with transaction.atomic():
+                        row.save()
+                except IntegrityError as e:
+                    print(f"Failed to save message: {e}")
+
+    async def flush(self):
+        """Wait until everything queued so far is written."""
+        if self._queue is not None and self._worker is not None and not self._worker.done():
+            self._flushing += 1
+            self._wakeup.set()
+            try:
+                await self._queue.join()
+            finally:
+                self._flushing -= 1
+
+    async def close(self):
+        """Flush remaining messages and stop the worker. Used on ASGI shutdown."""
+        self._closing = True
+        await self.flush()
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
@@ -0,0 +1,109 @@
+"""
+Chat history queries for ChatNamespace.
+
+History is read in keyset pages ordered by (created_at, id) and streamed from
+the DB as `.values()` rows, so a long-running party never loads its whole
+history into memory. Clients page with message ids: `before_id` for older
+pages and `last_message_id` to resume after a reconnect. Live messages are
+broadcast before they are written and have no id yet, so every message also
+carries the `uuid` the chat buffer gave it; `last_message_uuid` resumes from
+that, whether the message has been written since or is still pending.
+
+Archived parties keep their history in ArchivedChatMessage (same ids), so
+every read is a UNION ALL over the hot and the archive table. Each side is an
+(event, created_at, id) index range, and ids stay valid as cursors after a
+party is archived.
+"""
+from django.db.models import Q
+
+from core.models import ArchivedChatMessage, ChatMessage, Participant
+
+FIELDS = ('id', 'uuid', 'message', 'created_at', 'sender__username')
+
+
+def to_payload(row):
+    return {
+        'id': row['id'],
+        'uuid': str(row['uuid']) if row['uuid'] else None,
+        'user_name': row['sender__username'],
+        'message': row['message'],
+        'timestamp': row['created_at'].isoformat(),
+        'sid': 'history',  # Marker
+    }
+
+
+def pending_payload(entry):
+    """Payload for a message still waiting in the chat write buffer (no id yet)."""
+    return {
+        'id': None,
+        'uuid': str(entry['uuid']),
+        'user_name': entry['user_name'],
+        'message': entry['message'],
+        'timestamp': entry['created_at'].isoformat(),
+        'sid': 'history',
+    }
+
+
+def get_joined_at(party_id, user_id):
+    return (
+        Participant.objects.filter(event_id=party_id, user_id=user_id)
+        .values_list('joined_at', flat=True)
+        .first()
+    )
+
+
+def messages(party_id, *conditions, fields=FIELDS):
+    """This party's messages from the hot and the archive table as one UNION ALL query."""
+    hot, archived = (
+        model.objects.filter(*conditions, event_id=party_id).values(*fields)
+        for model in (ChatMessage, ArchivedChatMessage)
+    )
+    return hot.union(archived, all=True)
+
+
+def message_key(party_id, message_id):
+    """(created_at, id) of a message in this party, used as a keyset cursor."""
+    for row in messages(party_id, Q(id=message_id), fields=('created_at', 'id'))[:1]:
+        return row['created_at'], row['id']
+    return None
+
+
+def message_key_for_uuid(party_id, message_uuid):
+    """message_key() of a written message, looked up by its uuid."""
+    for row in messages(party_id, Q(uuid=message_uuid), fields=('created_at', 'id'))[:1]:
+        return row['created_at'], row['id']
+    return None
+
+
+def page_before(party_id, since, before, limit):
+    """
+    Newest `limit` messages older than `before` (or the newest overall).
+    Returns (payloads oldest-first, has_more).
+    """
+    conditions = [Q(created_at__gte=since)]
+    if before is not None:
+        created_at, message_id = before
+        conditions.append(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=message_id))
+    rows = messages(party_id, *conditions).order_by('-created_at', '-id')[:limit + 1]
+    page = [to_payload(row) for row in rows.iterator(chunk_size=limit + 1)]
+    has_more = len(page) > limit
+    page = page[:limit]
+    page.reverse()
+    return page, has_more
+
+
+def page_after(party_id, since, after, limit):
+    """
+    Oldest `limit` messages newer than `after`.
+    Returns (payloads oldest-first, key of the last row to continue from).
+    """
+    conditions = [Q(created_at__gte=since)]
+    if after is not None:
+        created_at, message_id = after
+        conditions.append(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=message_id))
+    rows = messages(party_id, *conditions).order_by('created_at', 'id')[:limit]
+    page, last_key = [], after
+    for row in rows.iterator(chunk_size=limit):
+        page.append(to_payload(row))
+        last_key = (row['created_at'], row['id'])
+    return page, last_key
@@ -0,0 +1,79 @@
+"""
+Async data access for the Socket.IO handlers.
+
+sync_to_async(thread_sensitive=True) runs every call on one shared thread,
+and so do Django's async queryset methods (aget, acount, async for ...),
+which are built on it. Concurrent handlers then wait behind each other's
+queries: a join_party that pages history blocks every chat message being
+checked for membership behind it.
+
+Calls here run on a dedicated pool of DB_EXECUTOR_WORKERS threads instead.
+Each thread keeps its own connection, checked and released around every
+call (see db.py), so keep the pool no larger than DB_POOL_MAX_SIZE.
+DB_EXECUTOR_WORKERS = 0 runs calls on the shared thread again, which is what
+tests inside a transaction need: other threads can't see its rows.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+from . import chat_history
+from .db import database_sync_to_async
+
+_lock = threading.Lock()
+_executor = None  # (workers, ThreadPoolExecutor)
+
+
+def executor():
+    """The DB thread pool for the current DB_EXECUTOR_WORKERS, or None when it is 0."""
+    global _executor
+    workers = settings.DB_EXECUTOR_WORKERS
+    if workers <= 0:
+        return None
+    with _lock:
+        if _executor is None or _executor[0] != workers:
+            if _executor is not None:
+                _executor[1].shutdown(wait=False)
+            _executor = (workers, ThreadPoolExecutor(workers, thread_name_prefix='joiny-db'))
+        return _executor[1]
+
+
+async def run(func, *args, **kwargs):
+    """Run a sync DB function on the DB thread pool."""
+    pool = executor()
+    if pool is None:
+        return await database_sync_to_async(func)(*args, **kwargs)
+    return await database_sync_to_async(func, thread_sensitive=False, executor=pool)(*args, **kwargs)
+
+
+def shutdown():
+    """Called on ASGI shutdown, after the chat buffer has flushed."""
+    global _executor
+    with _lock:
+        if _executor is not None:
+            _executor[1].shutdown(wait=True)
+            _executor = None
+
+
+# ----------------------------------------------------
+# Chat / membership lookups (see chat_history.py)
+# ----------------------------------------------------
+async def joined_at(party_id, user_id):
+    return await run(chat_history.get_joined_at, party_id, user_id)
+
+
+async def message_key(party_id, message_id):
+    return await run(chat_history.message_key, party_id, message_id)
+
+
+async def message_key_for_uuid(party_id, message_uuid):
+    return await run(chat_history.message_key_for_uuid, party_id, message_uuid)
+
+
+async def page_before(party_id, joined_at, before, limit):
+    return await run(chat_history.page_before, party_id, joined_at, before, limit)
+
+
+async def page_after(party_id, joined_at, after, limit):
+    return await run(chat_history.page_after, party_id, joined_at, after, limit)
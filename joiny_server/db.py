@@ -0,0 +1,41 @@
+"""
+Database connections for code that runs outside the request cycle.
+
+Django checks connections (CONN_MAX_AGE, CONN_HEALTH_CHECKS) and hands
+pooled ones back on request_started / request_finished. Socket.IO handlers
+and background tasks never fire those signals, so a worker thread that ran a
+query kept its connection forever: a dead one after a DB restart, or a pool
+slot no request could get. database_sync_to_async runs each call between
+two release_connections() so it starts from a checked connection and gives
+it back (to the pool, or closes it once CONN_MAX_AGE is over) when done.
+"""
+import functools
+
+from asgiref.sync import sync_to_async
+from django.db import connections
+
+
+def release_connections():
+    """
+    close_old_connections() for this thread, except connections inside an
+    atomic block: those belong to a transaction that is still running.
+    """
+    for connection in connections.all(initialized_only=True):
+        if not connection.in_atomic_block:
+            connection.close_if_unusable_or_obsolete()
+
+
+def database_sync_to_async(func=None, *, thread_sensitive=True, executor=None):
+    """sync_to_async that releases the thread's DB connections before and after the call."""
+    if func is None:
+        return functools.partial(database_sync_to_async, thread_sensitive=thread_sensitive, executor=executor)
+
+    @functools.wraps(func)
+    def call(*args, **kwargs):
+        release_connections()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            release_connections()
+
+    return sync_to_async(call, thread_sensitive=thread_sensitive, executor=executor)
@@ -0,0 +1,129 @@
+"""
+Location update coalescing for LocationNamespace.
+
+Instead of rebroadcasting every GPS ping to the whole room, each room keeps the
+latest position per user and emits one `location_batch` frame per tick.
+Pings that moved less than `min_distance_m` from the last position sent for
+that user are dropped.
+"""
+import asyncio
+import contextvars
+import math
+import time
+
+
+def distance_m(lat1, lng1, lat2, lng2):
+    """Great-circle distance in meters (haversine)."""
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * 6371000 * math.asin(math.sqrt(a))
+
+
+class LocationStats:
+    """Inbound vs outbound counters for location traffic."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.started_at = time.monotonic()
+        self.inbound = 0           # location_update messages received
+        self.dropped = 0           # below the movement threshold
+        self.coalesced = 0         # replaced by a newer ping before the tick
+        self.frames = 0            # location_batch frames emitted
+        self.deliveries = 0        # frames x room members
+
+    def snapshot(self):
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        return {
+            'inbound': self.inbound,
+            'dropped': self.dropped,
+            'coalesced': self.coalesced,
+            'frames': self.frames,
+            'deliveries': self.deliveries,
+            'inbound_per_sec': self.inbound / elapsed,
+            'outbound_per_sec': self.deliveries / elapsed,
+        }
+
+
+location_stats = LocationStats()
+
+
+class LocationCoalescer:
+    """
+    Per-room latest-position buffer flushed on a fixed tick.
+
+    `emit_batch(room, payload)` is awaited once per tick per room that has
+    updates and should return the number of clients the frame was sent to.
+    """
+
+    # Stop a room's tick task after this many empty ticks
+    idle_ticks = 30
+
+    def __init__(self, emit_batch, interval=1.0, min_distance_m=3.0, stats=location_stats):
+        self.emit_batch = emit_batch
+        self.interval = interval
+        self.min_distance_m = min_distance_m
+        self.stats = stats
+        self.latest = {}     # room -> {user_id: update}
+        self.last_sent = {}  # room -> {user_id: (lat, lng)}
+        self._tasks = {}     # room -> tick task
+
+    def push(self, room, user_id, data):
+        """Record a ping. Returns False if it was dropped by the movement threshold."""
+        self.stats.inbound += 1
+        lat, lng = float(data['lat']), float(data['lng'])
+
+        last = self.last_sent.get(room, {}).get(user_id)
+        if last is not None and distance_m(last[0], last[1], lat, lng) < self.min_distance_m:
+            self.stats.dropped += 1
+            return False
+
+        updates = self.latest.setdefault(room, {})
+        if user_id in updates:
+            self.stats.coalesced += 1
+        updates[user_id] = {**data, 'user_id': user_id, 'lat': lat, 'lng': lng}
+
+        task = self._tasks.get(room)
+        if task is None or task.done():
+            # Fresh context: started from a handler, it must not inherit that handler's metrics sample
+            self._tasks[room] = asyncio.create_task(self._tick(room), context=contextvars.Context())
+        return True
+
+    def forget(self, room, user_id):
+        """Drop state for a user leaving the room."""
+        self.latest.get(room, {}).pop(user_id, None)
+        self.last_sent.get(room, {}).pop(user_id, None)
+
+    async def _tick(self, room):
+        idle = 0
+        while idle < self.idle_ticks:
+            await asyncio.sleep(self.interval)
+            updates = self.latest.pop(room, None)
+            if not updates:
+                idle += 1
+                continue
+            idle = 0
+            await self.flush_room(room, updates)
+        self._tasks.pop(room, None)
+        self.last_sent.pop(room, None)
+
+    async def flush_room(self, room, updates):
+        sent = self.last_sent.setdefault(room, {})
+        for user_id, update in updates.items():
+            sent[user_id] = (update['lat'], update['lng'])
+        try:
+            recipients = await self.emit_batch(room, {'locations': list(updates.values())})
+        except Exception as e:
+            print(f"Failed to emit location batch to {room}: {e}")
+            return
+        self.stats.frames += 1
+        self.stats.deliveries += recipients or 0
+
+    async def close(self):
+        for task in list(self._tasks.values()):
+            task.cancel()
+        self._tasks.clear()
@@ -0,0 +1,396 @@
+"""
+Per-route and per-Socket.IO-event instrumentation.
+
+For every HTTP request (MetricsMiddleware) and every Socket.IO event
+(WireFormatNamespace.trigger_event) we record:
+
+    queries      SQL statements executed
+    db           time spent in the database driver
+    serializer   time spent producing serializer `.data`
+    duration     total handling time
+
+into in-process histograms, exposed in the Prometheus text format at
+GET /metrics. The current request/event is tracked with a contextvar, so
+queries run through sync_to_async threads are attributed to the handler
+that awaited them. Numbers are per worker process; a scraper aggregates
+workers.
+
+Database connections: every connection opened (or taken from the pool)
+counts in joiny_db_connections_opened_total, from Django's
+connection_created signal. With a connection pool its statistics (size,
+available, waiting requests, total wait time, time spent connecting) are
+exported as joiny_db_pool_* gauges on every scrape.
+
+No Django or DRF class is patched. The repo's serializers opt in to
+serializer timing (TimedSerializerMixin, timed_data), and the
+connection_created receiver is connected by install(), which
+MetricsMiddleware calls only when METRICS_ENABLED is on. Background tasks
+(chat buffer, location ticks, presence sweeper, party pushes) start in a
+fresh context so their queries are not charged to the handler that
+started them.
+
+Slow-request profiling: with PROFILE_SLOW_MS > 0, a PROFILE_SAMPLE_RATE
+fraction of requests run under cProfile, and the profile of each one
+slower than the threshold is written to PROFILE_DIR.
+"""
+import contextvars
+import cProfile
+import os
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse, HttpResponseForbidden
+
+SECONDS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class Sample:
+    """Counters for the request or event being handled."""
+    __slots__ = ('queries', 'db', 'serializer', '_serializer_depth')
+
+    def __init__(self):
+        self.queries = 0
+        self.db = 0.0
+        self.serializer = 0.0
+        self._serializer_depth = 0
+
+
+current = contextvars.ContextVar('joiny_metrics_sample', default=None)
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus semantics)."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.count += 1
+        self.sum += value
+
+
+class Registry:
+    """
+    Histograms and counters keyed by (metric name, label tuple), plus gauge
+    collectors: callables returning [(name, labels, value, help)] read at
+    render time.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.collectors = []
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.histograms = {}
+            self.counters = {}
+            self.help = {}
+
+    def observe(self, name, labels, value, buckets=SECONDS_BUCKETS, help_text=''):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(buckets)
+                self.help.setdefault(name, help_text)
+            histogram.observe(value)
+
+    def increment(self, name, labels, amount=1, help_text=''):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+            self.help.setdefault(name, help_text)
+
+    def record(self, prefix, labels, sample, duration):
+        self.observe(f'{prefix}_duration_seconds', labels, duration, help_text='Total handling time')
+        self.observe(f'{prefix}_queries', labels, sample.queries, QUERY_BUCKETS, 'SQL queries per call')
+        self.observe(f'{prefix}_db_seconds', labels, sample.db, help_text='Time spent in the database')
+        self.observe(f'{prefix}_serializer_seconds', labels, sample.serializer,
+                     help_text='Time spent building serializer data')
+
+    def render(self):
+        """Prometheus text exposition format."""
+        with self.lock:
+            items = sorted(self.histograms.items())
+            counters = sorted(self.counters.items())
+            help_texts = dict(self.help)
+        lines, seen = [], set()
+        for (name, labels), histogram in items:
+            if name not in seen:
+                seen.add(name)
+                lines.append(f'# HELP {name} {help_texts[name]}')
+                lines.append(f'# TYPE {name} histogram')
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                lines.append(f'{name}_bucket{format_labels(labels, le=bound)} {count}')
+            lines.append(f'{name}_bucket{format_labels(labels, le="+Inf")} {histogram.count}')
+            lines.append(f'{name}_sum{format_labels(labels)} {histogram.sum:.6f}')
+            lines.append(f'{name}_count{format_labels(labels)} {histogram.count}')
+        for (name, labels), value in counters:
+            if name not in seen:
+                seen.add(name)
+                lines.append(f'# HELP {name} {help_texts[name]}')
+                lines.append(f'# TYPE {name} counter')
+            lines.append(f'{name}{format_labels(labels)} {value}')
+        for collect in self.collectors:
+            for name, labels, value, help_text in collect():
+                if name not in seen:
+                    seen.add(name)
+                    lines.append(f'# HELP {name} {help_text}')
+                    lines.append(f'# TYPE {name} gauge')
+                lines.append(f'{name}{format_labels(sorted(labels.items()))} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+def format_labels(labels, **extra):
+    pairs = [*labels, *extra.items()]
+    if not pairs:
+        return ''
+    escaped = (f'{key}="{escape(value)}"' for key, value in pairs)
+    return '{' + ','.join(escaped) + '}'
+
+
+def escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+registry = Registry()
+
+
+# ----------------------------------------------------
+# Collection hooks
+# ----------------------------------------------------
+def record_query(execute, sql, params, many, context):
+    """connection.execute_wrappers hook: counts queries and DB time for the current sample."""
+    sample = current.get()
+    if sample is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        sample.queries += 1
+        sample.db += time.perf_counter() - start
+
+
+def install_query_hook(connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextmanager
+def serializing():
+    """Count the enclosed block as serializer time (nested blocks count once)."""
+    sample = current.get()
+    if sample is None:
+        yield
+        return
+    sample._serializer_depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        sample._serializer_depth -= 1
+        if sample._serializer_depth == 0:
+            sample.serializer += time.perf_counter() - start
+
+
+def timed_data(fget):
+    """Like @property, for a serializer's `data`: time spent in it counts as serializer time."""
+    def data(self):
+        with serializing():
+            return fget(self)
+    return property(data)
+
+
+class TimedSerializerMixin:
+    """
+    For DRF serializers: to_representation() counts as serializer time. A
+    many=True list calls it on its child once per item; nested serializers
+    count once.
+    """
+
+    def to_representation(self, instance):
+        with serializing():
+            return super().to_representation(instance)
+
+
+@contextmanager
+def observe(prefix, labels):
+    """Record one request/event: sets the sample for everything run inside the block."""
+    for connection in connections.all():
+        install_query_hook(connection)
+    sample = Sample()
+    token = current.set(sample)
+    start = time.perf_counter()
+    try:
+        yield sample
+    finally:
+        duration = time.perf_counter() - start
+        current.reset(token)
+        registry.record(prefix, labels, sample, duration)
+
+
+# ----------------------------------------------------
+# Database connections
+# ----------------------------------------------------
+def count_connection(sender, connection, **kwargs):
+    """connection_created receiver: query hook for the new connection, and the opened-connections counter."""
+    install_query_hook(connection)
+    registry.increment('joiny_db_connections_opened_total', {'alias': connection.alias},
+                       help_text='DB connections opened or taken from the pool')
+
+
+_install_lock = threading.Lock()
+_installed = False
+
+
+def install():
+    """
+    Connect the connection_created receiver (covers connections opened from now
+    on in any thread, e.g. sync_to_async workers). Runs once per process; see
+    MetricsMiddleware.
+    """
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        connection_created.connect(count_connection, dispatch_uid='joiny_metrics_connection_created')
+        _installed = True
+
+
+POOL_STATS = {
+    'pool_size': 'Connections in the pool (busy + idle)',
+    'pool_available': 'Idle connections in the pool',
+    'requests_waiting': 'Requests waiting for a connection',
+    'requests_num': 'Connections requested from the pool',
+    'requests_queued': 'Requests that had to wait for a connection',
+    'requests_wait_ms': 'Total time requests waited for a connection (ms)',
+    'requests_errors': 'Requests that timed out waiting for a connection',
+    'connections_num': 'Connections opened by the pool',
+    'connections_ms': 'Total time spent opening connections (ms)',
+    'returns_bad': 'Connections returned broken',
+}
+
+
+def pool_stats():
+    """Gauge collector: psycopg_pool statistics for every alias with a pool."""
+    for alias in connections:
+        if not connections.settings[alias].get('OPTIONS', {}).get('pool'):
+            continue
+        pool = getattr(connections[alias], 'pool', None)
+        if pool is None:
+            continue
+        stats = pool.get_stats()
+        for key, help_text in POOL_STATS.items():
+            yield f'joiny_db_pool_{key}', {'alias': alias}, stats.get(key, 0), help_text
+
+
+registry.collectors.append(pool_stats)
+
+
+# ----------------------------------------------------
+# HTTP
+# ----------------------------------------------------
+class SlowRequestProfiler:
+    """Profiles a sample of requests and keeps the profiles of slow ones."""
+
+    def __init__(self, threshold_ms, sample_rate, directory):
+        self.threshold = threshold_ms / 1000
+        self.sample_rate = sample_rate
+        self.directory = directory
+        # cProfile can't nest; one profiled request at a time per process
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls):
+        if settings.PROFILE_SLOW_MS <= 0:
+            return None
+        return cls(settings.PROFILE_SLOW_MS, settings.PROFILE_SAMPLE_RATE, settings.PROFILE_DIR)
+
+    def run(self, get_response, request):
+        if random.random() >= self.sample_rate or not self.lock.acquire(blocking=False):
+            return get_response(request)
+        profile = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            response = profile.runcall(get_response, request)
+        finally:
+            self.lock.release()
+        elapsed = time.perf_counter() - start
+        if elapsed >= self.threshold:
+            self.dump(profile, route_name(request), elapsed)
+        return response
+
+    def dump(self, profile, route, elapsed):
+        os.makedirs(self.directory, exist_ok=True)
+        name = re.sub(r'[^A-Za-z0-9_.-]+', '_', route)
+        path = os.path.join(self.directory, f'{time.strftime("%Y%m%d-%H%M%S")}-{name}-{elapsed * 1000:.0f}ms.prof')
+        profile.dump_stats(path)
+        return path
+
+
+class MetricsMiddleware:
+    """
+    Records query count, DB time, serializer time and latency per route.
+    Routes are labelled with the URL name (e.g. event-detail), so ids in
+    the path don't create new series. Put it first in MIDDLEWARE.
+    """
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        install()
+        self.get_response = get_response
+        self.profiler = SlowRequestProfiler.from_settings()
+
+    def __call__(self, request):
+        if request.path == '/metrics':
+            return self.get_response(request)
+        labels = {'method': request.method, 'route': 'unmatched', 'status': '500'}
+        with observe('joiny_http_request', labels):
+            try:
+                if self.profiler is not None:
+                    response = self.profiler.run(self.get_response, request)
+                else:
+                    response = self.get_response(request)
+            finally:
+                labels['route'] = route_name(request)
+            labels['status'] = str(response.status_code)
+        return response
+
+
+def route_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return match.view_name or match.route
+
+
+def metrics_view(request):
+    """
+    GET /metrics (Prometheus text format).
+    Requires `Authorization: Bearer <METRICS_TOKEN>`; without a token it is
+    only served when DEBUG is on.
+    """
+    token = settings.METRICS_TOKEN
+    if token:
+        if request.headers.get('Authorization', '') != f'Bearer {token}':
+            return HttpResponseForbidden()
+    elif not settings.DEBUG:
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,171 @@
+"""
+Push model changes to the `/party` Socket.IO namespace.
+
+Django signals turn Event, Participant and Todo changes into compact delta
+events for the `party_{id}` room, so clients in a party screen no longer poll
+the REST endpoints:
+
+    participant_joined  { party_id, participant }
+    participant_left    { party_id, participant_id, user }
+    todo_updated        { party_id, todo, created }
+    todo_deleted        { party_id, todo_id }
+    event_updated       { party_id, event }   (changed fields only when known)
+    event_deleted       { party_id }
+
+`participant` and `todo` use the REST serializers, so the shape matches what
+the client already has. Deltas are sent after the surrounding transaction
+commits. Signals fire in the worker threads that run sync views, so the emit
+is handed to the event loop with run_coroutine_threadsafe. Processes without
+a running Socket.IO server (management commands, shell) skip publishing.
+"""
+import asyncio
+import contextvars
+import functools
+import time
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.models import Event, Participant, Todo
+from core.serializers import EventSerializer, ParticipantSerializer, TodoSerializer
+from core.signals import participants_bulk_created
+
+# EventSerializer fields that can be rendered without a query or a request
+EVENT_DELTA_FIELDS = [name for name in EventSerializer.Meta.fields if name not in ('members', 'invite_url')]
+
+
+class PushStats:
+    """Counters for pushed deltas."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.started_at = time.monotonic()
+        self.published = 0   # deltas handed to the event loop
+        self.skipped = 0     # no Socket.IO server in this process
+        self.by_event = {}
+
+    def snapshot(self):
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        return {
+            'published': self.published,
+            'skipped': self.skipped,
+            'by_event': dict(self.by_event),
+            'published_per_sec': self.published / elapsed,
+        }
+
+
+class PartyPublisher:
+    """
+    Sends deltas to party rooms from sync code.
+
+    `start(emit)` is called on ASGI startup with the running loop;
+    `emit(event, party_id, payload)` is a coroutine function (PartyNamespace.push).
+    """
+
+    def __init__(self):
+        self.loop = None
+        self.emit = None
+        self.stats = PushStats()
+
+    def start(self, emit):
+        self.loop = asyncio.get_running_loop()
+        self.emit = emit
+
+    def stop(self):
+        self.loop = None
+        self.emit = None
+
+    def publish(self, party_id, event, build):
+        """
+        Queue a delta for party_{party_id}, sent once the current transaction commits.
+        build() returns the payload; it is only called when there is a server to send to.
+        """
+        if self.loop is None:
+            self.stats.skipped += 1
+            return
+        payload = {'party_id': str(party_id), **build()}
+        transaction.on_commit(lambda: self.send(party_id, event, payload))
+
+    def send(self, party_id, event, payload):
+        loop = self.loop
+        if loop is None or loop.is_closed():
+            self.stats.skipped += 1
+            return
+        coro = self.emit(event, party_id, payload)
+        # Fresh context, so the emit isn't counted in the request's metrics sample
+        create_task = functools.partial(loop.create_task, coro, context=contextvars.Context())
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            create_task()
+        else:
+            loop.call_soon_threadsafe(create_task)
+        self.stats.published += 1
+        self.stats.by_event[event] = self.stats.by_event.get(event, 0) + 1
+
+
+party_publisher = PartyPublisher()
+
+
+def participant_payload(participant):
+    return lambda: {'participant': dict(ParticipantSerializer(participant).data)}
+
+
+# ----------------------------------------------------
+# Signal receivers
+# ----------------------------------------------------
+@receiver(post_save, sender=Participant, dispatch_uid='party_push_participant_saved')
+def push_participant_saved(sender, instance, created, **kwargs):
+    if created:
+        party_publisher.publish(instance.event_id, 'participant_joined', participant_payload(instance))
+
+
+@receiver(participants_bulk_created, dispatch_uid='party_push_participants_bulk_created')
+def push_participants_bulk_created(sender, participants, **kwargs):
+    for participant in participants:
+        party_publisher.publish(participant.event_id, 'participant_joined', participant_payload(participant))
+
+
+@receiver(post_delete, sender=Participant, dispatch_uid='party_push_participant_deleted')
+def push_participant_deleted(sender, instance, **kwargs):
+    party_publisher.publish(instance.event_id, 'participant_left', lambda: {
+        'participant_id': instance.id,
+        'user': instance.user_id,
+    })
+
+
+@receiver(post_save, sender=Todo, dispatch_uid='party_push_todo_saved')
+def push_todo_saved(sender, instance, created, **kwargs):
+    party_publisher.publish(instance.event_id, 'todo_updated', lambda: {
+        'todo': dict(TodoSerializer(instance).data),
+        'created': created,
+    })
+
+
+@receiver(post_delete, sender=Todo, dispatch_uid='party_push_todo_deleted')
+def push_todo_deleted(sender, instance, **kwargs):
+    party_publisher.publish(instance.event_id, 'todo_deleted', lambda: {'todo_id': instance.id})
+
+
+@receiver(post_save, sender=Event, dispatch_uid='party_push_event_saved')
+def push_event_saved(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        return  # nobody is in the room yet
+    fields = EVENT_DELTA_FIELDS
+    if update_fields is not None:
+        fields = ['id', *(name for name in EVENT_DELTA_FIELDS if name in update_fields)]
+        if 'participant_count' in fields or 'max_members' in fields:
+            fields.append('spots_left')
+    party_publisher.publish(instance.pk, 'event_updated', lambda: {
+        'event': dict(EventSerializer(instance, fields=fields).data),
+    })
+
+
+@receiver(post_delete, sender=Event, dispatch_uid='party_push_event_deleted')
+def push_event_deleted(sender, instance, **kwargs):
+    party_publisher.publish(instance.pk, 'event_deleted', dict)
@@ -0,0 +1,196 @@
+"""
+Who is online in each party, for ChatNamespace.
+
+PresenceRegistry maps sid -> (user, parties) and party -> {user: sids}, so
+joining, leaving and disconnecting are O(1) per party and a user with two
+tabs stays online until the last one goes. Every change returns the
+online/offline transitions it caused; the namespace sends them to the
+party_{id} room as `presence` diffs.
+
+Heartbeats: any event from a socket (or an explicit `heartbeat`) marks it
+seen. Sockets silent for longer than `timeout` (an app in the background,
+a half-open connection the ping hasn't caught yet) are expired: their user
+goes offline, and comes back online on the socket's next event.
+
+State is per worker process. With several workers (SOCKETIO_MANAGER_URL)
+each one knows only its own sockets: its counts would be partial, and it
+would send `offline` when a user's last socket on *this* worker closes even
+though the user is still online on another one. So presence is only
+available() on a single worker; otherwise the chat namespace doesn't track
+or send it and GET /api/events/online/ answers 501.
+"""
+import asyncio
+import contextvars
+import time
+from collections import defaultdict
+
+from django.conf import settings
+
+
+class PresenceRegistry:
+    """Online users per party for one worker. Changed only on the event loop; counts() is safe from any thread."""
+
+    def __init__(self, timeout=60.0, clock=time.monotonic):
+        self.timeout = timeout
+        self.clock = clock
+        self.sockets = {}  # sid -> {'user_id', 'parties': set, 'seen', 'expired'}
+        self.parties = {}  # party_id -> {user_id: set of sids}
+
+    # -- transitions: each returns the (party_id, user_id) pairs it changed
+
+    def join(self, sid, party_id, user_id):
+        """
+        (online, offline) transitions. online is this party, plus the socket's
+        other parties if it had expired; offline is non-empty only when an
+        anonymous socket joins as a different user_id than before.
+        """
+        party_id, user_id = str(party_id), str(user_id)
+        socket = self.sockets.get(sid)
+        offline = []
+        if socket is not None and socket['user_id'] != user_id:
+            offline = self.disconnect(sid)
+            socket = None
+        if socket is None:
+            socket = self.sockets[sid] = {'user_id': user_id, 'parties': set(), 'seen': self.clock(), 'expired': False}
+        changes = self.touch(sid)
+        if party_id not in socket['parties']:
+            socket['parties'].add(party_id)
+            if self._add(party_id, user_id, sid):
+                changes.append((party_id, user_id))
+        return changes, offline
+
+    def leave(self, sid, party_id):
+        """[(party_id, user_id)] that went offline."""
+        party_id = str(party_id)
+        socket = self.sockets.get(sid)
+        if socket is None or party_id not in socket['parties']:
+            return []
+        socket['parties'].discard(party_id)
+        if socket['expired'] or not self._remove(party_id, socket['user_id'], sid):
+            return []
+        return [(party_id, socket['user_id'])]
+
+    def disconnect(self, sid):
+        """[(party_id, user_id)] that went offline."""
+        socket = self.sockets.pop(sid, None)
+        if socket is None or socket['expired']:
+            return []
+        return [
+            (party_id, socket['user_id']) for party_id in socket['parties']
+            if self._remove(party_id, socket['user_id'], sid)
+        ]
+
+    def touch(self, sid):
+        """Heartbeat. [(party_id, user_id)] that came back online if the socket had expired."""
+        socket = self.sockets.get(sid)
+        if socket is None:
+            return []
+        socket['seen'] = self.clock()
+        if not socket['expired']:
+            return []
+        socket['expired'] = False
+        return [
+            (party_id, socket['user_id']) for party_id in socket['parties']
+            if self._add(party_id, socket['user_id'], sid)
+        ]
+
+    def expire(self):
+        """[(party_id, user_id)] that went offline because their sockets stopped sending."""
+        deadline = self.clock() - self.timeout
+        changes = []
+        for sid, socket in self.sockets.items():
+            if socket['expired'] or socket['seen'] >= deadline:
+                continue
+            socket['expired'] = True
+            changes += [
+                (party_id, socket['user_id']) for party_id in socket['parties']
+                if self._remove(party_id, socket['user_id'], sid)
+            ]
+        return changes
+
+    # -- queries
+
+    def is_online(self, party_id, user_id):
+        return str(user_id) in self.parties.get(str(party_id), ())
+
+    def online(self, party_id):
+        return sorted(self.parties.get(str(party_id), ()))
+
+    def counts(self, party_ids):
+        """{party_id: online member count}"""
+        return {str(party_id): len(self.parties.get(str(party_id), ())) for party_id in party_ids}
+
+    # -- internals
+
+    def _add(self, party_id, user_id, sid):
+        users = self.parties.setdefault(party_id, {})
+        sids = users.setdefault(user_id, set())
+        sids.add(sid)
+        return len(sids) == 1
+
+    def _remove(self, party_id, user_id, sid):
+        users = self.parties.get(party_id)
+        sids = users.get(user_id) if users else None
+        if not sids or sid not in sids:
+            return False
+        sids.discard(sid)
+        if sids:
+            return False
+        del users[user_id]
+        if not users:
+            del self.parties[party_id]
+        return True
+
+
+def available():
+    """False when rooms are shared across workers (see the module docstring)."""
+    return not settings.SOCKETIO_MANAGER_URL
+
+
+def diffs(online=(), offline=()):
+    """Group transitions into one presence payload per party."""
+    payloads = defaultdict(lambda: {'online': [], 'offline': []})
+    for party_id, user_id in online:
+        payloads[party_id]['online'].append(user_id)
+    for party_id, user_id in offline:
+        payloads[party_id]['offline'].append(user_id)
+    return {party_id: {'party_id': party_id, **payload} for party_id, payload in payloads.items()}
+
+
+class PresenceSweeper:
+    """
+    Runs registry.expire() every timeout / 2 seconds while anyone is online
+    and passes the offline transitions to `emit_offline(changes)`.
+    """
+
+    def __init__(self, registry, emit_offline):
+        self.registry = registry
+        self.emit_offline = emit_offline
+        self._task = None
+
+    def start(self):
+        if self.registry.timeout > 0 and (self._task is None or self._task.done()):
+            # Fresh context: started from a handler, it must not inherit that handler's metrics sample
+            self._task = asyncio.create_task(self._run(), context=contextvars.Context())
+
+    async def _run(self):
+        while self.registry.sockets:
+            await asyncio.sleep(self.registry.timeout / 2)
+            changes = self.registry.expire()
+            if changes:
+                try:
+                    await self.emit_offline(changes)
+                except Exception as e:
+                    print(f"Failed to emit presence: {e}")
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+presence = PresenceRegistry(timeout=settings.PRESENCE_TIMEOUT)
@@ -0,0 +1,265 @@
+"""
+Cross-process client managers for the Socket.IO server.
+
+With the default in-memory manager every uvicorn worker has its own rooms, so
+`party_{id}` splits across workers. These managers relay emits and room
+operations through a shared channel so a room works across processes and hosts.
+Selected with SOCKETIO_MANAGER_URL:
+
+    ''                          in-memory (single worker, default)
+    'postgres'                  Postgres LISTEN/NOTIFY on DATABASES['default']
+    'unix:///tmp/joiny-sio.sock' local broker (`python -m joiny_server.pubsub /tmp/joiny-sio.sock`)
+    'redis://host:6379/0'       python-socketio's AsyncRedisManager (needs the redis package)
+"""
+import asyncio
+import base64
+import os
+import struct
+import threading
+
+import socketio
+from engineio import json
+from socketio.async_pubsub_manager import AsyncPubSubManager
+
+FRAME_HEADER = struct.Struct('!I')
+
+# Relayed messages are JSON; binary payloads (wire.py frames) travel as {BYTES_TAG: base64}
+BYTES_TAG = '__bytes__'
+
+
+def encode_payload(value):
+    """JSON-safe copy of a relayed message: bytes anywhere inside become tagged base64 strings."""
+    if isinstance(value, (bytes, bytearray)):
+        return {BYTES_TAG: base64.b64encode(value).decode('ascii')}
+    if isinstance(value, dict):
+        return {key: encode_payload(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [encode_payload(item) for item in value]
+    return value
+
+
+def decode_payload(value):
+    """Inverse of encode_payload."""
+    if isinstance(value, dict):
+        if len(value) == 1 and BYTES_TAG in value:
+            return base64.b64decode(value[BYTES_TAG])
+        return {key: decode_payload(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [decode_payload(item) for item in value]
+    return value
+
+
+# ----------------------------------------------------
+# Postgres LISTEN/NOTIFY
+# ----------------------------------------------------
+class PostgresPubSubManager(AsyncPubSubManager):
+    """
+    Relays messages with NOTIFY on a Postgres channel, using the psycopg2
+    driver the app already depends on. NOTIFY payloads are limited to 8000
+    bytes; larger emits are dropped for remote workers and logged.
+    """
+    name = 'postgres'
+    max_payload = 7999
+
+    def __init__(self, connect_kwargs, channel='socketio', write_only=False, logger=None):
+        super().__init__(channel=channel, write_only=write_only, logger=logger)
+        self.connect_kwargs = connect_kwargs
+        self._publish_conn = None
+        self._publish_lock = threading.Lock()
+
+    def _connect(self):
+        import psycopg2
+
+        conn = psycopg2.connect(**self.connect_kwargs)
+        conn.autocommit = True
+        return conn
+
+    def _notify(self, payload):
+        with self._publish_lock:
+            if self._publish_conn is None or self._publish_conn.closed:
+                self._publish_conn = self._connect()
+            try:
+                with self._publish_conn.cursor() as cursor:
+                    cursor.execute('SELECT pg_notify(%s, %s)', (self.channel, payload))
+            except Exception:
+                # Reconnect on the next publish
+                self._publish_conn.close()
+                raise
+
+    async def _publish(self, data):
+        payload = json.dumps(encode_payload(data))
+        if len(payload.encode('utf-8')) > self.max_payload:
+            self._get_logger().error(
+                'pubsub message too large for NOTIFY (%s), not relayed', data.get('method'))
+            return
+        await asyncio.get_running_loop().run_in_executor(None, self._notify, payload)
+
+    async def _listen(self):
+        from psycopg2 import sql
+
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                conn = await loop.run_in_executor(None, self._connect)
+            except Exception as e:
+                self._get_logger().error('Cannot connect to Postgres for pubsub: %s', e)
+                await asyncio.sleep(1)
+                continue
+
+            queue = asyncio.Queue()
+
+            def on_readable():
+                try:
+                    conn.poll()
+                except Exception as e:
+                    queue.put_nowait(e)
+                    return
+                while conn.notifies:
+                    queue.put_nowait(conn.notifies.pop(0).payload)
+
+            with conn.cursor() as cursor:
+                cursor.execute(sql.SQL('LISTEN {}').format(sql.Identifier(self.channel)))
+            loop.add_reader(conn.fileno(), on_readable)
+            try:
+                while True:
+                    message = await queue.get()
+                    if isinstance(message, Exception):
+                        self._get_logger().error('Postgres pubsub connection lost: %s', message)
+                        break
+                    try:
+                        data = decode_payload(json.loads(message))
+                    except ValueError:
+                        self._get_logger().error('invalid pubsub payload, ignored')
+                        continue
+                    yield data
+            finally:
+                loop.remove_reader(conn.fileno())
+                conn.close()
+            await asyncio.sleep(1)
+
+
+# ----------------------------------------------------
+# Unix socket broker (single host, no external services)
+# ----------------------------------------------------
+# Frames are length-prefixed JSON, like the NOTIFY payloads above: a frame is
+# never unpickled, so a process that can reach the socket can't run code in
+# the workers. The socket itself is owner-only (0600).
+async def write_frame(writer, payload):
+    writer.write(FRAME_HEADER.pack(len(payload)) + payload)
+    await writer.drain()
+
+
+async def read_frame(reader):
+    header = await reader.readexactly(FRAME_HEADER.size)
+    return await reader.readexactly(FRAME_HEADER.unpack(header)[0])
+
+
+async def run_broker(path):
+    """Fan every frame received from one worker out to all connected workers."""
+    clients = set()
+
+    async def handle(reader, writer):
+        clients.add(writer)
+        try:
+            while True:
+                payload = await read_frame(reader)
+                frame = FRAME_HEADER.pack(len(payload)) + payload
+                for client in list(clients):
+                    client.write(frame)
+                await asyncio.gather(*(c.drain() for c in list(clients)), return_exceptions=True)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            clients.discard(writer)
+            writer.close()
+
+    if os.path.exists(path):
+        os.unlink(path)  # stale socket from a previous run
+    server = await asyncio.start_unix_server(handle, path)
+    os.chmod(path, 0o600)
+    async with server:
+        await server.serve_forever()
+
+
+class UnixSocketPubSubManager(AsyncPubSubManager):
+    """Relays messages through the local broker started by `run_broker`."""
+    name = 'unix'
+
+    def __init__(self, path, channel='socketio', write_only=False, logger=None):
+        super().__init__(channel=channel, write_only=write_only, logger=logger)
+        self.path = path
+        self._writer = None
+        self._connect_lock = None
+
+    async def _publisher(self):
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self._writer is None or self._writer.is_closing():
+                _, self._writer = await asyncio.open_unix_connection(self.path)
+            return self._writer
+
+    async def _publish(self, data):
+        payload = json.dumps({'channel': self.channel, 'data': encode_payload(data)}).encode('utf-8')
+        try:
+            await write_frame(await self._publisher(), payload)
+        except (OSError, ConnectionError):
+            self._writer = None
+            # Retry once on a fresh connection
+            await write_frame(await self._publisher(), payload)
+
+    async def _listen(self):
+        while True:
+            try:
+                reader, writer = await asyncio.open_unix_connection(self.path)
+            except OSError as e:
+                self._get_logger().error('Cannot connect to pubsub broker %s: %s', self.path, e)
+                await asyncio.sleep(1)
+                continue
+            try:
+                while True:
+                    try:
+                        frame = json.loads(await read_frame(reader))
+                    except ValueError:
+                        self._get_logger().error('invalid pubsub frame, ignored')
+                        continue
+                    # Yield the decoded dict: the base class would unpickle a bytes message
+                    if isinstance(frame, dict) and frame.get('channel') == self.channel:
+                        yield decode_payload(frame.get('data'))
+            except (asyncio.IncompleteReadError, ConnectionError):
+                self._get_logger().error('pubsub broker connection lost')
+            finally:
+                writer.close()
+            await asyncio.sleep(1)
+
+
+def client_manager_from_settings():
+    """Build the Socket.IO client manager selected by settings.SOCKETIO_MANAGER_URL."""
+    from django.conf import settings
+
+    url = settings.SOCKETIO_MANAGER_URL
+    channel = settings.SOCKETIO_CHANNEL
+    if not url:
+        return None
+    if url == 'postgres':
+        db = settings.DATABASES['default']
+        return PostgresPubSubManager({
+            'dbname': db['NAME'],
+            'user': db['USER'],
+            'password': db['PASSWORD'],
+            'host': db['HOST'],
+            'port': db['PORT'],
+        }, channel=channel)
+    if url.startswith('unix://'):
+        return UnixSocketPubSubManager(url[len('unix://'):], channel=channel)
+    if url.startswith(('redis://', 'rediss://')):
+        return socketio.AsyncRedisManager(url, channel=channel)
+    raise ValueError(f'Unsupported SOCKETIO_MANAGER_URL: {url}')
+
+
+if __name__ == '__main__':
+    import sys
+
+    socket_path = sys.argv[1] if len(sys.argv) > 1 else '/tmp/joiny-sio.sock'
+    print(f"Socket.IO pubsub broker listening on {socket_path}")
+    asyncio.run(run_broker(socket_path))
@@ -10,10 +10,13 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import importlib.util
 import os
 from pathlib import Path
 from dotenv import load_dotenv
 
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
 load_dotenv()
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -54,7 +57,17 @@ INSTALLED_APPS = [
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
-    )
+    ),
+    # orjson 기반 JSON 렌더러/파서 (core/renderers.py, core/parsers.py)
+    'DEFAULT_RENDERER_CLASSES': (
+        'core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'core.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
 from datetime import timedelta
@@ -66,6 +79,8 @@ SIMPLE_JWT = {
 }
 
 MIDDLEWARE = [
+    # 요청별 쿼리 수 / DB 시간 / 직렬화 시간 / 지연 시간 수집 (맨 앞에 두어 전체 시간을 잽니다)
+    'joiny_server.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -126,18 +141,124 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD', '1234'),
         'HOST': os.getenv('DB_HOST', 'localhost'),
         'PORT': os.getenv('DB_PORT', '5432'),
+        # 연결을 재사용하기 전에 살아 있는지 확인 (DB 재시작 후 끊긴 연결로 요청이 실패하지 않도록)
+        'CONN_HEALTH_CHECKS': True,
+    }
+}
+
+# DB 커넥션 풀 (psycopg 3 + psycopg_pool 필요, DB_POOL_MAX_SIZE=0 이면 사용 안 함)
+# ASGI 에서는 요청마다 다른 스레드에서 뷰가 돌아 스레드별 영구 연결(CONN_MAX_AGE)이 재사용되지 않으므로
+# 풀이 기본입니다. 풀을 쓸 수 없으면 DB_CONN_MAX_AGE 초 동안 연결을 유지합니다. (Socket.IO 핸들러 스레드)
+DB_POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', '2'))
+DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', '10'))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '10'))  # 초, 풀에서 연결을 기다리는 최대 시간
+DB_CONN_MAX_AGE = int(os.getenv('DB_CONN_MAX_AGE', '60'))
+
+if DB_POOL_MAX_SIZE > 0 and all(importlib.util.find_spec(m) for m in ('psycopg', 'psycopg_pool')):
+    from psycopg_pool import ConnectionPool
+
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': DB_POOL_MIN_SIZE,
+            'max_size': DB_POOL_MAX_SIZE,
+            'timeout': DB_POOL_TIMEOUT,
+            # 풀에서 꺼낼 때 연결 상태 확인
+            'check': ConnectionPool.check_connection,
+        },
+    }
+else:
+    DATABASES['default']['CONN_MAX_AGE'] = DB_CONN_MAX_AGE
+
+
+# Cache
+# 초대 코드 조회/이벤트 상세 캐시의 2단계로 사용됩니다. (locmem, file, redis 등 교체 가능)
+# locmem 은 워커마다 따로이므로 워커가 여럿이면 redis 등 공유 백엔드를 쓰세요. (locmem 이면 2단계 TTL = 로컬 TTL, core/cache.py)
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'joiny-cache'),
     }
 }
 
+EVENT_CACHE = {
+    'ALIAS': os.getenv('EVENT_CACHE_ALIAS', 'default'),
+    'LOCAL_MAX_SIZE': int(os.getenv('EVENT_CACHE_LOCAL_MAX_SIZE', '2048')),
+    'LOCAL_TTL': float(os.getenv('EVENT_CACHE_LOCAL_TTL', '5')),  # 초, 프로세스 로컬 LRU
+    'SHARED_TTL': int(os.getenv('EVENT_CACHE_SHARED_TTL', '300')),  # 초, 공유 캐시
+}
+
+# 테마 목록 프로세스 캐시 유지 시간 (초, 이 프로세스에서 Theme 이 바뀌면 즉시 비움)
+THEME_CACHE_TTL = float(os.getenv('THEME_CACHE_TTL', '300'))
+
+# Chat persistence (write-behind batching in joiny_server/chat_buffer.py)
+CHAT_BUFFER = {
+    'BATCH_SIZE': int(os.getenv('CHAT_BUFFER_BATCH_SIZE', '100')),
+    'FLUSH_INTERVAL': float(os.getenv('CHAT_BUFFER_FLUSH_INTERVAL', '0.2')),  # 초
+    'MAX_PENDING': int(os.getenv('CHAT_BUFFER_MAX_PENDING', '5000')),  # 초과 시 대기(back-pressure)
+}
+
+# Socket.IO 핸들러의 DB 호출 전용 스레드 수 (joiny_server/data.py)
+# 스레드마다 DB 연결을 하나씩 쓰므로 DB_POOL_MAX_SIZE 이하로. 0 이면 Django 공용 스레드 하나에서 실행
+DB_EXECUTOR_WORKERS = int(os.getenv('DB_EXECUTOR_WORKERS', '8'))
+
+# chat_history 한 페이지당 메시지 수
+CHAT_HISTORY_PAGE_SIZE = int(os.getenv('CHAT_HISTORY_PAGE_SIZE', '50'))
+
+# Location coalescing (joiny_server/location.py)
+LOCATION_TICK_INTERVAL = float(os.getenv('LOCATION_TICK_INTERVAL', '1.0'))  # 초, 방마다 location_batch 전송 주기
+LOCATION_MIN_DISTANCE_M = float(os.getenv('LOCATION_MIN_DISTANCE_M', '3'))  # 미터, 이보다 적게 움직이면 무시
+
+# 계측 (joiny_server/metrics.py, GET /metrics 에 Prometheus 형식으로 노출)
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True') == 'True'
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')  # Authorization: Bearer <token>, 비어 있으면 DEBUG 에서만 공개
+PROFILE_SLOW_MS = float(os.getenv('PROFILE_SLOW_MS', '0'))  # 밀리초, 이보다 느린 요청의 cProfile 저장 (0 이면 끔)
+PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', '0.01'))  # 프로파일링할 요청 비율
+PROFILE_DIR = os.getenv('PROFILE_DIR', '/tmp/joiny-profiles')
+
+# 접속 상태 (joiny_server/presence.py)
+PRESENCE_TIMEOUT = float(os.getenv('PRESENCE_TIMEOUT', '60'))  # 초, 이 시간 동안 이벤트/heartbeat 가 없으면 offline (0 이면 만료 안 함)
+
+# 지난 파티 보관 처리 (core/archive.py, joiny_server/archiver.py)
+ARCHIVE_AFTER_DAYS = int(os.getenv('ARCHIVE_AFTER_DAYS', '30'))  # 일, 파티 날짜가 이보다 오래되면 보관
+ARCHIVE_INTERVAL = float(os.getenv('ARCHIVE_INTERVAL', '3600'))  # 초, ASGI 워커의 보관 작업 주기 (0 이면 끔)
+
+# Socket.IO 멀티 워커 pub/sub (joiny_server/pubsub.py)
+# '' (단일 워커), 'postgres', 'unix:///tmp/joiny-sio.sock', 'redis://...'
+SOCKETIO_MANAGER_URL = os.getenv('SOCKETIO_MANAGER_URL', '')
+SOCKETIO_CHANNEL = os.getenv('SOCKETIO_CHANNEL', 'joiny_socketio')
+# JWT 없이 연결하는 Socket.IO 클라이언트를 거부합니다. (joiny_server/socket_auth.py)
+# 토큰을 보내지 않는 이전 클라이언트를 받아야 하면 False (익명 연결의 채팅은 파티 회원의 user_id 일 때만 저장)
+SOCKETIO_REQUIRE_AUTH = os.getenv('SOCKETIO_REQUIRE_AUTH', 'True') == 'True'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
 # Authentication Backends
+# EmailBackend 가 이메일 / 사용자 이름 로그인을 쿼리 한 번으로 모두 처리합니다. (ModelBackend 상속, 권한 확인도 동일)
 AUTHENTICATION_BACKENDS = [
-    'core.authentication.EmailBackend',  # 이메일 로그인 지원
-    'django.contrib.auth.backends.ModelBackend', # 기본 사용자 이름 로그인 지원
+    'core.authentication.EmailBackend',  # 이메일 + 사용자 이름 로그인 지원
+]
+
+# 비밀번호 해시 프로필 (로그인이 몰릴 때 CPU 비용 조절)
+# 'default' : Django 기본 (PBKDF2-SHA256, Django 권장 반복 횟수)
+# 'pbkdf2'  : PBKDF2-SHA256, 반복 횟수 = PASSWORD_PBKDF2_ITERATIONS
+# 'bcrypt'  : bcrypt-SHA256 (bcrypt 패키지 필요)
+# 어떤 프로필이든 다른 방식으로 저장된 기존 비밀번호도 검증되며, 로그인 시 선택한 방식으로 다시 저장됩니다.
+PASSWORD_HASH_PROFILE = os.getenv('PASSWORD_HASH_PROFILE', 'default')
+# 기본값은 설치된 Django 의 기본 반복 횟수 (Django 5.2: 1,000,000). 낮추면 로그인마다 해시가 그 값으로 다시 저장됩니다.
+PASSWORD_PBKDF2_ITERATIONS = int(os.getenv('PASSWORD_PBKDF2_ITERATIONS', PBKDF2PasswordHasher.iterations))
+_FALLBACK_HASHERS = [
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
 ]
+if PASSWORD_HASH_PROFILE == 'pbkdf2':
+    PASSWORD_HASHERS = ['core.hashers.ConfigurablePBKDF2PasswordHasher'] + _FALLBACK_HASHERS
+elif PASSWORD_HASH_PROFILE == 'bcrypt':
+    PASSWORD_HASHERS = ['django.contrib.auth.hashers.BCryptSHA256PasswordHasher'] + _FALLBACK_HASHERS
 
 AUTH_PASSWORD_VALIDATORS = [
 
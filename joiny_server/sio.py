@@ -1,19 +1,106 @@
+import struct
+import uuid
+
 import socketio
+from django.conf import settings
+
+from . import chat_history, metrics, socket_auth, wire
+from . import data as db_data  # handlers take a `data` payload argument
+from .location import LocationCoalescer
+from .pubsub import client_manager_from_settings
 
 # create a Socket.IO server
-# create a Socket.IO server
-# create a Socket.IO server
-sio = socketio.AsyncServer(async_mode='asgi', cors_allowed_origins=[
+# Rooms are shared across workers when SOCKETIO_MANAGER_URL selects a pub/sub manager
+sio = socketio.AsyncServer(async_mode='asgi', client_manager=client_manager_from_settings(), cors_allowed_origins=[
     '*', 
     'https://estell-supereffective-selena.ngrok-free.dev',
     'http://localhost:3000',
 ])
 
-class LocationNamespace(socketio.AsyncNamespace):
-    async def on_connect(self, sid, environ):
-        print(f"Location Client connected: {sid}")
+class WireFormatNamespace(socketio.AsyncNamespace):
+    """
+    Authenticates the client's JWT on connect and keeps the user and their
+    party memberships on the session (see socket_auth.py).
+
+    Also remembers the wire format each client negotiated on connect (see wire.py)
+    and puts it in a per-format sub-room next to party_{id}, so high-frequency
+    events can be sent as JSON or binary to the right clients.
+    """
+    def __init__(self, namespace=None):
+        super().__init__(namespace)
+        self.formats = {}
+
+    async def on_connect(self, sid, environ, auth=None):
+        # Raises ConnectionRefusedError for invalid tokens
+        await self.save_session(sid, await socket_auth.authenticate(environ, auth))
+        self.formats[sid] = wire.negotiate(environ, auth)
+
+    async def member(self, sid, party_id, client_user_id):
+        """
+        (user_id, joined_at) of the sender in party_id; joined_at is None for non-members.
+        Authenticated sockets use the session (no DB query once cached) and ignore
+        client_user_id; anonymous sockets fall back to client_user_id.
+        """
+        session = await self.get_session(sid)
+        if session.get('user_id') is not None:
+            return session['user_id'], await socket_auth.joined_at(session, party_id)
+        if not client_user_id:
+            return None, None
+        return client_user_id, await db_data.joined_at(party_id, client_user_id)
+
+    async def is_authenticated(self, sid):
+        return (await self.get_session(sid)).get('user_id') is not None
 
     async def on_disconnect(self, sid):
+        self.formats.pop(sid, None)
+
+    async def trigger_event(self, event, *args):
+        """Dispatch with per-event query count / DB / serializer time / latency (see metrics.py)."""
+        if not settings.METRICS_ENABLED:
+            return await super().trigger_event(event, *args)
+        # Unknown event names from clients share one label
+        labels = {'namespace': self.namespace, 'event': event if hasattr(self, f'on_{event}') else 'unknown'}
+        with metrics.observe('joiny_socketio_event', labels):
+            return await super().trigger_event(event, *args)
+
+    async def enter_party(self, sid, room):
+        await self.enter_room(sid, room)
+        await self.enter_room(sid, wire.format_room(room, self.formats.get(sid, wire.JSON)))
+
+    async def leave_party(self, sid, room):
+        await self.leave_room(sid, room)
+        await self.leave_room(sid, wire.format_room(room, self.formats.get(sid, wire.JSON)))
+
+    async def emit_by_format(self, event, room, payload, encode_binary):
+        """Send payload to JSON clients and encode_binary() to binary clients of a room."""
+        await self.emit(event, payload, room=wire.format_room(room, wire.JSON))
+        try:
+            binary = encode_binary()
+        except (TypeError, ValueError, struct.error):
+            return  # ids that only exist in JSON form (non-numeric or not uint32)
+        await self.emit(event, binary, room=wire.format_room(room, wire.BINARY))
+
+
+class LocationNamespace(WireFormatNamespace):
+    def __init__(self, namespace=None):
+        super().__init__(namespace)
+        # Latest position per user, flushed to each room as one location_batch per tick
+        self.coalescer = LocationCoalescer(
+            self.emit_batch,
+            interval=settings.LOCATION_TICK_INTERVAL,
+            min_distance_m=settings.LOCATION_MIN_DISTANCE_M,
+        )
+        self.positions = {}  # sid -> {room: user_id} this socket reported positions for
+
+    async def on_connect(self, sid, environ, auth=None):
+        await super().on_connect(sid, environ, auth)
+        print(f"Location Client connected: {sid} ({self.formats[sid]})")
+
+    async def on_disconnect(self, sid):
+        await super().on_disconnect(sid)
+        # Stop sending the socket's last positions
+        for room, user_id in self.positions.pop(sid, {}).items():
+            self.coalescer.forget(room, user_id)
         print(f"Location Client disconnected: {sid}")
 
     async def on_join_party(self, sid, data):
@@ -22,14 +109,23 @@ class LocationNamespace(socketio.AsyncNamespace):
         """
         party_id = data.get('party_id')
         if party_id:
-            await self.enter_room(sid, f"party_{party_id}")
+            if await self.is_authenticated(sid):
+                _, joined_at = await self.member(sid, party_id, None)
+                if joined_at is None:
+                    await self.emit('response', {'error': f'Not a member of party {party_id}'}, room=sid)
+                    return
+            await self.enter_party(sid, f"party_{party_id}")
             await self.emit('response', {'message': f'Joined party {party_id} on location'}, room=sid)
             print(f"Client {sid} joined party_{party_id} on location")
 
     async def on_leave_party(self, sid, data):
         party_id = data.get('party_id')
         if party_id:
-            await self.leave_room(sid, f"party_{party_id}")
+            await self.leave_party(sid, f"party_{party_id}")
+            session = await self.get_session(sid)
+            room = f"party_{party_id}"
+            user_id = self.positions.get(sid, {}).pop(room, None)
+            self.coalescer.forget(room, user_id or session.get('user_id') or data.get('user_id') or sid)
             await self.emit('response', {'message': f'Left party {party_id} on location'}, room=sid)
 
     async def on_location_update(self, sid, data):
@@ -41,111 +137,324 @@ class LocationNamespace(socketio.AsyncNamespace):
           'lat': 37.5665, 
           'lng': 126.9780 
         }
+        or a 16-byte binary frame from binary clients (see wire.py)
         """
+        if isinstance(data, (bytes, bytearray)):
+            try:
+                data = wire.decode_location_update(data)
+            except Exception as e:
+                print(f"Invalid binary location update from {sid}: {e}")
+                return
         party_id = data.get('party_id')
-        if party_id:
-            # Broadcast to everyone in the party room EXCEPT the sender
-            await self.emit('location_update', data, room=f"party_{party_id}", skip_sid=sid)
+        if party_id and data.get('lat') is not None and data.get('lng') is not None:
+            user_id = data.get('user_id') or sid
+            session = await self.get_session(sid)
+            if session.get('user_id') is not None:
+                # Authenticated: the session decides who is moving, not the payload
+                if await socket_auth.joined_at(session, party_id) is None:
+                    return
+                user_id = session['user_id']
+                data = {**data, 'user_id': user_id}
+            # Coalesced: the room receives at most one location_batch per tick
+            try:
+                self.coalescer.push(f"party_{party_id}", user_id, data)
+                self.positions.setdefault(sid, {})[f"party_{party_id}"] = user_id
+            except (TypeError, ValueError) as e:
+                print(f"Invalid location update from {sid}: {e}")
+
+    async def emit_batch(self, room, payload):
+        """
+        location_batch: { 'party_id': '123', 'locations': [{ 'user_id', 'lat', 'lng', ... }] }
+        Senders receive their own position too; clients skip their own user_id.
+        """
+        party_id = room[len('party_'):]
+        payload['party_id'] = party_id
+        await self.emit_by_format(
+            'location_batch', room, payload,
+            lambda: wire.encode_location_batch(party_id, payload['locations']),
+        )
+        return sum(1 for _ in self.server.manager.get_participants(self.namespace, room))
 
 
-from asgiref.sync import sync_to_async
-from django.core.exceptions import ObjectDoesNotExist
+from .chat_buffer import ChatWriteBuffer
+from .party_push import party_publisher
+from .presence import PresenceSweeper, available as presence_available, diffs, presence
 
-# Import models securely
-# We assume django.setup() is already called in asgi.py before this module is imported
-from core.models import Participant, ChatMessage, Event
-from django.contrib.auth.models import User
+# Write-behind buffer for chat persistence (flushed on ASGI shutdown, see asgi.py)
+chat_buffer = ChatWriteBuffer.from_settings()
 
-class ChatNamespace(socketio.AsyncNamespace):
-    async def on_connect(self, sid, environ):
-        print(f"Chat Client connected: {sid}")
+class ChatNamespace(WireFormatNamespace):
+    """
+    Also tracks who is online per party (see presence.py) and sends
+    `presence` diffs to party_{id}: { 'party_id', 'online': [user_id], 'offline': [user_id] }.
+    A joining client first gets the full list with 'snapshot': True.
+    Not with several workers (SOCKETIO_MANAGER_URL): no presence events are sent.
+    """
+    def __init__(self, namespace=None):
+        super().__init__(namespace)
+        self.presence_sweeper = PresenceSweeper(presence, lambda changes: self.emit_presence(offline=changes))
+
+    async def on_connect(self, sid, environ, auth=None):
+        await super().on_connect(sid, environ, auth)
+        print(f"Chat Client connected: {sid} ({self.formats[sid]})")
 
     async def on_disconnect(self, sid):
+        await super().on_disconnect(sid)
+        await self.emit_presence(offline=presence.disconnect(sid))
         print(f"Chat Client disconnected: {sid}")
+
+    async def trigger_event(self, event, *args):
+        # Any event from a socket counts as a heartbeat
+        if event not in ('connect', 'disconnect') and args:
+            changes = presence.touch(args[0])
+            if changes:
+                await self.emit_presence(online=changes)
+        return await super().trigger_event(event, *args)
+
+    async def on_heartbeat(self, sid, data=None):
+        """Keeps the socket online while the client is idle (send more often than PRESENCE_TIMEOUT)."""
+
+    async def emit_presence(self, online=(), offline=()):
+        for party_id, payload in diffs(online, offline).items():
+            await self.emit('presence', payload, room=f"party_{party_id}")
     
     async def on_join_party(self, sid, data):
+        """
+        data: { 'party_id': '123', 'user_id': '1', 'last_message_id': 42 }
+        last_message_id is optional; reconnecting clients send the last id they
+        saw and only receive newer messages. A message seen only live has no id
+        yet: send its uuid as 'last_message_uuid' instead. user_id is ignored for
+        authenticated sockets (the token decides).
+        """
         party_id = data.get('party_id')
-        user_id = data.get('user_id') # Expect user_id from frontend
+        last_message_id = data.get('last_message_id')
+        last_message_uuid = data.get('last_message_uuid')
 
         if party_id:
-            await self.enter_room(sid, f"party_{party_id}")
+            try:
+                user_id, joined_at = await self.member(sid, party_id, data.get('user_id'))
+            except Exception as e:
+                print(f"Unexpected error in on_join_party: {e}")
+                return
+            if joined_at is None and await self.is_authenticated(sid):
+                await self.emit('response', {'error': f'Not a member of party {party_id}'}, room=sid)
+                return
+
+            await self.enter_party(sid, f"party_{party_id}")
             print(f"Client {sid} joined chat party_{party_id}")
+            # Only confirmed members of authenticated sockets: an anonymous client picks its own user_id
+            if joined_at is not None and await self.is_authenticated(sid) and presence_available():
+                online, offline = presence.join(sid, party_id, user_id)
+                await self.emit_presence(online, offline)
+                await self.emit('presence', {
+                    'party_id': str(party_id), 'online': presence.online(party_id), 'offline': [], 'snapshot': True,
+                }, room=sid)
+                self.presence_sweeper.start()
             
-            # Message history logic
+            # Message history logic (only messages after the participant joined)
             if user_id:
                 try:
-                    # Sync DB access wrapper
-                    @sync_to_async
-                    def get_chat_history():
-                        try:
-                            # 1. Get participant info specifically for joined_at
-                            # We filter by user_id and party_id (event_id)
-                            participant = Participant.objects.get(event_id=party_id, user_id=user_id)
-                            joined_at = participant.joined_at
-                            
-                            # 2. Filter messages created after joined_at
-                            msgs = ChatMessage.objects.filter(
-                                event_id=party_id, 
-                                created_at__gte=joined_at
-                            ).order_by('created_at').select_related('sender')
-                            
-                            # 3. Serialize
-                            history = []
-                            for m in msgs:
-                                history.append({
-                                    'user_name': m.sender.username, # Or m.sender.first_name etc
-                                    'message': m.message,
-                                    'timestamp': m.created_at.isoformat(),
-                                    'sid': 'history' # Marker
-                                })
-                            return history
-                        except (Participant.DoesNotExist, ObjectDoesNotExist) as e:
-                            print(f"Error fetching history: {e}")
-                            return []
-
-                    history = await get_chat_history()
-                    if history:
-                        await self.emit('chat_history', history, room=sid)
-                        
+                    if joined_at is None:
+                        print(f"Error fetching history: user {user_id} is not in party {party_id}")
+                        return
+
+                    if last_message_id or last_message_uuid:
+                        await self.send_history_since(sid, party_id, joined_at, last_message_id, last_message_uuid)
+                    else:
+                        await self.send_latest_history(sid, party_id, joined_at)
                 except Exception as e:
                     print(f"Unexpected error in on_join_party: {e}")
 
+    async def send_latest_history(self, sid, party_id, joined_at):
+        """Newest page of history plus unflushed messages, as one chat_history frame."""
+        # Share the buffer lock with other readers so a batch can't commit between the
+        # DB read and the pending read (no gaps, no duplicates).
+        chat_buffer.start()
+        async with chat_buffer.lock.reading():
+            history, _ = await db_data.page_before(
+                party_id, joined_at, None, settings.CHAT_HISTORY_PAGE_SIZE
+            )
+            history += [
+                chat_history.pending_payload(e)
+                for e in chat_buffer.pending_for(party_id, since=joined_at)
+            ]
+        if history:
+            await self.emit('chat_history', history, room=sid)
+
+    async def send_history_since(self, sid, party_id, joined_at, last_message_id=None, last_message_uuid=None):
+        """
+        Resume after a reconnect: stream messages newer than last_message_id
+        (or last_message_uuid) page by page.
+        """
+        chat_buffer.start()
+        skip_uuid = None
+        if last_message_uuid:
+            try:
+                last_message_uuid = uuid.UUID(str(last_message_uuid))
+            except ValueError:
+                last_message_uuid = None
+        if last_message_uuid is None:
+            after = await db_data.message_key(party_id, last_message_id) if last_message_id else None
+        else:
+            # Under the buffer lock, so the message can't move from pending to the DB between the two lookups
+            async with chat_buffer.lock.reading():
+                after = await db_data.message_key_for_uuid(party_id, last_message_uuid)
+                entry = None if after is not None else chat_buffer.pending_entry(party_id, last_message_uuid)
+            if entry is not None:
+                # Still pending: continue from its enqueue time. It may be written
+                # while we page, so leave its own row out.
+                after, skip_uuid = (entry['created_at'], 0), str(last_message_uuid)
+        if after is None:
+            await self.send_latest_history(sid, party_id, joined_at)
+            return
+
+        page_size = settings.CHAT_HISTORY_PAGE_SIZE
+        while True:
+            async with chat_buffer.lock.reading():
+                page, after = await db_data.page_after(
+                    party_id, joined_at, after, page_size
+                )
+                last_page = len(page) < page_size
+                if skip_uuid:
+                    page = [m for m in page if m['uuid'] != skip_uuid]
+                if last_page:
+                    page += [
+                        chat_history.pending_payload(e)
+                        for e in chat_buffer.pending_for(party_id, since=joined_at, after_uuid=last_message_uuid)
+                    ]
+            if page:
+                await self.emit('chat_history', page, room=sid)
+            if last_page:
+                break
+
+    async def on_load_history(self, sid, data):
+        """
+        Older history, one page per request.
+        data: { 'party_id': '123', 'user_id': '1', 'before_id': 42 }
+        Replies with chat_history_page: { 'party_id', 'messages': [...], 'has_more': bool }
+        """
+        party_id = data.get('party_id')
+        before_id = data.get('before_id')
+        if not (party_id and before_id):
+            return
+
+        try:
+            _, joined_at = await self.member(sid, party_id, data.get('user_id'))
+            before = await db_data.message_key(party_id, before_id)
+            if joined_at is None or before is None:
+                return
+            messages, has_more = await db_data.page_before(
+                party_id, joined_at, before, settings.CHAT_HISTORY_PAGE_SIZE
+            )
+            await self.emit('chat_history_page', {
+                'party_id': party_id,
+                'messages': messages,
+                'has_more': has_more,
+            }, room=sid)
+        except Exception as e:
+            print(f"Unexpected error in on_load_history: {e}")
+
     async def on_leave_party(self, sid, data):
         party_id = data.get('party_id')
         if party_id:
-            await self.leave_room(sid, f"party_{party_id}")
+            await self.leave_party(sid, f"party_{party_id}")
+            await self.emit_presence(offline=presence.leave(sid, party_id))
     
     async def on_chat_message(self, sid, data):
         """
         data: { 'party_id': '123', 'message': 'hello', 'user_name': 'Kim', 'user_id': '1' }
+        or a binary chat_message frame from binary clients (see wire.py)
         """
+        if isinstance(data, (bytes, bytearray)):
+            try:
+                data = wire.decode_chat_message(data)
+            except Exception as e:
+                print(f"Invalid binary chat message from {sid}: {e}")
+                return
         party_id = data.get('party_id')
         message = data.get('message')
         user_name = data.get('user_name')
         user_id = data.get('user_id')
+
+        session = await self.get_session(sid)
+        if session.get('user_id') is not None:
+            # Authenticated: sender comes from the token, membership from the session cache
+            if not party_id or await socket_auth.joined_at(session, party_id) is None:
+                return
+            user_id = session['user_id']
+            user_name = user_name or session['username']
+        elif user_id:
+            # Anonymous (SOCKETIO_REQUIRE_AUTH=False): the client-supplied user_id is only saved for a member
+            try:
+                member = bool(party_id) and await db_data.joined_at(party_id, user_id) is not None
+            except ValueError:
+                member = False  # non-numeric ids
+            if not member:
+                user_id = None
         
         if party_id and message:
-            # 1. Save to DB
+            timestamp = None # Frontend will add current time when the message isn't persisted
+            created_at = None
+            message_uuid = None  # Resume key (last_message_uuid) until the message has an id
+
+            # 1. Queue for DB (written in batches by chat_buffer, waits only if the queue is full)
             if user_id:
                 try:
-                    @sync_to_async
-                    def save_message():
-                        ChatMessage.objects.create(
-                            event_id=party_id,
-                            sender_id=user_id,
-                            message=message
-                        )
-                    await save_message()
+                    entry = await chat_buffer.add(party_id, user_id, user_name, message)
+                    created_at = entry['created_at']
+                    timestamp = created_at.isoformat()
+                    message_uuid = str(entry['uuid'])
                 except Exception as e:
-                    print(f"Failed to save message: {e}")
+                    print(f"Failed to queue message: {e}")
 
-            # 2. Broadcast to all
-            await self.emit('chat_message', {
+            # 2. Broadcast to all (JSON and binary clients)
+            await self.emit_by_format('chat_message', f"party_{party_id}", {
+                'uuid': message_uuid,
                 'user_name': user_name,
                 'message': message,
                 'sid': sid,
-                'timestamp': None # Frontend will add current time or we could send DB time
-            }, room=f"party_{party_id}")
+                'timestamp': timestamp
+            }, lambda: wire.encode_chat_message(
+                party_id, user_id, user_name, message,
+                int(created_at.timestamp() * 1000) if created_at else 0,
+                message_uuid,
+            ))
+
+class PartyNamespace(WireFormatNamespace):
+    """
+    Server -> client deltas for a party screen (see party_push.py).
+    Clients join party_{id} here and apply participant / todo / event
+    changes as they arrive instead of polling the REST endpoints.
+    """
+    async def on_join_party(self, sid, data):
+        """
+        data: { 'party_id': '123' }
+        Authenticated sockets must be members; anonymous sockets can follow
+        any party, like the public event detail endpoint.
+        """
+        party_id = data.get('party_id')
+        if not party_id:
+            return
+        if await self.is_authenticated(sid):
+            _, joined_at = await self.member(sid, party_id, None)
+            if joined_at is None:
+                await self.emit('response', {'error': f'Not a member of party {party_id}'}, room=sid)
+                return
+        await self.enter_room(sid, f"party_{party_id}")
+        await self.emit('response', {'message': f'Joined party {party_id} on party'}, room=sid)
+
+    async def on_leave_party(self, sid, data):
+        party_id = data.get('party_id')
+        if party_id:
+            await self.leave_room(sid, f"party_{party_id}")
+
+    async def push(self, event, party_id, payload):
+        await self.emit(event, payload, room=f"party_{party_id}")
+
+
+chat_namespace = ChatNamespace('/chat')
+party_namespace = PartyNamespace('/party')
 
 sio.register_namespace(LocationNamespace('/location'))
-sio.register_namespace(ChatNamespace('/chat'))
+sio.register_namespace(chat_namespace)
+sio.register_namespace(party_namespace)
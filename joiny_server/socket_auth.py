@@ -0,0 +1,116 @@
+"""
+JWT authentication for Socket.IO connections.
+
+Clients send the same access token they use for the REST API at connect time
+(`auth: { token }`, `?token=` or an `Authorization: Bearer` header). The token
+is checked once in `on_connect` with rest_framework_simplejwt's signing config
+(signature, expiry, token type: no DB access). The user id, username and the
+parties the user belongs to are then stored on the Socket.IO session, so
+authorizing later events is a dict lookup.
+
+Memberships are loaded at connect. A party joined after connecting is picked
+up on first use (one query, then cached). Leaving a party takes effect on the
+next reconnect.
+
+Connections without a token are refused unless SOCKETIO_REQUIRE_AUTH is
+turned off for older clients; their handlers then fall back to the
+client-supplied user_id, which is only trusted for a confirmed member of the
+party. Connections with an invalid or expired token are always refused.
+"""
+import time
+from urllib.parse import parse_qs
+
+import socketio
+from django.conf import settings
+from django.contrib.auth.models import User
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.models import Participant
+
+from . import data
+
+# Seconds before a failed membership check is retried against the DB
+DENIED_RETRY = 10
+
+
+def get_token(environ, auth):
+    if isinstance(auth, dict) and auth.get('token'):
+        return auth['token']
+    if not environ:
+        return None
+    token = parse_qs(environ.get('QUERY_STRING', '')).get('token', [None])[0]
+    if token:
+        return token
+    header = environ.get('HTTP_AUTHORIZATION', '')
+    prefix, _, value = header.partition(' ')
+    if prefix in api_settings.AUTH_HEADER_TYPES and value:
+        return value
+    return None
+
+
+def decode_user_id(token):
+    """User id from a valid access token, or None. Stateless: no DB query."""
+    try:
+        return AccessToken(token)[api_settings.USER_ID_CLAIM]
+    except (TokenError, KeyError):
+        return None
+
+
+def load_session(user_id):
+    """Session data for an authenticated socket (one user query + one membership query)."""
+    user = User.objects.filter(id=user_id, is_active=True).values_list('username', flat=True).first()
+    if user is None:
+        return None
+    parties = Participant.objects.filter(user_id=user_id).values_list('event_id', 'joined_at')
+    return {
+        'user_id': user_id,
+        'username': user,
+        'parties': {str(event_id): joined_at for event_id, joined_at in parties},
+        'denied': {},  # party_id -> monotonic time of the last failed membership check
+    }
+
+
+async def authenticate(environ, auth):
+    """
+    Session dict for a connecting client.
+    Returns {} for anonymous clients and raises ConnectionRefusedError when
+    the token is invalid or a token is required but missing.
+    """
+    token = get_token(environ, auth)
+    if token is None:
+        if settings.SOCKETIO_REQUIRE_AUTH:
+            raise socketio.exceptions.ConnectionRefusedError('authentication required')
+        return {}
+    user_id = decode_user_id(token)
+    session = await data.run(load_session, user_id) if user_id is not None else None
+    if session is None:
+        raise socketio.exceptions.ConnectionRefusedError('invalid token')
+    return session
+
+
+async def joined_at(session, party_id):
+    """
+    When the session user joined party_id, or None if they are not a member.
+    Cached on the session; a miss is checked against the DB at most once per
+    DENIED_RETRY seconds, so a non-member can't turn every event into a query.
+    """
+    party_id = str(party_id)
+    parties = session['parties']
+    if party_id in parties:
+        return parties[party_id]
+    if not party_id.isdigit():
+        return None
+    denied = session['denied']
+    now = time.monotonic()
+    if party_id in denied and now - denied[party_id] < DENIED_RETRY:
+        return None
+
+    value = await data.joined_at(party_id, session['user_id'])
+    if value is None:
+        denied[party_id] = now
+    else:
+        parties[party_id] = value
+        denied.pop(party_id, None)
+    return value
@@ -2,8 +2,9 @@
 from django.contrib import admin
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from core.views import EventViewSet, ParticipantViewSet, TodoViewSet, ThemeViewSet, RegisterView, UserDetailView, FriendshipViewSet
+from core.views import EventViewSet, ParticipantViewSet, TodoViewSet, ThemeViewSet, RegisterView, UserDetailView, FriendshipViewSet, CacheStatsView, RealtimeStatsView
 from core.serializers import EmailTokenObtainPairSerializer # Custom Serializer 임포트
+from joiny_server.metrics import metrics_view
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
@@ -28,6 +29,12 @@ urlpatterns = [
     path('api/auth/login/', TokenObtainPairView.as_view(serializer_class=EmailTokenObtainPairSerializer), name='token_obtain_pair'),
     path('api/auth/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
 
+    # 캐시 / 실시간 메시지 모니터링
+    path('api/cache/stats/', CacheStatsView.as_view(), name='cache_stats'),
+    path('api/realtime/stats/', RealtimeStatsView.as_view(), name='realtime_stats'),
+    # 요청 / Socket.IO 이벤트별 쿼리 수, 지연 시간 히스토그램 (Prometheus)
+    path('metrics', metrics_view, name='metrics'),
+
 
     # 초대 코드를 통해 이벤트를 조회하는 새로운 엔드포인트
     path('api/events/by_invite_code/<uuid:invite_code>/', EventViewSet.as_view({'get': 'retrieve_by_invite_code'}), name='event-by-invite-code'),
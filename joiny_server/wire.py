@@ -0,0 +1,113 @@
+"""
+Compact binary encoding for high-frequency Socket.IO events.
+
+Clients opt in at connect time with `auth: { format: 'binary' }` (or the
+`?format=binary` query parameter); everyone else keeps the JSON payloads.
+Binary frames are fixed-layout structs in network byte order, coordinates are
+fixed-point integers (degrees * 1e6, ~0.11 m resolution).
+
+    location_update (client -> server), 16 bytes:
+        uint32 party_id, uint32 user_id, int32 lat_e6, int32 lng_e6
+    location_batch (server -> client), 6 + 12 * n bytes:
+        uint32 party_id, uint16 n, then n x (uint32 user_id, int32 lat_e6, int32 lng_e6)
+    chat_message (both directions), version 2, 35 bytes + names:
+        uint8 version (2), uint32 party_id, uint32 user_id, uint64 timestamp_ms (0 from clients),
+        16 bytes message uuid (zeros from clients, the resume cursor from the server),
+        uint16 user_name length, user_name (utf-8), message (utf-8, rest of frame)
+
+Version 1 chat_message frames (the same without the version byte and uuid) are
+still accepted from clients; their first byte is the high byte of party_id,
+so they are told apart for party ids below 2**24.
+
+Ids must be numeric for the binary format.
+"""
+import struct
+import uuid
+from urllib.parse import parse_qs
+
+JSON = 'json'
+BINARY = 'binary'
+
+FIXED_POINT = 1_000_000
+
+LOCATION_UPDATE = struct.Struct('!IIii')
+LOCATION_HEADER = struct.Struct('!IH')
+LOCATION_ENTRY = struct.Struct('!Iii')
+CHAT_VERSION = 2
+CHAT_HEADER = struct.Struct('!BIIQ16sH')
+CHAT_HEADER_V1 = struct.Struct('!IIQH')
+
+
+def negotiate(environ, auth):
+    """Wire format requested by a connecting client."""
+    requested = None
+    if isinstance(auth, dict):
+        requested = auth.get('format')
+    if requested is None and environ:
+        requested = parse_qs(environ.get('QUERY_STRING', '')).get('format', [None])[0]
+    return BINARY if requested == BINARY else JSON
+
+
+def format_room(room, fmt):
+    """Per-format sub-room, so each client receives frames in its own encoding."""
+    return f"{room}/{fmt}"
+
+
+def to_fixed(degrees):
+    return int(round(float(degrees) * FIXED_POINT))
+
+
+def decode_location_update(buf):
+    party_id, user_id, lat, lng = LOCATION_UPDATE.unpack(buf)
+    return {
+        'party_id': str(party_id),
+        'user_id': user_id,
+        'lat': lat / FIXED_POINT,
+        'lng': lng / FIXED_POINT,
+    }
+
+
+def encode_location_batch(party_id, locations):
+    entries = []
+    for loc in locations:
+        try:
+            entries.append(LOCATION_ENTRY.pack(int(loc['user_id']), to_fixed(loc['lat']), to_fixed(loc['lng'])))
+        except (TypeError, ValueError, struct.error):
+            continue  # non-numeric or out-of-range (not uint32) user id, only representable in JSON
+    return LOCATION_HEADER.pack(int(party_id), len(entries)) + b''.join(entries)
+
+
+def decode_location_batch(buf):
+    party_id, count = LOCATION_HEADER.unpack_from(buf)
+    locations = []
+    for i in range(count):
+        user_id, lat, lng = LOCATION_ENTRY.unpack_from(buf, LOCATION_HEADER.size + i * LOCATION_ENTRY.size)
+        locations.append({'user_id': user_id, 'lat': lat / FIXED_POINT, 'lng': lng / FIXED_POINT})
+    return {'party_id': str(party_id), 'locations': locations}
+
+
+def encode_chat_message(party_id, user_id, user_name, message, timestamp_ms=0, message_uuid=None):
+    name = (user_name or '').encode('utf-8')
+    uuid_bytes = uuid.UUID(str(message_uuid)).bytes if message_uuid else bytes(16)
+    header = CHAT_HEADER.pack(CHAT_VERSION, int(party_id), int(user_id or 0), int(timestamp_ms or 0), uuid_bytes, len(name))
+    return header + name + message.encode('utf-8')
+
+
+def decode_chat_message(buf):
+    if buf[0] == CHAT_VERSION:
+        _, party_id, user_id, timestamp_ms, uuid_bytes, name_len = CHAT_HEADER.unpack_from(buf)
+        offset = CHAT_HEADER.size
+    elif buf[0] == 0:
+        party_id, user_id, timestamp_ms, name_len = CHAT_HEADER_V1.unpack_from(buf)
+        uuid_bytes = bytes(16)
+        offset = CHAT_HEADER_V1.size
+    else:
+        raise ValueError(f"Unsupported chat_message frame version {buf[0]}")
+    return {
+        'party_id': str(party_id),
+        'user_id': str(user_id) if user_id else None,
+        'timestamp_ms': timestamp_ms,
+        'uuid': str(uuid.UUID(bytes=uuid_bytes)) if any(uuid_bytes) else None,
+        'user_name': bytes(buf[offset:offset + name_len]).decode('utf-8'),
+        'message': bytes(buf[offset + name_len:]).decode('utf-8'),
+    }